@@ -0,0 +1,71 @@
+# Benchmark: the full performance report of a batch of backtests, computed
+# curve by curve in a Python loop versus one vectorized performance_report call.
+#
+#   python benchmarks/bench_analytics.py [n_backtests] [n_steps]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.analytics import performance_report, rolling_report
+
+
+def loop_report(equity, positions, prices, periods_per_year=252):
+    returns = [equity[t] / equity[t - 1] - 1 for t in range(1, len(equity))]
+    peak, max_drawdown, duration, longest = equity[0], 0.0, 0, 0
+    for value in equity:
+        if value >= peak:
+            peak, duration = value, 0
+        else:
+            duration += 1
+        max_drawdown = max(max_drawdown, 1 - value / peak)
+        longest = max(longest, duration)
+    trades = sum(1 for t in range(1, len(positions)) if positions[t] != positions[t - 1])
+    invested = [t for t in range(1, len(positions)) if positions[t - 1] != 0]
+    hits = sum(1 for t in invested if positions[t - 1] * (prices[t] - prices[t - 1]) > 0)
+    std = np.std(returns, ddof=1)
+    downside = np.sqrt(np.mean([min(r, 0.0) ** 2 for r in returns]))
+    return {
+        'total_return': equity[-1] / equity[0] - 1,
+        'sharpe': np.mean(returns) / std * np.sqrt(periods_per_year) if std > 0 else 0.0,
+        'sortino': np.mean(returns) / downside * np.sqrt(periods_per_year) if downside > 0 else 0.0,
+        'max_drawdown': max_drawdown,
+        'max_drawdown_duration': longest,
+        'trade_count': trades,
+        'hit_rate': hits / len(invested) if invested else 0.0,
+    }
+
+
+def main(n_backtests=10000, n_steps=252):
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_steps)))
+    positions = np.cumsum(rng.choice([-1.0, 0.0, 1.0], (n_backtests, n_steps), p=[0.05, 0.9, 0.05]), axis=1)
+    positions = np.maximum(positions, 0.0)
+    equity = 10000 + np.cumsum(np.diff(prices, prepend=prices[0]) * np.roll(positions, 1, axis=1), axis=1)
+
+    sample = max(1, n_backtests // 100)
+    started = time.perf_counter()
+    for curve in range(sample):
+        loop_report(equity[curve], positions[curve], prices)
+    looped = (time.perf_counter() - started) * n_backtests / sample
+
+    started = time.perf_counter()
+    performance_report(equity, positions, prices)
+    batched = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rolling_report(equity, 20)
+    rolling = time.perf_counter() - started
+
+    print(f"per-curve loop:             {looped:8.3f} s for {n_backtests} x {n_steps} "
+          f"(extrapolated from {sample} curves)")
+    print(f"batched performance_report: {batched:8.3f} s  ({looped / batched:.0f}x)")
+    print(f"batched rolling_report:     {rolling:8.3f} s  (window 20)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,49 @@
+# Benchmark: PaperTrader.backtest vs. the per-step execute_trade loop on ten
+# years of minute bars.
+#
+#   python benchmarks/bench_backtest.py [n_bars]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from simulation.paper_trader import PaperTrader
+
+MINUTE_BARS_10Y = 10 * 252 * 390
+
+
+def main(n_bars=MINUTE_BARS_10Y):
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, n_bars)))
+    codes = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=n_bars)
+    actions = np.array(['sell', 'hold', 'buy'])[codes + 1]
+
+    looped = PaperTrader(None)
+    started = time.perf_counter()
+    for action, price in zip(actions.tolist(), prices.tolist()):
+        looped.execute_trade(action, price)
+    loop_time = time.perf_counter() - started
+
+    vectorized = PaperTrader(None)
+    started = time.perf_counter()
+    vectorized.backtest(prices, codes)
+    vector_time = time.perf_counter() - started
+
+    arrays_only = PaperTrader(None)
+    started = time.perf_counter()
+    arrays_only.backtest(prices, codes, record_history=False)
+    arrays_time = time.perf_counter() - started
+
+    assert vectorized.balance == looped.balance and vectorized.position == looped.position
+    print(f"{n_bars:,} bars, {len(looped.trade_history):,} trades")
+    print(f"execute_trade loop:                  {loop_time:7.3f} s")
+    print(f"backtest (with trade_history):       {vector_time:7.3f} s  ({loop_time / vector_time:.1f}x)")
+    print(f"backtest (arrays only):              {arrays_time:7.3f} s  ({loop_time / arrays_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else MINUTE_BARS_10Y)
@@ -0,0 +1,58 @@
+# Benchmark: opening a memory-mapped dataset built by DatasetBuilder versus
+# preprocessing the per-symbol frames again (what every job did before), and
+# the cost of reading one feature across the universe from the mapped file.
+#
+#   python benchmarks/bench_dataset.py [n_symbols] [n_days]
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data.data_loader import preprocess_frame
+from data.dataset import DatasetBuilder, MemmapDataset
+
+
+def main(n_symbols=500, n_days=2520):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2014-01-01', periods=n_days)
+    frames = {}
+    for i in range(n_symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_days)))
+        frames[f"SYM{i}"] = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                                          'Volume': rng.integers(1000, 5000, n_days).astype(float)}, index=dates)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, 'dataset')
+        started = time.perf_counter()
+        DatasetBuilder().build(frames, path)
+        print(f"build:                 {time.perf_counter() - started:9.3f} s "
+              f"({n_symbols} symbols x {n_days} days, {os.path.getsize(os.path.join(path, 'data.npy')) / 1e6:.0f} MB)")
+
+        started = time.perf_counter()
+        processed = {symbol: preprocess_frame(frame) for symbol, frame in frames.items()}
+        print(f"re-preprocess frames:  {(time.perf_counter() - started) * 1000:9.3f} ms")
+        del processed
+
+        repeats = 100
+        started = time.perf_counter()
+        for _ in range(repeats):
+            dataset = MemmapDataset(path)
+        print(f"open dataset:          {(time.perf_counter() - started) / repeats * 1e6:9.1f} us")
+
+        started = time.perf_counter()
+        close = np.array(dataset.feature('Close'))
+        print(f"read Close panel:      {(time.perf_counter() - started) * 1000:9.3f} ms  {close.shape}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
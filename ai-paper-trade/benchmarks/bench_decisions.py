@@ -0,0 +1,39 @@
+# Benchmark: scoring a universe with TradingAgent.decide_action once per symbol
+# versus one decide_actions call for the whole (symbols x features) batch.
+#
+#   python benchmarks/bench_decisions.py [n_symbols] [repeats]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.neural_network import NeuralNetwork
+from models.trading_agent import TradingAgent
+
+FEATURES = 10
+
+
+def main(n_symbols=1000, repeats=20):
+    observations = np.random.default_rng(0).normal(size=(n_symbols, FEATURES))
+    agent = TradingAgent(NeuralNetwork(FEATURES, 32, 1, seed=0))
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        [agent.decide_action(observation) for observation in observations]
+    per_symbol = (time.perf_counter() - started) / repeats
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        agent.decide_actions(observations)
+    batched = (time.perf_counter() - started) / repeats
+
+    print(f"per-symbol decide_action: {per_symbol * 1000:9.3f} ms per universe ({n_symbols} symbols)")
+    print(f"batched decide_actions:   {batched * 1000:9.3f} ms per universe  ({per_symbol / batched:.0f}x)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,66 @@
+# Benchmark: SimulatedExchange order-event throughput while replaying one
+# trading day of minute bars across a universe of symbols. Every bar, a few
+# symbols receive new market/limit/stop orders and some resting orders are
+# cancelled; events = submits + cancels + fills.
+#
+#   python benchmarks/bench_exchange.py [n_symbols] [bars]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from trading.exchange import SimulatedExchange
+
+ORDERS_PER_BAR = 200
+CANCELS_PER_BAR = 60
+
+
+def main(n_symbols=500, n_bars=390):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, (n_bars, n_symbols)), axis=0))
+    spread = np.abs(rng.normal(0, 0.001, (n_bars, n_symbols))) * close
+    high, low = close + spread, close - spread
+    volume = rng.integers(1000, 10000, (n_bars, n_symbols))
+    symbols = [f"SYM{i}" for i in range(n_symbols)]
+
+    order_symbols = rng.integers(0, n_symbols, (n_bars, ORDERS_PER_BAR))
+    order_kinds = rng.integers(0, 4, (n_bars, ORDERS_PER_BAR)).tolist()
+    order_sizes = (rng.integers(1, 500, (n_bars, ORDERS_PER_BAR)) * rng.choice([-1, 1], (n_bars, ORDERS_PER_BAR))).tolist()
+    previous_close = np.vstack([close[:1], close[:-1]])
+    order_prices = np.round(previous_close[np.arange(n_bars)[:, None], order_symbols]
+                            * rng.uniform(0.995, 1.005, (n_bars, ORDERS_PER_BAR)), 2).tolist()
+    order_symbols = order_symbols.tolist()
+
+    exchange = SimulatedExchange(participation=0.05, slippage_bps=2)
+    submitted, cancelled, filled = 0, 0, 0
+    resting = []
+    started = time.perf_counter()
+    for t in range(n_bars):
+        for symbol_index, kind, size, price in zip(order_symbols[t], order_kinds[t], order_sizes[t], order_prices[t]):
+            symbol = symbols[symbol_index]
+            if kind == 0:
+                order = exchange.submit(symbol, size)
+            elif kind == 1:
+                order = exchange.submit(symbol, size, 'limit', limit_price=price)
+            elif kind == 2:
+                order = exchange.submit(symbol, size, 'stop', stop_price=price)
+            else:
+                order = exchange.submit(symbol, size, 'stop_limit', limit_price=price, stop_price=price)
+            resting.append(order.order_id)
+            submitted += 1
+        for index in rng.integers(0, len(resting), CANCELS_PER_BAR).tolist():
+            cancelled += exchange.cancel(resting[index])
+        filled += len(exchange.process_bar_arrays(symbols, previous_close[t], high[t], low[t], volume[t], timestamp=t))
+    elapsed = time.perf_counter() - started
+
+    events = submitted + cancelled + filled
+    print(f"{n_symbols} symbols x {n_bars} bars: {submitted:,} submits, {cancelled:,} cancels, {filled:,} fills")
+    print(f"{elapsed:.2f} s, {events / elapsed:,.0f} order events/s, {n_symbols * n_bars / elapsed:,.0f} symbol-bars/s")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+# Benchmark: universe refresh through YFinanceAPI.fetch_multiple_symbols against a
+# fake downloader with injected per-call latency.
+#
+#   python benchmarks/bench_fetch_multiple.py [n_symbols] [latency_seconds]
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data.yfinance_api import YFinanceAPI
+
+
+class LatencyDownloader:
+    """Stand-in for yf.download: one sleep per call regardless of batch size."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def __call__(self, symbols, start=None, end=None, interval='1d', actions=True, **kwargs):
+        time.sleep(self.latency)
+        index = pd.bdate_range(start, end, inclusive='left', name='Date')
+        bars = pd.DataFrame({'Open': 1.0, 'High': 1.0, 'Low': 1.0, 'Close': 1.0, 'Volume': 1}, index=index)
+        if isinstance(symbols, list):
+            return pd.concat({symbol: bars for symbol in symbols}, axis=1)
+        return bars
+
+
+def run(symbols, latency, max_workers, batch_size):
+    api = YFinanceAPI(use_cache=False, downloader=LatencyDownloader(latency))
+    started = time.perf_counter()
+    api.fetch_multiple_symbols(symbols, '2019-01-01', '2020-01-01', max_workers=max_workers, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    per_symbol = np.array([report['elapsed'] for report in api.last_fetch_report.values()])
+    return elapsed, np.median(per_symbol)
+
+
+def main(n_symbols=200, latency=0.02):
+    symbols = [f"SYM{i:04d}" for i in range(n_symbols)]
+    print(f"{n_symbols} symbols, {latency * 1e3:.0f} ms per download call")
+    for max_workers, batch_size in [(1, 1), (8, 1), (32, 1), (8, 20)]:
+        elapsed, median = run(symbols, latency, max_workers, batch_size)
+        print(f"workers={max_workers:3d} batch={batch_size:3d}  wall={elapsed:7.3f} s  "
+              f"median per-symbol={median * 1e3:7.1f} ms")
+
+
+if __name__ == '__main__':
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    main(n_symbols, latency)
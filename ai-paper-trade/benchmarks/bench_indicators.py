@@ -0,0 +1,60 @@
+# Benchmark: per-indicator pandas path (calculate_technical_indicator per symbol)
+# vs. one IndicatorEngine pass over a (time x symbol) panel.
+#
+#   python benchmarks/bench_indicators.py [n_bars] [n_symbols]
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data.indicators import IndicatorEngine
+from data.yfinance_api import YFinanceAPI
+
+INDICATORS = {
+    'sma': {'period': 20},
+    'ema': {'period': 20},
+    'rsi': {'period': 14},
+    'macd': {'fast': 12, 'slow': 26, 'signal': 9},
+    'bollinger': {'period': 20, 'std_dev': 2},
+}
+
+
+def per_indicator_path(api, close):
+    for symbol in range(close.shape[1]):
+        frame = pd.DataFrame({'Close': close[:, symbol]})
+        result = frame.copy()
+        for indicator, params in INDICATORS.items():
+            values = api.calculate_technical_indicator(frame, indicator, **params)
+            if isinstance(values, pd.DataFrame):
+                for col in values.columns:
+                    result[f"{indicator}_{col}"] = values[col]
+            else:
+                result[indicator] = values
+
+
+def main(n_bars=2520, n_symbols=500):
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, (n_bars, n_symbols)), axis=0))
+    api = YFinanceAPI(use_cache=False)
+
+    started = time.perf_counter()
+    per_indicator_path(api, close)
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    IndicatorEngine(close).compute(INDICATORS)
+    engine = time.perf_counter() - started
+
+    print(f"{n_bars} bars x {n_symbols} symbols, {len(INDICATORS)} indicators")
+    print(f"per-indicator pandas path: {legacy:8.3f} s")
+    print(f"IndicatorEngine panel:     {engine:8.3f} s  ({legacy / engine:.1f}x)")
+
+
+if __name__ == '__main__':
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 2520
+    n_symbols = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    main(n_bars, n_symbols)
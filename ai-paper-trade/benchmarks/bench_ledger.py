@@ -0,0 +1,62 @@
+# Benchmark: recording fills and building the history DataFrame with the
+# TransactionLedger versus the previous list of dicts, plus memory per fill.
+#
+#   python benchmarks/bench_ledger.py [n_fills]
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from trading.ledger import TransactionLedger
+
+SYMBOLS = [f"SYM{i}" for i in range(500)]
+REPORTS = 20  # history frames built during the run
+
+
+def record_dicts(n_fills):
+    history = []
+    for i in range(n_fills):
+        quantity, price = (i % 7) - 3 or 1, 100.0 + i % 13
+        history.append({'timestamp': datetime.now(), 'symbol': SYMBOLS[i % 500], 'quantity': quantity,
+                        'price': price, 'order_type': 'market', 'total_value': quantity * price, 'commission': 0})
+        if i % (n_fills // REPORTS) == 0:
+            pd.DataFrame(history)
+    return history
+
+
+def record_ledger(n_fills):
+    ledger = TransactionLedger()
+    for i in range(n_fills):
+        ledger.append(SYMBOLS[i % 500], (i % 7) - 3 or 1, 100.0 + i % 13, 'market')
+        if i % (n_fills // REPORTS) == 0:
+            ledger.to_frame()
+    return ledger
+
+
+def measure(label, func, n_fills):
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept = func(n_fills)
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:14s} {n_fills / elapsed:12,.0f} fills/s   {current / n_fills:6.1f} bytes/fill retained")
+    return kept
+
+
+def main(n_fills=500000):
+    measure("list of dicts", record_dicts, n_fills)
+    ledger = measure("ledger", record_ledger, n_fills)
+    started = time.perf_counter()
+    ledger.to_frame()
+    print(f"final ledger.to_frame(): {time.perf_counter() - started:.3f} s (cached afterwards)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
@@ -0,0 +1,50 @@
+# Benchmark: LiveTradingEngine on a universe of symbols replayed from a local
+# feed at a fixed cadence. Reports per-tick inference+dispatch latency against
+# the cadence budget, dropped ticks, overruns and the broker routing backlog.
+#
+#   python benchmarks/bench_live_engine.py [n_symbols] [ticks] [interval_ms]
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data.quote_service import QuoteService, StaticQuoteSource
+from models.neural_network import NeuralNetwork
+from models.trading_agent import TradingAgent
+from trading.broker_interface import BrokerInterface
+from trading.live_engine import LiveTradingEngine, ReplayQuoteFeed
+
+WINDOW = 10
+
+
+def main(n_symbols=1000, n_ticks=60, interval_ms=1000):
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, (n_ticks, n_symbols)), axis=0))
+    # A few symbols miss a quote on every tick
+    prices[rng.random(prices.shape) < 0.01] = np.nan
+    symbols = [f"SYM{i}" for i in range(n_symbols)]
+
+    network = NeuralNetwork(WINDOW, 32, 1, seed=0)
+    # Untrained weights barely react to returns of this size; scale them up so symbols trade
+    network.set_weights({name: weights * 1e4 for name, weights in network.get_weights().items()})
+    agent = TradingAgent(network)
+    broker = BrokerInterface(initial_balance=1e9, quote_service=QuoteService(StaticQuoteSource(), ttl=60))
+    interval = interval_ms / 1000.0
+    engine = LiveTradingEngine(agent, broker, symbols, window=WINDOW, interval=interval,
+                               buy_threshold=0.05, sell_threshold=-0.05)
+    report = engine.run_replay(ReplayQuoteFeed(prices, symbols, interval=interval))
+
+    print(f"{n_symbols} symbols, {n_ticks} ticks every {interval_ms} ms")
+    print(f"latency ms  mean {report['latency_ms_mean']:.2f}  p99 {report['latency_ms_p99']:.2f}  "
+          f"max {report['latency_ms_max']:.2f}  (budget {interval_ms})")
+    print(f"ticks       received {report['ticks_received']}  processed {report['ticks_processed']}  "
+          f"dropped {report['ticks_dropped']}  overruns {report['overruns']}")
+    print(f"orders      submitted {report['orders_submitted']}  rejected {report['orders_rejected']}  "
+          f"routings coalesced {report['routes_coalesced']}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
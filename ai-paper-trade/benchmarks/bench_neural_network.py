@@ -0,0 +1,58 @@
+# Benchmark: NeuralNetwork.train throughput (samples/s) and peak traced memory,
+# compared with mini-batches run through the allocating forward/backpropagation
+# methods.
+#
+#   python benchmarks/bench_neural_network.py [n_samples]
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.neural_network import NeuralNetwork
+
+INPUT, HIDDEN, OUTPUT, BATCH, EPOCHS = 32, 64, 3, 32, 5
+
+
+def allocating_train(model, x, y, learning_rate):
+    for _ in range(EPOCHS):
+        order = np.random.permutation(len(x))
+        for start in range(0, len(x), BATCH):
+            rows = order[start:start + BATCH]
+            output = model.forward(x[rows])
+            model.calculate_loss(y[rows], output)
+            model.backpropagation(x[rows], y[rows], output, learning_rate)
+
+
+def measure(label, train, n_samples):
+    tracemalloc.start()
+    started = time.perf_counter()
+    train()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:28s} {n_samples * EPOCHS / elapsed:12,.0f} samples/s   peak {peak / 1024:8.1f} KiB")
+
+
+def main(n_samples=100000):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(n_samples, INPUT))
+    y = rng.normal(size=(n_samples, OUTPUT))
+
+    model = NeuralNetwork(INPUT, HIDDEN, OUTPUT, seed=0)
+    measure("forward/backpropagation", lambda: allocating_train(model, x, y, 0.01), n_samples)
+
+    model = NeuralNetwork(INPUT, HIDDEN, OUTPUT, seed=0)
+    measure("train (float64)", lambda: model.train(x, y, 0.01, EPOCHS, BATCH), n_samples)
+
+    model = NeuralNetwork(INPUT, HIDDEN, OUTPUT, dtype=np.float32, seed=0)
+    x32, y32 = x.astype(np.float32), y.astype(np.float32)
+    measure("train (float32)", lambda: model.train(x32, y32, 0.01, EPOCHS, BATCH), n_samples)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,53 @@
+# Benchmark: cold vs. warm OHLCV cache reads through YFinanceAPI.fetch_data.
+#
+#   python benchmarks/bench_ohlcv_cache.py
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data.yfinance_api import YFinanceAPI
+
+
+def fake_download(symbol, start=None, end=None, interval='1d', actions=True, latency=0.25, **kwargs):
+    """Stand-in for yf.download with a simulated network round trip."""
+    time.sleep(latency)
+    index = pd.bdate_range(start, end, inclusive='left', name='Date')
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, len(index))))
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': np.full(len(index), 1000), 'Dividends': 0.0,
+                         'Stock Splits': 0.0}, index=index)
+
+
+def main(repeats=50):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        api = YFinanceAPI(cache_dir=cache_dir, downloader=fake_download)
+
+        started = time.perf_counter()
+        data = api.fetch_data('SPY', '2005-01-01', '2020-01-01')
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            api.fetch_data('SPY', '2005-01-01', '2020-01-01')
+        warm = (time.perf_counter() - started) / repeats
+
+        fresh = YFinanceAPI(cache_dir=cache_dir, downloader=fake_download)
+        started = time.perf_counter()
+        fresh.fetch_data('SPY', '2005-01-01', '2020-01-01')
+        reopened = time.perf_counter() - started
+
+    print(f"bars:                 {len(data)}")
+    print(f"cold fetch:           {cold * 1e3:8.2f} ms")
+    print(f"warm fetch (memo):    {warm * 1e3:8.2f} ms")
+    print(f"warm fetch (reopen):  {reopened * 1e3:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Benchmark: aligning per-symbol frames into a Panel once versus the per-use
+# pandas join (concat + reindex + ffill) consumers did before, and O(1)
+# (date, symbol) lookups against DataFrame.loc.
+#
+#   python benchmarks/bench_panel.py [n_symbols] [n_days]
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data.panel import Panel
+
+
+def main(n_symbols=500, n_days=2520):
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range('2014-01-01', periods=n_days)
+    frames = {}
+    for i in range(n_symbols):
+        keep = np.sort(rng.choice(n_days, n_days - rng.integers(0, 50), replace=False))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(keep))))
+        frames[f"SYM{i}"] = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                                          'Volume': np.ones(len(keep))}, index=days[keep])
+
+    started = time.perf_counter()
+    joined = pd.concat(frames, axis=1, sort=True).ffill()
+    print(f"pandas concat+ffill:              {(time.perf_counter() - started) * 1000:9.1f} ms")
+    closes = joined.xs('Close', axis=1, level=1)
+
+    started = time.perf_counter()
+    panel = Panel.from_frames(frames, fill='ffill')
+    print(f"Panel.from_frames:                {(time.perf_counter() - started) * 1000:9.1f} ms  {panel.shape}")
+    assert np.allclose(panel.close, closes.to_numpy(), equal_nan=True)
+
+    lookups = 100000
+    dates = days[rng.integers(0, n_days, lookups)]
+    symbols = [f"SYM{i}" for i in rng.integers(0, n_symbols, lookups)]
+    started = time.perf_counter()
+    for date, symbol in zip(dates[:lookups // 10], symbols[:lookups // 10]):
+        closes.at[date, symbol]
+    frame_lookup = (time.perf_counter() - started) / (lookups // 10)
+    started = time.perf_counter()
+    for date, symbol in zip(dates.as_unit('ns').asi8.tolist(), symbols):
+        panel.values[panel.date_index[date], panel.symbol_index[symbol], 3]
+    panel_lookup = (time.perf_counter() - started) / lookups
+    print(f"lookup DataFrame.at:              {frame_lookup * 1e6:9.2f} us")
+    print(f"lookup Panel indexes:             {panel_lookup * 1e6:9.2f} us")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
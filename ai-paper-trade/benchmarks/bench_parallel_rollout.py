@@ -0,0 +1,65 @@
+# Benchmark: episodes per second of ParallelRollout for 1..N workers on a
+# CPU-bound toy environment (a small NeuralNetwork picks every action).
+#
+#   python benchmarks/bench_parallel_rollout.py [max_workers] [episodes]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.neural_network import NeuralNetwork
+from training.parallel_rollout import ParallelRollout, run_episode
+
+EPISODE_LENGTH = 500
+
+
+class PriceWalkEnv:
+    def __init__(self, length=EPISODE_LENGTH, window=16):
+        self.length = length
+        self.window = window
+
+    def reset(self):
+        self.t = 0
+        self.returns = np.random.normal(0, 0.01, self.length + self.window)
+        return self.returns[:self.window]
+
+    def step(self, action):
+        self.t += 1
+        reward = float(action * self.returns[self.t + self.window - 1])
+        return self.returns[self.t:self.t + self.window], reward, self.t >= self.length
+
+
+class NetworkAgent:
+    def __init__(self):
+        self.neural_network = NeuralNetwork(16, 64, 1, seed=0)
+
+    def act(self, state):
+        return 1 if self.neural_network.predict(state)[0] > 0 else -1
+
+
+def main(max_workers=None, episodes=64):
+    max_workers = max_workers or os.cpu_count() or 1
+    env, agent = PriceWalkEnv(), NetworkAgent()
+
+    started = time.perf_counter()
+    for _ in range(episodes):
+        run_episode(env, agent, collect=True)
+    serial = episodes / (time.perf_counter() - started)
+    print(f"serial          {serial:8.1f} episodes/s")
+
+    for n_workers in sorted({1, 2, 4, max_workers} & set(range(1, max_workers + 1))):
+        with ParallelRollout(env, agent, n_workers=n_workers, seed=0) as rollout:
+            started = time.perf_counter()
+            for _ in rollout.episodes(episodes):
+                pass
+            rate = episodes / (time.perf_counter() - started)
+        print(f"{n_workers:2d} workers      {rate:8.1f} episodes/s   ({rate / serial:.2f}x serial)")
+    print(f"({os.cpu_count()} CPUs available)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None, int(sys.argv[2]) if len(sys.argv) > 2 else 64)
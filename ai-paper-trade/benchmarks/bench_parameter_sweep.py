@@ -0,0 +1,32 @@
+# Benchmark: ParameterSweep throughput (configurations/s) against the number of
+# worker processes.
+#
+#   python benchmarks/bench_parameter_sweep.py [n_bars]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from trading.parameter_sweep import ParameterSweep
+
+
+def main(n_bars=200000):
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.001, n_bars)))
+    grid = {'buy_margin': np.linspace(0, 0.05, 12).tolist(), 'sell_margin': np.linspace(0, 0.05, 12).tolist()}
+    n_configs = len(grid['buy_margin']) * len(grid['sell_margin'])
+
+    baseline = None
+    for n_workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        started = time.perf_counter()
+        ParameterSweep(prices, grid, n_workers=n_workers, chunk_size=4).run()
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"workers={n_workers:3d}  {n_configs / elapsed:8.1f} configs/s  speedup {baseline / elapsed:4.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
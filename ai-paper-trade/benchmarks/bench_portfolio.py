@@ -0,0 +1,52 @@
+# Benchmark: cost of an account-value query after every price tick, with the
+# incremental PortfolioState versus re-pricing every position on each query
+# (the previous get_account_balance).
+#
+#   python benchmarks/bench_portfolio.py [n_positions] [n_ticks]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from trading.broker_interface import BrokerInterface
+
+
+def full_revaluation(broker):
+    value = 0
+    for symbol, position in broker.positions.items():
+        value += position['quantity'] * broker.current_prices[symbol]
+    return broker.balance + value
+
+
+def main(n_positions=500, n_ticks=200000):
+    rng = np.random.default_rng(0)
+    symbols = [f"SYM{i}" for i in range(n_positions)]
+    broker = BrokerInterface(initial_balance=1e9)
+    for symbol in symbols:
+        broker.update_current_price(symbol, 100.0)
+        broker.place_order(symbol, 10)
+    tick_symbols = rng.integers(0, n_positions, n_ticks).tolist()
+    tick_prices = rng.uniform(90, 110, n_ticks).tolist()
+
+    started = time.perf_counter()
+    for i in range(n_ticks // 100):
+        broker.current_prices[symbols[tick_symbols[i]]] = tick_prices[i]
+        full_revaluation(broker)
+    per_tick = (time.perf_counter() - started) / (n_ticks // 100)
+    print(f"re-price every position: {1 / per_tick:12,.0f} tick+query/s")
+
+    started = time.perf_counter()
+    for symbol_index, price in zip(tick_symbols, tick_prices):
+        broker.update_current_price(symbols[symbol_index], price)
+        broker.get_account_balance()['total_value']
+    per_tick = (time.perf_counter() - started) / n_ticks
+    print(f"incremental portfolio:   {1 / per_tick:12,.0f} tick+query/s  ({n_positions} positions)")
+    print(f"drift vs recomputation:  {abs(broker.portfolio.total_value - full_revaluation(broker)):.2e}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
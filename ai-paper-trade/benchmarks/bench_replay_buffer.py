@@ -0,0 +1,69 @@
+# Benchmark: ReplayBuffer / PrioritizedReplayBuffer insert and sample
+# throughput, and the fixed memory footprint, compared with a deque of
+# tuples sampled with random.sample.
+#
+#   python benchmarks/bench_replay_buffer.py [capacity]
+
+import os
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from training.replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
+
+STATE_SIZE, BATCH, N_SAMPLES = 16, 64, 2000
+
+
+def timed(label, func, count, unit):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:36s} {count / elapsed:14,.0f} {unit}/s")
+
+
+def main(capacity=1000000):
+    rng = np.random.default_rng(0)
+    states = rng.normal(size=(capacity, STATE_SIZE)).astype(np.float32)
+    actions = rng.integers(-1, 2, capacity)
+    rewards = rng.normal(size=capacity)
+    n_adds = min(capacity, 200000)
+
+    memory = deque(maxlen=capacity)
+
+    def deque_add():
+        for i in range(n_adds):
+            memory.append((states[i], actions[i], rewards[i], states[i], False))
+
+    timed("deque append", deque_add, n_adds, "transitions")
+    timed("deque random.sample", lambda: [random.sample(memory, BATCH) for _ in range(N_SAMPLES)],
+          N_SAMPLES * BATCH, "samples")
+
+    for buffer in (ReplayBuffer(capacity, STATE_SIZE, seed=0), PrioritizedReplayBuffer(capacity, STATE_SIZE, seed=0)):
+        name = type(buffer).__name__
+
+        def add_one():
+            for i in range(n_adds):
+                buffer.add(states[i], actions[i], rewards[i], states[i], False)
+
+        timed(f"{name}.add", add_one, n_adds, "transitions")
+        timed(f"{name}.add_batch", lambda: buffer.add_batch(states, actions, rewards, states,
+                                                              np.zeros(capacity, dtype=bool)),
+              capacity, "transitions")
+
+        def sample():
+            for _ in range(N_SAMPLES):
+                batch = buffer.sample(BATCH)
+                if isinstance(buffer, PrioritizedReplayBuffer):
+                    buffer.update_priorities(batch['indices'], rng.random(BATCH))
+
+        timed(f"{name}.sample", sample, N_SAMPLES * BATCH, "samples")
+        print(f"{name} footprint: {buffer.nbytes / 2 ** 20:.1f} MiB for {capacity:,} transitions")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,58 @@
+# Benchmark: per-step reward shaping in a Python loop over every environment
+# versus one RewardFunctions.shaped_rewards call on the (envs x time) equity curves.
+#
+#   python benchmarks/bench_rewards.py [n_envs] [n_steps]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from training.reward_functions import RewardFunctions
+
+WINDOW = 20
+COST_RATE = 0.001
+DRAWDOWN_WEIGHT = 0.5
+
+
+def loop_rewards(equity, traded):
+    rewards = np.empty_like(traded)
+    for env in range(equity.shape[0]):
+        peak = equity[env, 0]
+        returns = []
+        for step in range(1, equity.shape[1]):
+            step_return = equity[env, step] / equity[env, step - 1] - 1
+            returns.append(step_return)
+            window = returns[-WINDOW:]
+            sharpe = np.mean(window) / np.std(window, ddof=1) if len(window) > 1 else 0.0
+            peak = max(peak, equity[env, step])
+            drawdown = 1 - equity[env, step] / peak
+            rewards[env, step - 1] = sharpe - DRAWDOWN_WEIGHT * drawdown - COST_RATE * traded[env, step - 1] / equity[env, step - 1]
+    return rewards
+
+
+def main(n_envs=1000, n_steps=2520):
+    rng = np.random.default_rng(0)
+    equity = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_envs, n_steps)), axis=1))
+    traded = np.abs(rng.normal(0, 100, (n_envs, n_steps - 1)))
+    rewards = RewardFunctions()
+
+    sample = max(1, n_envs // 100)
+    started = time.perf_counter()
+    expected = loop_rewards(equity[:sample], traded[:sample])
+    looped = (time.perf_counter() - started) * n_envs / sample
+
+    started = time.perf_counter()
+    shaped = rewards.shaped_rewards(equity, traded, COST_RATE, DRAWDOWN_WEIGHT, sharpe_window=WINDOW)
+    batched = time.perf_counter() - started
+
+    assert np.allclose(shaped[:sample], expected)
+    print(f"per-step loop:          {looped:9.3f} s for {n_envs} x {n_steps} (extrapolated from {sample} envs)")
+    print(f"batched shaped_rewards: {batched:9.3f} s  ({looped / batched:.0f}x)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+# Benchmark: cold-start cost of the command-line entry point. Every case runs in a
+# fresh interpreter; `python -X importtime` attributes the import time to the
+# heaviest top-level modules, and the wall time covers a whole synthetic backtest.
+#
+#   python benchmarks/bench_startup.py [repeats] [top_modules]
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+MAIN = os.path.join(SRC, 'main.py')
+
+CASES = [
+    ('import main', ['-c', 'import main']),
+    ('backtest (synthetic)', [MAIN, 'backtest', '--seed', '0', '--steps', '252']),
+    ('import data.yfinance_api', ['-c', 'import data.yfinance_api']),
+]
+
+
+def run(args, importtime=False):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + args
+    started = time.perf_counter()
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    return time.perf_counter() - started, completed.stderr
+
+
+def import_times(stderr):
+    """Cumulative microseconds of every top-level import in -X importtime output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):  # nested imports are indented by two more spaces per level
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(repeats=5, top=5):
+    for label, args in CASES:
+        wall = statistics.median(run(args)[0] for _ in range(repeats))
+        times = import_times(run(args, importtime=True)[1])
+        heaviest = sorted(times.items(), key=lambda item: -item[1])[:top]
+        print(f"{label:26s} {wall * 1000:7.1f} ms wall, {sum(times.values()) / 1000:7.1f} ms importing")
+        for name, micros in heaviest:
+            print(f"    {name:30s} {micros / 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,47 @@
+# Benchmark: TradingStrategy thresholds over a minute-bar history, comparing
+# execute_strategy with the full history list (O(N^2)), the streaming
+# on_bar path (monotonic deques) and the vectorized generate_signals path.
+#
+#   python benchmarks/bench_strategy_thresholds.py [n_bars] [lookback]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from trading.strategy import TradingStrategy
+
+
+def main(n_bars=1_000_000, lookback=390):
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.0005, n_bars)))
+    strategy = TradingStrategy(buy_margin=0.001, sell_margin=0.001, lookback=lookback)
+
+    sample = 20000
+    history = prices[:sample].tolist()
+    started = time.perf_counter()
+    for t in range(1, sample):
+        TradingStrategy(buy_margin=0.001, sell_margin=0.001).execute_strategy(history[t], history[:t])
+    quadratic = time.perf_counter() - started
+
+    price_list = prices.tolist()
+    started = time.perf_counter()
+    for price in price_list:
+        strategy.on_bar(price)
+    streaming = time.perf_counter() - started
+
+    started = time.perf_counter()
+    strategy.generate_signals(prices)
+    vectorized = time.perf_counter() - started
+
+    print(f"execute_strategy, full history ({sample:,} bars): {quadratic:8.3f} s")
+    print(f"on_bar streaming ({n_bars:,} bars):              {streaming:8.3f} s")
+    print(f"generate_signals ({n_bars:,} bars):              {vectorized:8.3f} s")
+
+
+if __name__ == '__main__':
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lookback = int(sys.argv[2]) if len(sys.argv) > 2 else 390
+    main(n_bars, lookback)
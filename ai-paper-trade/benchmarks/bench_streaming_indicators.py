@@ -0,0 +1,48 @@
+# Benchmark: per-tick cost of StreamingIndicatorSet vs. recomputing the batch
+# indicators over the full history on every new bar.
+#
+#   python benchmarks/bench_streaming_indicators.py [n_symbols] [history_bars]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data.indicators import IndicatorEngine
+from data.streaming_indicators import StreamingIndicatorSet
+
+INDICATORS = {'sma': {}, 'ema': {}, 'rsi': {}, 'macd': {}, 'bollinger': {}}
+
+
+def main(n_symbols=2000, history_bars=1000, ticks=200):
+    rng = np.random.default_rng(0)
+    history = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (history_bars + ticks, n_symbols)), axis=0))
+
+    streaming = StreamingIndicatorSet(INDICATORS, n_symbols=n_symbols)
+    streaming.warm_up(history[:history_bars])
+    started = time.perf_counter()
+    for t in range(history_bars, history_bars + ticks):
+        latest = streaming.update(history[t])
+    per_tick = (time.perf_counter() - started) / ticks
+
+    started = time.perf_counter()
+    for t in range(history_bars, history_bars + 5):
+        IndicatorEngine(history[:t + 1]).compute(INDICATORS)
+    recompute = (time.perf_counter() - started) / 5
+
+    batch = IndicatorEngine(history).compute(INDICATORS)
+    drift = max(np.nanmax(np.abs(latest[name] - batch[name][-1])) for name in batch)
+
+    print(f"{n_symbols} symbols, {history_bars} bars of history")
+    print(f"streaming update:     {per_tick * 1e3:8.3f} ms/tick  ({n_symbols / per_tick:,.0f} symbol-updates/s)")
+    print(f"full batch recompute: {recompute * 1e3:8.3f} ms/tick  ({recompute / per_tick:.0f}x slower)")
+    print(f"max |streaming - batch| after {ticks} ticks: {drift:.2e}")
+
+
+if __name__ == '__main__':
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    history_bars = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    main(n_symbols, history_bars)
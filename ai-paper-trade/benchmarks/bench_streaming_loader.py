@@ -0,0 +1,52 @@
+# Benchmark: peak Python memory and throughput of streaming a long minute-bar
+# history from CSV with DataLoader.iter_chunks, at several chunk sizes, versus
+# reading and preprocessing the whole file at once.
+#
+#   python benchmarks/bench_streaming_loader.py [n_bars]
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data.data_loader import DataLoader, preprocess_frame
+
+
+def measure(label, run):
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = run()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:22s} {rows:10,d} rows  {elapsed:7.2f} s  peak {peak / 1e6:8.1f} MB")
+
+
+def main(n_bars=1000000):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))
+    loader = DataLoader('BENCH', None, None)
+    loader.data = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                                'Volume': rng.integers(1, 1000, n_bars).astype(float)},
+                               index=pd.date_range('2015-01-01', periods=n_bars, freq='min', name='Datetime'))
+    tmp = tempfile.mkdtemp()
+    try:
+        path = loader.save_data(os.path.join(tmp, 'BENCH.csv'))
+        del loader, close
+        measure("whole file", lambda: len(preprocess_frame(pd.read_csv(path, index_col=0, parse_dates=True))))
+        for chunk_size in [10000, 100000]:
+            reader = DataLoader('BENCH', None, None)
+            measure(f"chunks of {chunk_size:,}", lambda: sum(len(chunk) for chunk in reader.iter_chunks(chunk_size, path)))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,41 @@
+# Benchmark: generating 10,000 paths of ten years of daily bars with every
+# SyntheticMarket model, streamed in blocks of paths so memory stays bounded
+# by one block.
+#
+#   python benchmarks/bench_synthetic.py [n_paths] [n_steps] [path_chunk]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from simulation.synthetic import BootstrapModel, SyntheticMarket
+
+
+def main(n_paths=10000, n_steps=2520, path_chunk=1000):
+    history = np.random.default_rng(0).standard_t(4, 2520) * 0.01
+    models = {
+        'gbm': 'gbm',
+        'jump_diffusion': 'jump_diffusion',
+        'garch': 'garch',
+        'bootstrap': BootstrapModel(history),
+    }
+    print(f"{n_paths} paths x {n_steps} steps, blocks of {path_chunk} paths")
+    for name, model in models.items():
+        market = SyntheticMarket(model, seed=0, dtype=np.float32)
+        started = time.perf_counter()
+        largest, final = 0, []
+        for _, _, prices in market.stream(n_paths, n_steps, path_chunk=path_chunk):
+            largest = max(largest, prices.nbytes)
+            final.append(prices[:, -1, 0])
+        elapsed = time.perf_counter() - started
+        final = np.concatenate(final)
+        print(f"{name:15s} {elapsed:6.2f} s  {n_paths * n_steps / elapsed / 1e6:6.1f} M bars/s  "
+              f"block {largest / 1e6:5.1f} MB  median final price {np.median(final):7.2f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
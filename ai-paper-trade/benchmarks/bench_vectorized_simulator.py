@@ -0,0 +1,49 @@
+# Benchmark: environment steps per second of VectorizedMarketSimulator vs. a
+# per-step Python loop over MarketSimulator-style scalar state.
+#
+#   python benchmarks/bench_vectorized_simulator.py [n_envs]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from simulation.market_simulator import MarketSimulator
+from simulation.vectorized_simulator import VectorizedMarketSimulator, BUY, SELL, HOLD
+
+
+def main(n_envs=4096, n_bars=2520, steps=500):
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    actions = rng.choice([SELL, HOLD, BUY], size=(steps, n_envs, 1)).astype(np.int8)
+
+    simulator = VectorizedMarketSimulator(prices, n_envs=n_envs, window=10, random_start=True, seed=0)
+    started = time.perf_counter()
+    for step in range(steps):
+        simulator.step(actions[step])
+    vectorized = n_envs * steps / (time.perf_counter() - started)
+
+    scalar = MarketSimulator(list(prices))
+    cash, position = 10000.0, 0
+    started = time.perf_counter()
+    for step in range(min(steps * 20, n_bars - 1)):
+        price = scalar.get_current_price()
+        action = actions[step % steps, 0, 0]
+        if action == BUY:
+            position += 1
+            cash -= price
+        elif action == SELL and position > 0:
+            position -= 1
+            cash += price
+        scalar.step()
+    looped = min(steps * 20, n_bars - 1) / (time.perf_counter() - started)
+
+    print(f"vectorized ({n_envs} envs): {vectorized:14,.0f} env-steps/s")
+    print(f"per-step Python loop:     {looped:14,.0f} env-steps/s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4096)
@@ -0,0 +1,41 @@
+# Benchmark: rendering long equity curves to image files with every point
+# versus LTTB / min-max downsampling, and batch rendering on a process pool.
+#
+#   python benchmarks/bench_visualization.py [n_points] [n_charts] [n_workers]
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.visualization import render_batch, render_trading_performance
+
+
+def main(n_points=2_000_000, n_charts=8, n_workers=None):
+    dates = pd.date_range('2015-01-01', periods=n_points, freq='min')
+    values = 10000 + np.cumsum(np.random.default_rng(0).normal(size=n_points))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        render_trading_performance(dates[:10], values[:10], os.path.join(workdir, 'warmup.png'))
+        for label, max_points, method in [('every point', 0, 'lttb'), ('lttb 2000', 2000, 'lttb'),
+                                          ('minmax 2000', 2000, 'minmax')]:
+            started = time.perf_counter()
+            render_trading_performance(dates, values, os.path.join(workdir, 'chart.png'), max_points=max_points,
+                                       method=method)
+            print(f"{label:12s}: {time.perf_counter() - started:7.3f} s per chart ({n_points} points)")
+
+        jobs = [{'kind': 'performance', 'path': os.path.join(workdir, f'run{i}.png'), 'dates': dates,
+                 'portfolio_values': values} for i in range(n_charts)]
+        started = time.perf_counter()
+        render_batch(jobs, n_workers)
+        print(f"batch       : {time.perf_counter() - started:7.3f} s for {n_charts} charts "
+              f"({n_workers or os.cpu_count()} workers)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
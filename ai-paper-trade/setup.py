@@ -9,13 +9,18 @@ setup(
     packages=find_packages(where='src'),
     package_dir={'': 'src'},
     install_requires=[
-        'yfinance',
         'numpy',
         'pandas',
-        'tensorflow',  # or 'torch' depending on the framework you choose
-        'matplotlib',   # for visualization
-        'scikit-learn'  # for any additional ML utilities
     ],
+    # Heavy dependencies are imported lazily, only by the code paths that use them
+    extras_require={
+        'data': ['yfinance'],  # downloads and live quotes
+        'viz': ['matplotlib'],  # chart rendering
+        'ml': ['tensorflow', 'scikit-learn'],  # or 'torch' depending on the framework you choose
+        'rl': ['gym'],
+        'broker': ['robin_stocks'],
+        'all': ['yfinance', 'matplotlib', 'tensorflow', 'scikit-learn', 'gym', 'robin_stocks'],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
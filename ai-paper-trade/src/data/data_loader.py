@@ -1,3 +1,153 @@
+import os
+import re
+
+import pandas as pd
+
+from utils.config import Config
+
+# Trailing UTC offset of a timestamp string, e.g. '+00:00' or 'Z'
+_OFFSET = re.compile(r'(Z|[+-]\d\d:?\d\d)$')
+
+
+def _flatten_columns(frame):
+    if frame.columns.nlevels > 1:
+        frame.columns = frame.columns.get_level_values(0)
+    return frame
+
+
+def preprocess_frame(frame):
+    """
+    Forward-fill missing values and add the close-to-close 'Return' column.
+
+    The input is left untouched. Rows still incomplete afterwards (the
+    first bar, which has no return) are dropped.
+
+    Parameters:
+    frame (DataFrame): OHLCV bars of one symbol; single-ticker yfinance
+        frames with (field, ticker) columns are flattened to the fields.
+
+    Returns:
+    DataFrame: The preprocessed copy.
+    """
+    frame = _flatten_columns(frame.ffill())
+    frame['Return'] = frame['Close'].pct_change()
+    return frame.dropna()
+
+
+class StreamingPreprocessor:
+    """
+    preprocess_frame applied to consecutive chunks of one symbol's history.
+
+    The last valid value of every column (for the forward-fill) and the
+    last close (for the first return of the next chunk) are carried across
+    chunk boundaries, so the concatenated output equals preprocess_frame on
+    the whole history while only one chunk is held at a time.
+    """
+
+    def __init__(self):
+        self.last_values = None
+        self.last_close = None
+
+    def process(self, chunk):
+        """
+        Preprocess the next chunk.
+
+        Parameters:
+        chunk (DataFrame): Bars following the previous chunk.
+
+        Returns:
+        DataFrame: The preprocessed rows of this chunk (may be empty).
+        """
+        chunk = _flatten_columns(chunk.ffill())
+        if self.last_values is not None:
+            chunk = chunk.fillna(self.last_values)
+        if len(chunk):
+            self.last_values = chunk.iloc[-1]
+
+        close = chunk['Close']
+        previous = close.shift(1)
+        if len(chunk) and self.last_close is not None:
+            previous.iloc[0] = self.last_close
+        chunk['Return'] = close / previous - 1
+        if len(chunk):
+            self.last_close = close.iloc[-1]
+        return chunk.dropna()
+
+
+def iter_preprocessed(chunks):
+    """
+    Preprocess a stream of consecutive chunks of one symbol's history.
+
+    Parameters:
+    chunks (iterable): DataFrames in time order.
+
+    Returns:
+    generator: The preprocessed chunks; empty ones are skipped.
+    """
+    preprocessor = StreamingPreprocessor()
+    for chunk in chunks:
+        processed = preprocessor.process(chunk)
+        if len(processed):
+            yield processed
+
+
+def read_csv_chunks(path, chunk_size=None, start_date=None, end_date=None):
+    """
+    Read a CSV of bars (dates in the first column) in chunks of rows.
+
+    Parameters:
+    path (str): CSV file, e.g. written by DataLoader.save_data.
+    chunk_size (int): Rows per chunk (default: Config.LOADER_CHUNK_SIZE).
+    start_date (str): First date kept (inclusive).
+    end_date (str): Last date kept (exclusive, as in yf.download).
+
+    Returns:
+    generator: DataFrames of at most chunk_size rows.
+    """
+    reader = pd.read_csv(path, index_col=0, chunksize=chunk_size or Config.LOADER_CHUNK_SIZE)
+    aware = None
+    for chunk in reader:
+        if aware is None:
+            # Decided once per file so every chunk gets the same index type
+            aware = len(chunk) > 0 and _OFFSET.search(str(chunk.index[0])) is not None
+        chunk.index = pd.to_datetime(chunk.index, utc=aware)
+        if start_date is not None:
+            chunk = chunk[chunk.index >= _bound(start_date, chunk.index)]
+        if end_date is not None:
+            if len(chunk) and chunk.index[0] >= _bound(end_date, chunk.index):
+                break
+            chunk = chunk[chunk.index < _bound(end_date, chunk.index)]
+        if len(chunk):
+            yield chunk
+
+
+def _bound(value, index):
+    timestamp = pd.Timestamp(value)
+    if index.tz is not None and timestamp.tz is None:
+        timestamp = timestamp.tz_localize(index.tz)
+    return timestamp
+
+
+def iter_symbol_chunks(paths, chunk_size=None, start_date=None, end_date=None, preprocess=True):
+    """
+    Stream many symbols' histories as (symbol, chunk) pairs, one symbol after another.
+
+    Parameters:
+    paths (dict): Symbol -> CSV path.
+    chunk_size (int): Rows per chunk (default: Config.LOADER_CHUNK_SIZE).
+    start_date (str): First date kept (inclusive).
+    end_date (str): Last date kept (exclusive).
+    preprocess (bool): Preprocess every chunk, carrying state across chunks.
+
+    Returns:
+    generator: (symbol, DataFrame) pairs.
+    """
+    for symbol, path in paths.items():
+        chunks = read_csv_chunks(path, chunk_size, start_date, end_date)
+        for chunk in iter_preprocessed(chunks) if preprocess else chunks:
+            yield symbol, chunk
+
+
 class DataLoader:
     def __init__(self, ticker, start_date, end_date):
         self.ticker = ticker
@@ -12,10 +162,38 @@ class DataLoader:
 
     def preprocess_data(self):
         if self.data is not None:
-            # Example preprocessing: fill missing values and normalize
-            self.data.fillna(method='ffill', inplace=True)
-            self.data['Return'] = self.data['Close'].pct_change()
-            self.data.dropna(inplace=True)
+            self.data = preprocess_frame(self.data)
             return self.data
         else:
-            raise ValueError("Data not loaded. Call load_data() first.")
\ No newline at end of file
+            raise ValueError("Data not loaded. Call load_data() first.")
+
+    def default_path(self):
+        return os.path.join(Config.HISTORICAL_DATA_PATH, f"{self.ticker}.csv")
+
+    def save_data(self, path=None):
+        """Write the loaded bars to a CSV that iter_chunks can stream (default: default_path())."""
+        if self.data is None:
+            raise ValueError("Data not loaded. Call load_data() first.")
+        path = path or self.default_path()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        _flatten_columns(self.data.copy()).to_csv(path)
+        return path
+
+    def iter_chunks(self, chunk_size=None, path=None, preprocess=True):
+        """
+        Stream the ticker's history between start_date and end_date from disk.
+
+        Only one chunk is held at a time, so peak memory depends on chunk_size
+        and not on the length of the history; the preprocessed chunks
+        concatenate to exactly what load_data() and preprocess_data() return.
+
+        Parameters:
+        chunk_size (int): Rows read per chunk (default: Config.LOADER_CHUNK_SIZE).
+        path (str): CSV with the ticker's bars (default: default_path()).
+        preprocess (bool): Preprocess every chunk, carrying state across chunks.
+
+        Returns:
+        generator: DataFrames in time order.
+        """
+        chunks = read_csv_chunks(path or self.default_path(), chunk_size, self.start_date, self.end_date)
+        return iter_preprocessed(chunks) if preprocess else chunks
@@ -0,0 +1,244 @@
+# dataset.py
+
+import os
+import json
+import time
+import shutil
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import preprocess_frame
+from .panel import Panel, align_rows, build_calendar, common_tz, fill_missing, normalize_index
+
+DATASET_VERSION = 1
+DEFAULT_FEATURES = ('Open', 'High', 'Low', 'Close', 'Volume', 'Return')
+
+
+def _is_dataset(path):
+    """Whether path is a directory holding a manifest written by DatasetBuilder."""
+    try:
+        with open(os.path.join(path, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return isinstance(manifest, dict) and 'version' in manifest and 'symbols' in manifest
+
+
+class DatasetBuilder:
+    """
+    Offline writer of preprocessed multi-symbol datasets.
+
+    A dataset is a directory holding one (date x symbol x feature) tensor in
+    ``data.npy``, a (date x symbol) ``mask.npy`` marking which symbols had a
+    bar on each date, the dates as int64 (UTC) nanoseconds in ``dates.npy`` and a
+    ``manifest.json`` naming the symbols, features, dtype and shape. Symbols
+    are preprocessed (see preprocess_frame), aligned on a shared calendar and
+    gap-filled with the same rules as Panel, one at a time, straight into
+    the memory-mapped output, so building needs memory for one symbol's
+    frame, not for the whole dataset. The directory is written under a
+    temporary name and renamed when complete.
+    """
+
+    def __init__(self, features=DEFAULT_FEATURES, dtype=np.float32, calendar='union', fill='none', fill_limit=None):
+        """
+        Initialize the builder.
+
+        Parameters:
+        features (sequence): Columns stored per symbol, in tensor order.
+        dtype: Dtype of the feature tensor.
+        calendar: 'union' or 'intersection' of the symbols' raw dates, or an explicit DatetimeIndex.
+        fill (str): Gap policy on the calendar ('none', 'ffill' or 'flat', see panel.fill_missing).
+        fill_limit (int): Longest gap filled.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.features = list(features)
+        self.dtype = np.dtype(dtype)
+        self.calendar = calendar
+        self.fill = fill
+        self.fill_limit = fill_limit
+
+    def build(self, frames, path, preprocess=True):
+        """
+        Write a dataset from per-symbol frames.
+
+        Parameters:
+        frames (dict): Symbol -> OHLCV DataFrame (e.g. from fetch_multiple_symbols).
+        path (str): Dataset directory; an existing dataset there is replaced, anything else raises FileExistsError.
+        preprocess (bool): Run preprocess_frame on every frame first.
+
+        Returns:
+        MemmapDataset: The dataset, opened read-only.
+        """
+        symbols = [symbol for symbol, frame in frames.items() if frame is not None and not frame.empty]
+        skipped = len(frames) - len(symbols)
+        if skipped:
+            self.logger.warning(f"Skipping {skipped} symbols without data")
+        if not symbols:
+            raise ValueError("No symbol has data to write")
+
+        tz = common_tz([frames[symbol].index for symbol in symbols])
+        dates = build_calendar([normalize_index(frames[symbol].index, tz) for symbol in symbols], self.calendar, tz)
+
+        path = os.path.normpath(path)  # a trailing separator would put the temp dir inside the target
+        if os.path.lexists(path) and not _is_dataset(path):
+            raise FileExistsError(f"{path} exists and is not a dataset; refusing to replace it")
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        shape = (len(dates), len(symbols), len(self.features))
+        data = np.lib.format.open_memmap(os.path.join(tmp_path, 'data.npy'), mode='w+', dtype=self.dtype, shape=shape)
+        mask = np.lib.format.open_memmap(os.path.join(tmp_path, 'mask.npy'), mode='w+', dtype=np.bool_,
+                                         shape=shape[:2])
+        date_values = dates.asi8
+        np.save(os.path.join(tmp_path, 'dates.npy'), date_values)
+
+        for column, symbol in enumerate(symbols):
+            frame = preprocess_frame(frames[symbol]) if preprocess else frames[symbol]
+            rows, keep = align_rows(date_values, normalize_index(frame.index, tz))
+            values = np.full((len(dates), 1, len(self.features)), np.nan, dtype=self.dtype)
+            present = np.zeros((len(dates), 1), dtype=bool)
+            values[rows, 0] = frame.reindex(columns=self.features).to_numpy(dtype=self.dtype)[keep]
+            present[rows] = True
+            fill_missing(values, present, self.fill, self.fill_limit, self.features)
+            data[:, column, :] = values[:, 0]
+            mask[:, column] = present[:, 0]
+        data.flush()
+        mask.flush()
+        del data, mask
+
+        manifest = {
+            'version': DATASET_VERSION,
+            'symbols': symbols,
+            'features': self.features,
+            'dtype': self.dtype.str,
+            'shape': list(shape),
+            'tz': tz,
+            'fill': self.fill,
+            'start': str(dates[0]) if len(dates) else None,
+            'end': str(dates[-1]) if len(dates) else None,
+            'created_at': time.time(),
+        }
+        with open(os.path.join(tmp_path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.lexists(path):
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+        self.logger.info(f"Wrote dataset {path}: {shape[0]} dates x {shape[1]} symbols x {shape[2]} features")
+        return MemmapDataset(path)
+
+
+class MemmapDataset:
+    """
+    Read access to a dataset written by DatasetBuilder.
+
+    The tensor and mask are memory-mapped, so opening is a manifest read
+    and a few page-table entries, slicing returns views and only the pages
+    touched are ever read. Processes opening the same dataset share those
+    pages through the OS cache, and pickling a dataset (e.g. to a worker
+    process) only sends its path.
+    """
+
+    def __init__(self, path, mode='r'):
+        """
+        Open a dataset.
+
+        Parameters:
+        path (str): Dataset directory.
+        mode (str): Memory-map mode; 'r' (read-only) or 'r+' (in-place edits).
+        """
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != DATASET_VERSION:
+            raise ValueError(f"Unsupported dataset version {self.manifest.get('version')} in {path}")
+        self.symbols = self.manifest['symbols']
+        self.features = self.manifest['features']
+        self.data = np.load(os.path.join(path, 'data.npy'), mmap_mode=mode)
+        self.mask = np.load(os.path.join(path, 'mask.npy'), mmap_mode=mode)
+        self.date_values = np.load(os.path.join(path, 'dates.npy'), mmap_mode='r')
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.feature_index = {feature: i for i, feature in enumerate(self.features)}
+        self._dates = None
+
+    def __getstate__(self):
+        return {'path': self.path, 'mode': self.mode}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['mode'])
+
+    def __len__(self):
+        return len(self.date_values)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def dates(self):
+        if self._dates is None:
+            dates = pd.DatetimeIndex(np.asarray(self.date_values).view('datetime64[ns]'))
+            tz = self.manifest.get('tz')
+            self._dates = dates.tz_localize('UTC').tz_convert(tz) if tz else dates
+        return self._dates
+
+    def date_slice(self, start=None, end=None):
+        """Row slice covering the dates in [start, end] (either bound may be None)."""
+        first = 0 if start is None else int(np.searchsorted(self.date_values, self._ns(start), side='left'))
+        last = len(self) if end is None else int(np.searchsorted(self.date_values, self._ns(end), side='right'))
+        return slice(first, last)
+
+    def _ns(self, value):
+        timestamp, tz = pd.Timestamp(value), self.manifest.get('tz')
+        if tz and timestamp.tz is None:
+            timestamp = timestamp.tz_localize(tz)
+        elif not tz and timestamp.tz is not None:
+            timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+        return timestamp.value
+
+    def feature(self, name, start=None, end=None):
+        """View of one feature as a (date x symbol) array."""
+        return self.data[self.date_slice(start, end), :, self.feature_index[name]]
+
+    def window(self, start=None, end=None, symbols=None):
+        """
+        Tensor rows between two dates.
+
+        Parameters:
+        start, end: Date bounds (inclusive).
+        symbols (list): Symbols to keep (default: all; selecting symbols copies).
+
+        Returns:
+        ndarray: (date x symbol x feature) array.
+        """
+        rows = self.data[self.date_slice(start, end)]
+        if symbols is None:
+            return rows
+        return rows[:, [self.symbol_index[symbol] for symbol in symbols]]
+
+    def frame(self, symbol, start=None, end=None, dropna=True):
+        """
+        One symbol's features as a DataFrame.
+
+        Parameters:
+        symbol (str): Symbol to read.
+        start, end: Date bounds (inclusive).
+        dropna (bool): Drop the dates on which the symbol had no bar.
+
+        Returns:
+        DataFrame: Dates x features.
+        """
+        rows = self.date_slice(start, end)
+        column = self.symbol_index[symbol]
+        frame = pd.DataFrame(self.data[rows, column], index=self.dates[rows], columns=self.features)
+        if dropna:
+            frame = frame[self.mask[rows, column]]
+        return frame
+
+    def panel(self, start=None, end=None):
+        """The dates in [start, end] as a Panel whose arrays are views of the mapped files."""
+        rows = self.date_slice(start, end)
+        return Panel(self.data[rows], self.mask[rows], self.dates[rows], self.symbols, self.features)
@@ -0,0 +1,232 @@
+# fetch_engine.py
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+class ConcurrentFetcher:
+    """
+    Bounded-concurrency fetch path for many symbols at once.
+
+    Symbols are grouped by the date ranges they still need (all of them
+    when the API has no cache), split into batches that are downloaded with
+    one grouped ``yf.download`` call each, and the batches run on a thread
+    pool. A failing batch never fails its neighbours: every symbol that a
+    batch could not deliver, by an error or an empty answer, is retried on
+    its own with exponential backoff, and a symbol whose data cannot be
+    cached is reported as an error without affecting the rest of its batch.
+    """
+
+    def __init__(self, api, max_workers=8, batch_size=20, max_retries=3, backoff=0.5, backoff_factor=2.0):
+        """
+        Initialize the fetcher.
+
+        Parameters:
+        api (YFinanceAPI): API whose downloader and cache are used.
+        max_workers (int): Maximum number of downloads in flight.
+        batch_size (int): Maximum number of symbols per grouped download.
+        max_retries (int): Retries per symbol after a failed download.
+        backoff (float): Delay in seconds before the first retry.
+        backoff_factor (float): Multiplier applied to the delay after every retry.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.api = api
+        self.max_workers = max(1, int(max_workers))
+        self.batch_size = max(1, int(batch_size))
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_factor = backoff_factor
+
+    def fetch(self, symbols, start_date=None, end_date=None, interval='1d'):
+        """
+        Fetch data for many symbols.
+
+        Parameters:
+        symbols (list): List of stock symbols to fetch data for.
+        start_date (str): The start date in 'YYYY-MM-DD' format.
+        end_date (str): The end date in 'YYYY-MM-DD' format.
+        interval (str): Data interval.
+
+        Returns:
+        tuple: (dict of symbol -> DataFrame, dict of symbol -> fetch report). Each
+        report holds 'status' ('cached', 'ok', 'empty' or 'error'), 'attempts',
+        'elapsed' (seconds), 'rows' and 'error'.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        cache = self.api.cache if start_date is not None and end_date is not None else None
+        results, reports, groups = {}, {}, {}
+
+        for symbol in symbols:
+            if cache is None:
+                ranges = ((start_date, end_date),)
+            else:
+                ranges = tuple(cache.missing_ranges(symbol, interval, start_date, end_date))
+            if ranges:
+                groups.setdefault(ranges, []).append(symbol)
+            else:
+                started = time.perf_counter()
+                results[symbol] = cache.read(symbol, interval, start_date, end_date)
+                reports[symbol] = self._report('cached', 0, time.perf_counter() - started, results[symbol])
+
+        batches = [(ranges, group[i:i + self.batch_size])
+                   for ranges, group in groups.items()
+                   for i in range(0, len(group), self.batch_size)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch_batch, batch, ranges, start_date, end_date, interval)
+                       for ranges, batch in batches]
+            for future in futures:
+                batch_results, batch_reports = future.result()
+                results.update(batch_results)
+                reports.update(batch_reports)
+
+        return {symbol: results[symbol] for symbol in symbols}, {symbol: reports[symbol] for symbol in symbols}
+
+    def _fetch_batch(self, symbols, ranges, start_date, end_date, interval):
+        """
+        Download one batch with grouped calls and fall back to per-symbol retries.
+
+        A range that the grouped call answers without bars for any symbol of
+        the batch has no bars (e.g. a weekend tail) and is not retried; a
+        symbol missing from an answer that does have bars is.
+        """
+        frames = {symbol: [] for symbol in symbols}
+        pending = {symbol: [] for symbol in symbols}  # Ranges left to the single-symbol fallback
+        group_errors = {}
+        group_elapsed = 0.0
+
+        for range_start, range_end in ranges:
+            started = time.perf_counter()
+            try:
+                grouped = self._download_group(symbols, range_start, range_end, interval)
+            except Exception as e:
+                self.logger.warning(f"Grouped download of {len(symbols)} symbols failed: {str(e)}")
+                grouped = None
+                group_errors[(range_start, range_end)] = str(e)
+            group_elapsed += time.perf_counter() - started
+            for symbol in symbols:
+                if grouped == {}:
+                    frames[symbol].append((range_start, range_end, pd.DataFrame()))
+                elif grouped is not None and symbol in grouped:
+                    frames[symbol].append((range_start, range_end, grouped[symbol]))
+                else:
+                    pending[symbol].append((range_start, range_end))
+
+        results, reports = {}, {}
+        for symbol in symbols:
+            started = time.perf_counter()
+            attempts, error = 1, None
+            if pending[symbol]:
+                errors = {key: group_errors[key] for key in pending[symbol] if key in group_errors}
+                retried, attempts, error = self._fetch_single(symbol, pending[symbol], errors, interval)
+                frames[symbol].extend(retried)
+
+            if error is None:
+                try:
+                    results[symbol] = self._store(symbol, frames[symbol], start_date, end_date, interval)
+                except Exception as e:
+                    error = f"storing data failed: {str(e)}"
+
+            # The grouped calls are shared by the batch; the rest of the time is this symbol's own
+            elapsed = group_elapsed + time.perf_counter() - started
+            if error is not None:
+                self.logger.error(f"Error fetching data for {symbol}: {error}")
+                results[symbol] = pd.DataFrame()
+                reports[symbol] = self._report('error', attempts, elapsed, None, error)
+                continue
+
+            status = 'ok' if not results[symbol].empty else 'empty'
+            reports[symbol] = self._report(status, attempts, elapsed, results[symbol])
+        return results, reports
+
+    def _fetch_single(self, symbol, ranges, errors, interval):
+        """
+        Retry the ranges of one symbol that the grouped downloads did not deliver, with exponential backoff.
+
+        The grouped download was attempt 1, so this makes at most max_retries
+        rounds of calls. yf.download reports most failures with an empty
+        frame, so an empty answer is retried like an error; a range that
+        still comes back empty without an error after the last retry is
+        accepted as having no bars.
+
+        Parameters:
+        symbol (str): The stock symbol.
+        ranges (list): (start, end) ranges to download.
+        errors (dict): Range -> error of the grouped download, for ranges whose grouped call raised.
+        interval (str): Data interval.
+
+        Returns:
+        tuple: (list of (start, end, frame), attempts, error or None).
+        """
+        frames, remaining, errors = [], list(ranges), dict(errors)
+        delay, attempt = self.backoff, 1
+        while remaining and attempt <= self.max_retries:
+            if attempt > 1:
+                time.sleep(delay)
+                delay *= self.backoff_factor
+            attempt += 1
+            retry, errors = [], {}
+            for range_start, range_end in remaining:
+                try:
+                    frame = self.api._download(symbol, self._format(range_start), self._format(range_end),
+                                               interval, True)
+                except Exception as e:
+                    errors[(range_start, range_end)] = str(e)
+                    retry.append((range_start, range_end))
+                    continue
+                if frame.empty:
+                    retry.append((range_start, range_end))
+                else:
+                    frames.append((range_start, range_end, frame))
+            remaining = retry
+
+        if errors:
+            return [], attempt, next(iter(errors.values()))
+        frames.extend((range_start, range_end, pd.DataFrame()) for range_start, range_end in remaining)
+        return frames, attempt, None
+
+    def _download_group(self, symbols, range_start, range_end, interval):
+        """Download several symbols with one call and split the result per symbol."""
+        data = self.api.downloader(symbols, start=self._format(range_start), end=self._format(range_end),
+                                   interval=interval, actions=True, group_by='ticker', threads=False,
+                                   progress=False)
+        if not isinstance(data.columns, pd.MultiIndex):
+            return {symbols[0]: data} if len(symbols) == 1 and not data.empty else {}
+
+        grouped = {}
+        tickers = set(data.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol in tickers:
+                frame = data[symbol].dropna(how='all')
+                if not frame.empty:
+                    grouped[symbol] = frame
+        return grouped
+
+    def _store(self, symbol, frames, start_date, end_date, interval):
+        """Merge downloaded frames into the cache (if any) and return the requested range."""
+        cache = self.api.cache if start_date is not None and end_date is not None else None
+        if cache is None:
+            data = [frame for _, _, frame in frames if not frame.empty]
+            return pd.concat(data) if data else pd.DataFrame()
+
+        for range_start, range_end, frame in frames:
+            cache.update(symbol, interval, frame, range_start, range_end)
+        return cache.read(symbol, interval, start_date, end_date)
+
+    def _format(self, value):
+        if isinstance(value, pd.Timestamp):
+            return self.api._format_date(value)
+        return value
+
+    @staticmethod
+    def _report(status, attempts, elapsed, data, error=None):
+        return {
+            'status': status,
+            'attempts': attempts,
+            'elapsed': elapsed,
+            'rows': 0 if data is None else len(data),
+            'error': error,
+        }
@@ -0,0 +1,288 @@
+# indicators.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PARAMS = {
+    'sma': {'period': 20},
+    'ema': {'period': 20},
+    'rsi': {'period': 14},
+    'macd': {'fast': 12, 'slow': 26, 'signal': 9},
+    'bollinger': {'period': 20, 'std_dev': 2},
+}
+
+
+def indicator_params(indicator, params):
+    """
+    Merge an indicator's parameters over its defaults.
+
+    Like ``YFinanceAPI.calculate_technical_indicator``, parameters the
+    indicator does not take are ignored (with a warning) instead of failing it.
+
+    Parameters:
+    indicator (str): Indicator name, a key of DEFAULT_PARAMS.
+    params (dict): Parameters given for it, or None.
+
+    Returns:
+    dict: Keyword arguments for the indicator.
+    """
+    defaults = DEFAULT_PARAMS[indicator.lower()]
+    params = params or {}
+    ignored = sorted(set(params) - set(defaults))
+    if ignored:
+        logging.getLogger(__name__).warning(f"Ignoring unknown parameters for {indicator}: {', '.join(ignored)}")
+    return {**defaults, **{name: value for name, value in params.items() if name in defaults}}
+
+
+_SCAN_BLOCK = 64
+_STD_CHUNK_ELEMENTS = 1 << 22
+
+
+def decay_scan(u, beta, block=_SCAN_BLOCK):
+    """
+    Evaluate the linear recurrence y[t] = beta * y[t - 1] + u[t] along axis 0.
+
+    The series is cut into blocks that are solved with one matrix product
+    each (all powers of beta are <= 1, so this is numerically stable), and
+    the values carried between blocks are solved by the same recurrence
+    with beta ** block.
+
+    Parameters:
+    u (numpy.ndarray): Inputs of shape (time, columns).
+    beta (float): Decay factor.
+
+    Returns:
+    numpy.ndarray: The recurrence output with the shape of u.
+    """
+    length = u.shape[0]
+    if length == 0:
+        return u.copy()
+
+    n_blocks = -(-length // block)
+    padded = np.zeros((n_blocks * block,) + u.shape[1:])
+    padded[:length] = u
+
+    lags = np.arange(block)[:, None] - np.arange(block)[None, :]
+    weights = np.where(lags >= 0, beta ** np.maximum(lags, 0), 0.0)
+    local = np.matmul(weights, padded.reshape(n_blocks, block, -1))
+
+    if n_blocks > 1:
+        carry = decay_scan(local[:, -1, :], beta ** block, block)
+        local[1:] += (beta ** np.arange(1, block + 1))[None, :, None] * carry[:-1, None, :]
+    return local.reshape(n_blocks * block, -1)[:length]
+
+
+class IndicatorEngine:
+    """
+    Compute a whole set of technical indicators over one close series or a
+    (time x symbol) panel of closes.
+
+    Intermediate results (rolling sums and means, EWMs, the first
+    difference) are computed once and shared between indicators, so e.g. the
+    SMA and the Bollinger middle band of the same period cost a single
+    rolling sum, and MACD reuses the EMAs of its periods.
+    Results match ``YFinanceAPI.calculate_technical_indicator``; EWM columns
+    with gaps inside the series fall back to pandas to keep its NaN rules.
+    """
+
+    def __init__(self, close):
+        """
+        Initialize the engine.
+
+        Parameters:
+        close (array-like): Close prices of shape (time,) or (time, symbols).
+        """
+        self.logger = logging.getLogger(__name__)
+        close = np.asarray(close, dtype=np.float64)
+        self._squeeze = close.ndim == 1
+        # An empty series (e.g. an empty date range) gives empty indicator columns
+        self.close = close.reshape(len(close), close.shape[1] if close.ndim == 2 else 1)
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _shape(self, values):
+        return values[:, 0] if self._squeeze else values
+
+    def diff(self):
+        """First difference of the close, NaN in the first row."""
+        def compute():
+            delta = np.full_like(self.close, np.nan)
+            delta[1:] = self.close[1:] - self.close[:-1]
+            return delta
+        return self._cached(('diff',), compute)
+
+    def _rolling_sums(self, name, values, period, center=True):
+        """
+        Rolling sum over full windows of ``period`` rows.
+
+        Values are shifted by their column mean before the cumulative sum is
+        taken to keep cancellation errors small; windows that contain a NaN
+        are NaN, like pandas.
+        """
+        def compute():
+            valid = ~np.isnan(values)
+            complete = valid.all()
+            shift = np.zeros(values.shape[1])
+            if center and complete and len(values):
+                shift = values.mean(axis=0)
+            elif center and valid.any():
+                counts = valid.sum(axis=0)
+                shift = np.where(counts > 0, np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+            centered = values - shift if complete else np.where(valid, values - shift, 0.0)
+
+            cum = np.empty((len(values) + 1, values.shape[1]))
+            cum[0] = 0.0
+            np.cumsum(centered, axis=0, out=cum[1:])
+
+            sums = np.full_like(values, np.nan)
+            if len(values) >= period:
+                np.subtract(cum[period:], cum[:-period], out=sums[period - 1:])
+                if not complete:
+                    cum_n = np.concatenate([np.zeros((1, values.shape[1])), np.cumsum(valid, axis=0)])
+                    sums[period - 1:][(cum_n[period:] - cum_n[:-period]) != period] = np.nan
+            return shift, sums
+        return self._cached(('rolling', name, period), compute)
+
+    def rolling_mean(self, period, name='close', values=None):
+        """Rolling mean of the close (or of another cached series)."""
+        values = self.close if values is None else values
+
+        def compute():
+            shift, sums = self._rolling_sums(name, values, period, center=name == 'close')
+            return sums / period + shift
+        return self._cached(('mean', name, period), compute)
+
+    def rolling_std(self, period):
+        """
+        Rolling sample standard deviation (ddof=1) of the close.
+
+        Squared deviations are taken from the shared rolling mean window by
+        window (in bounded time chunks) rather than from a running sum of
+        squares, which loses precision once prices drift far from their mean.
+        """
+        def compute():
+            mean = self.rolling_mean(period)
+            std = np.full_like(self.close, np.nan)
+            if len(self.close) < period or period < 2:
+                return std
+            windows = np.lib.stride_tricks.sliding_window_view(self.close, period, axis=0)
+            rows = max(1, _STD_CHUNK_ELEMENTS // (period * self.close.shape[1]))
+            for start in range(0, len(windows), rows):
+                chunk = windows[start:start + rows]
+                deviation = chunk - mean[period - 1 + start:period - 1 + start + len(chunk), :, None]
+                std[period - 1 + start:period - 1 + start + len(chunk)] = np.sqrt(
+                    np.einsum('tsw,tsw->ts', deviation, deviation) / (period - 1))
+            return std
+        return self._cached(('std', period), compute)
+
+    def ewm(self, span, name='close', values=None):
+        """Exponentially weighted mean with adjust=False of the close (or another series)."""
+        values = self.close if values is None else values
+
+        def compute():
+            alpha = 2.0 / (span + 1.0)
+            valid = ~np.isnan(values)
+            if valid.all():
+                u = alpha * values
+                u[:1] = values[:1]
+                return decay_scan(u, 1.0 - alpha)
+
+            seen = np.cumsum(valid, axis=0)
+            started = seen > 0
+            gapped = (started & ~valid).any(axis=0)
+
+            u = np.where(valid & (seen == 1), values, alpha * np.where(valid, values, 0.0))
+            result = decay_scan(u, 1.0 - alpha)
+            result[~started] = np.nan
+
+            if gapped.any():
+                fallback = pd.DataFrame(values[:, gapped]).ewm(span=span, adjust=False).mean()
+                result[:, gapped] = fallback.to_numpy()
+            return result
+        return self._cached(('ewm', name, span), compute)
+
+    def sma(self, period=20):
+        return self._shape(self.rolling_mean(period))
+
+    def ema(self, period=20):
+        return self._shape(self.ewm(period))
+
+    def rsi(self, period=14):
+        delta = self.diff()
+        gain = self._cached(('gain',), lambda: np.where(delta > 0, delta, 0.0))
+        loss = self._cached(('loss',), lambda: -np.where(delta < 0, delta, 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rs = self.rolling_mean(period, 'gain', gain) / self.rolling_mean(period, 'loss', loss)
+            return self._shape(100 - (100 / (1 + rs)))
+
+    def macd(self, fast=12, slow=26, signal=9):
+        macd_line = self._cached(('macd', fast, slow), lambda: self.ewm(fast) - self.ewm(slow))
+        signal_line = self.ewm(signal, f"macd_{fast}_{slow}", macd_line)
+        return {
+            'macd': self._shape(macd_line),
+            'signal': self._shape(signal_line),
+            'histogram': self._shape(macd_line - signal_line),
+        }
+
+    def bollinger(self, period=20, std_dev=2):
+        sma = self.rolling_mean(period)
+        std = self.rolling_std(period)
+        return {
+            'middle': self._shape(sma),
+            'upper': self._shape(sma + (std * std_dev)),
+            'lower': self._shape(sma - (std * std_dev)),
+        }
+
+    def compute(self, indicators):
+        """
+        Compute a set of indicators in one pass.
+
+        Parameters:
+        indicators (dict): Indicator names ('sma', 'ema', 'rsi', 'macd', 'bollinger')
+            mapped to their parameters, as accepted by
+            ``YFinanceAPI.get_historical_data_with_indicators``.
+
+        Returns:
+        dict: Output column name -> array. Multi-line indicators produce one
+        column per line named '<indicator>_<line>'. Unsupported or failing
+        indicators are logged and left out.
+        """
+        columns = {}
+        for indicator, params in indicators.items():
+            method = getattr(self, indicator.lower(), None) if indicator.lower() in DEFAULT_PARAMS else None
+            if method is None:
+                self.logger.warning(f"Unsupported indicator type: {indicator}")
+                continue
+            try:
+                values = method(**indicator_params(indicator, params))
+            except Exception as e:
+                # A bad spec (e.g. a non-integer period) only loses its own columns
+                self.logger.error(f"Error calculating {indicator}: {str(e)}")
+                continue
+            if isinstance(values, dict):
+                for line, line_values in values.items():
+                    columns[f"{indicator}_{line}"] = line_values
+            else:
+                columns[indicator] = values
+        return columns
+
+
+def compute_indicators(price_data, indicators):
+    """
+    Append a set of indicators computed from the 'Close' column to a price DataFrame.
+
+    Parameters:
+    price_data (pandas.DataFrame): Price data with a 'Close' column.
+    indicators (dict): Dictionary of indicators and their parameters.
+
+    Returns:
+    pandas.DataFrame: A copy of price_data with one column per indicator line.
+    """
+    columns = IndicatorEngine(price_data['Close'].to_numpy()).compute(indicators)
+    return price_data.assign(**columns)
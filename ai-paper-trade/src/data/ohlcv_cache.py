@@ -0,0 +1,237 @@
+# ohlcv_cache.py
+
+import os
+import re
+import threading
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+INTRADAY_INTERVALS = frozenset(['1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h'])
+
+
+class OHLCVCache:
+    """
+    Columnar on-disk store of OHLCV history keyed by (symbol, interval).
+
+    Every entry is a single ``.npz`` file holding one array per column, the
+    bar index as int64 nanoseconds and the date ranges that have already
+    been requested from the data source (its coverage), as sorted, disjoint
+    [start, end) intervals. Coverage is tracked separately from the bar
+    index so that dates without bars (weekends, holidays) inside a fetched
+    range are not fetched again. Callers only pass ranges whose download
+    succeeded, so a range that came back without any bars (a weekend, a
+    holiday, the time before a listing) is recorded as covered as well.
+    """
+
+    def __init__(self, cache_dir, ttl=3600):
+        """
+        Initialize the cache.
+
+        Parameters:
+        cache_dir (str): Directory holding the cache files.
+        ttl (int): Lifetime in seconds of intraday entries.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def _path(self, symbol, interval):
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.cache_dir, f"{safe_symbol}_{interval}.npz")
+
+    def load(self, symbol, interval):
+        """
+        Load the cache entry for a symbol and interval.
+
+        Intraday entries older than the TTL are evicted instead of returned.
+
+        Returns:
+        dict or None: The entry, or None when nothing usable is cached.
+        """
+        path = self._path(symbol, interval)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            memo = self._memo.get(path)
+        if memo is not None and memo[0] == mtime:
+            entry = memo[1]
+        else:
+            try:
+                with np.load(path, allow_pickle=False) as archive:
+                    entry = {
+                        'index': archive['index'],
+                        'columns': [str(c) for c in archive['columns']],
+                        'values': {str(c): archive[f"col_{c}"] for c in archive['columns']},
+                        'coverage': [(int(lo), int(hi)) for lo, hi in archive['coverage'].reshape(-1, 2)],
+                        'fetched_at': float(archive['fetched_at']),
+                        'tz': str(archive['tz']),
+                        'index_name': str(archive['index_name']),
+                    }
+            except Exception as e:
+                self.logger.warning(f"Discarding unreadable cache file {path}: {str(e)}")
+                self.evict(symbol, interval)
+                return None
+            with self._lock:
+                self._memo[path] = (mtime, entry)
+
+        if interval in INTRADAY_INTERVALS and time.time() - entry['fetched_at'] > self.ttl:
+            self.logger.debug(f"Evicting stale intraday cache for {symbol} ({interval})")
+            self.evict(symbol, interval)
+            return None
+        return entry
+
+    def missing_ranges(self, symbol, interval, start_date, end_date):
+        """
+        Compute the parts of [start_date, end_date) that are not cached.
+
+        Returns:
+        list: (start, end) pandas Timestamps that still have to be fetched, in order;
+            gaps between cached intervals are included.
+        """
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        entry = self.load(symbol, interval)
+        if entry is None:
+            return [(start, end)]
+
+        missing = []
+        cursor = start
+        for covered_start, covered_end in entry['coverage']:
+            covered_start, covered_end = pd.Timestamp(covered_start), pd.Timestamp(covered_end)
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    @staticmethod
+    def _merge_coverage(coverage, start_ns, end_ns):
+        """Add [start_ns, end_ns) to sorted disjoint intervals, joining overlapping and adjacent ones."""
+        merged = []
+        for lo, hi in sorted(coverage + [(start_ns, end_ns)]):
+            if merged and lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            elif hi > lo:
+                merged.append((lo, hi))
+        return merged
+
+    def read(self, symbol, interval, start_date, end_date):
+        """
+        Read cached bars within [start_date, end_date).
+
+        Returns:
+        pandas.DataFrame: Cached bars (empty when nothing is cached).
+        """
+        entry = self.load(symbol, interval)
+        if entry is None:
+            return pd.DataFrame()
+
+        index = entry['index']
+        lo = np.searchsorted(index, self._local_ns(start_date, entry['tz']), side='left')
+        hi = np.searchsorted(index, self._local_ns(end_date, entry['tz']), side='left')
+        return self._frame(entry, slice(lo, hi))
+
+    def update(self, symbol, interval, frame, start_date, end_date, fetched_at=None):
+        """
+        Merge freshly fetched bars for [start_date, end_date) into the cache.
+
+        Only call this after a successful download: an empty frame records
+        that the range has no bars. The coverage never extends past the
+        fetch time, so the still-forming bar of the current session is
+        fetched again on the next request.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        start_ns = pd.Timestamp(start_date).value
+        end_ns = pd.Timestamp(end_date).value
+        cap = pd.Timestamp(fetched_at, unit='s')
+        if interval not in INTRADAY_INTERVALS:
+            cap = cap.normalize()
+        end_ns = max(start_ns, min(end_ns, cap.value))
+
+        if frame is None:
+            frame = pd.DataFrame()
+        entry = self.load(symbol, interval)
+        coverage = []
+        if entry is not None:
+            cached = self._frame(entry, slice(None))
+            if frame.empty:
+                frame = cached
+            elif not cached.empty:
+                frame = pd.concat([cached, frame])
+                frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+            coverage = entry['coverage']
+
+        self._write(symbol, interval, frame, self._merge_coverage(coverage, start_ns, end_ns), fetched_at)
+
+    def evict(self, symbol, interval):
+        """Remove the cache entry for a symbol and interval."""
+        path = self._path(symbol, interval)
+        with self._lock:
+            self._memo.pop(path, None)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove every cache entry."""
+        with self._lock:
+            self._memo.clear()
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _local_ns(value, tz):
+        timestamp = pd.Timestamp(value)
+        if tz and timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(tz)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+        return timestamp.value
+
+    @staticmethod
+    def _frame(entry, rows):
+        index = pd.DatetimeIndex(entry['index'][rows].view('datetime64[ns]'), name=entry['index_name'] or None)
+        if entry['tz']:
+            index = index.tz_localize('UTC').tz_convert(entry['tz'])
+        return pd.DataFrame({c: entry['values'][c][rows] for c in entry['columns']}, index=index)
+
+    def _write(self, symbol, interval, frame, coverage, fetched_at):
+        index = pd.DatetimeIndex(frame.index) if len(frame.index) else pd.DatetimeIndex([])
+        tz = str(index.tz) if index.tz is not None else ''
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+
+        arrays = {
+            'index': index.as_unit('ns').asi8.astype(np.int64),
+            'columns': np.array([str(c) for c in frame.columns], dtype=str),
+            'coverage': np.array(coverage, dtype=np.int64).reshape(-1, 2),
+            'fetched_at': np.array(fetched_at, dtype=np.float64),
+            'tz': np.array(tz),
+            'index_name': np.array(frame.index.name or ''),
+        }
+        for column in frame.columns:
+            arrays[f"col_{column}"] = frame[column].to_numpy()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(symbol, interval)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as handle:
+            np.savez(handle, **arrays)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._memo.pop(path, None)
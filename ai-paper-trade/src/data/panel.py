@@ -0,0 +1,340 @@
+# panel.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close')
+FILL_POLICIES = ('none', 'ffill', 'flat')
+# Row width (symbols x fields) from which gaps are filled row by row instead of with whole-array operations
+_ROW_FILL_MIN = 256
+
+
+def common_tz(indexes):
+    """
+    Time zone in which a set of indexes is aligned.
+
+    Returns:
+    str or None: Their shared zone, None if all are naive, 'UTC' when they differ.
+    """
+    zones = {str(pd.DatetimeIndex(index).tz) for index in indexes}
+    zone = zones.pop() if len(zones) == 1 else 'UTC'
+    return None if zone == 'None' else zone
+
+
+def normalize_index(index, tz):
+    """The index as a nanosecond DatetimeIndex in ``tz`` (naive dates mixed with aware ones are taken as UTC)."""
+    index = pd.DatetimeIndex(index).as_unit('ns')
+    if tz is None:
+        return index
+    return (index.tz_localize('UTC') if index.tz is None else index).tz_convert(tz)
+
+
+def build_calendar(indexes, how='union', tz=None):
+    """
+    Shared calendar of several date indexes.
+
+    Parameters:
+    indexes (list): Date indexes, already normalized (normalize_index) to ``tz``.
+    how: 'union' (every date any index has), 'intersection' (dates all
+        indexes share) or an explicit DatetimeIndex (e.g. exchange sessions).
+    tz (str): Time zone of the calendar.
+
+    Returns:
+    DatetimeIndex: Sorted, unique dates.
+    """
+    if not isinstance(how, str):
+        return normalize_index(how, tz).as_unit('ns').unique().sort_values()
+    if how not in ('union', 'intersection'):
+        raise ValueError(f"Unknown calendar '{how}'")
+    # Set operations on the raw int64 values; pandas' pairwise union is quadratic in the symbol count
+    values = [index.asi8 if index.is_unique else np.unique(index.asi8) for index in indexes]
+    values = np.sort(np.concatenate(values or [np.zeros(0, dtype=np.int64)]))
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]]) if len(values) else np.zeros(0, dtype=np.int64)
+    if how == 'intersection':
+        counts = np.diff(np.r_[starts, len(values)])
+        starts = starts[counts == len(indexes)]
+    values = values[starts]
+    dates = pd.DatetimeIndex(values.view('datetime64[ns]'))
+    return dates.tz_localize('UTC').tz_convert(tz) if tz is not None else dates
+
+
+def align_rows(calendar_values, index):
+    """
+    Rows of the calendar holding each date of an index.
+
+    Parameters:
+    calendar_values (ndarray): Calendar as sorted int64 nanoseconds.
+    index (DatetimeIndex): Dates to place, normalized to the calendar's time zone.
+
+    Returns:
+    tuple: (rows, keep): calendar row per kept date, and the boolean
+    selection of the dates that are on the calendar.
+    """
+    values = index.asi8
+    rows = np.minimum(np.searchsorted(calendar_values, values), max(len(calendar_values) - 1, 0))
+    keep = calendar_values[rows] == values if len(calendar_values) else np.zeros(len(values), dtype=bool)
+    return rows[keep], keep
+
+
+def fill_missing(values, mask, policy='ffill', limit=None, fields=DEFAULT_FIELDS):
+    """
+    Fill the gaps of an aligned (time x symbol x field) array in place.
+
+    Nothing is filled before a symbol's first bar. With 'ffill' every field
+    carries its last value forward; with 'flat' a missing bar becomes a
+    zero-volume bar at the previous close (price fields take the last
+    close, Volume and Return are 0, other fields carry forward). NaNs
+    inside real bars are forward-filled by both policies.
+
+    Parameters:
+    values (ndarray): Array of shape (time, symbols, fields).
+    mask (ndarray): (time, symbols) bool, True where the symbol had a bar.
+    policy (str): 'none', 'ffill' or 'flat'.
+    limit (int): Fill at most this many consecutive missing bars (None: no limit).
+    fields (list): Field names of the last axis.
+
+    Returns:
+    ndarray: ``values``.
+    """
+    if policy not in FILL_POLICIES:
+        raise ValueError(f"Unknown fill policy '{policy}'")
+    if policy == 'none' or not len(values):
+        return values
+
+    if values[0].size >= _ROW_FILL_MIN:
+        _fill_rows(values, limit)
+    else:
+        _fill_vectorized(values, limit)
+
+    fields = list(fields)
+    if policy == 'flat' and 'Close' in fields:
+        absent = ~mask
+        closes = values[:, :, fields.index('Close')]
+        for field in fields:
+            column = values[:, :, fields.index(field)]
+            if field in PRICE_FIELDS:
+                column[absent] = closes[absent]
+            elif field in ('Volume', 'Return'):
+                # Only gaps after the first bar (and within the limit) become empty bars
+                column[absent & ~np.isnan(closes)] = 0.0
+    return values
+
+
+def _fill_rows(values, limit):
+    """Forward-fill one row at a time; fast for wide rows and needs no temporaries of the full size."""
+    age = np.zeros(values.shape[1:], dtype=np.int64)
+    for row in range(1, len(values)):
+        current = values[row]
+        missing = np.isnan(current)
+        if limit is not None:
+            age = np.where(missing, age + 1, 0)
+            missing &= age <= limit
+        if missing.any():
+            current[missing] = values[row - 1][missing]
+
+
+def _fill_vectorized(values, limit):
+    """Forward-fill along time with whole-array operations; fast for long, narrow arrays."""
+    steps = np.arange(len(values))[:, None, None]
+    source = np.maximum.accumulate(np.where(np.isnan(values), -1, steps), axis=0)
+    filled = np.take_along_axis(values, np.maximum(source, 0), axis=0)
+    filled[source < 0] = np.nan
+    if limit is not None:
+        filled[steps - source > limit] = np.nan
+    missing = np.isnan(values)
+    values[missing] = filled[missing]
+
+
+class Panel:
+    """
+    Dense (time x symbol x field) array of many symbols on one calendar.
+
+    ``values`` is a C-contiguous float array, ``mask`` marks the (date,
+    symbol) pairs that had a real bar (filled gaps and dates before a
+    symbol's first bar are False) and ``dates``, ``symbols`` and ``fields``
+    label the axes. Lookups by date, symbol or field go through dicts built
+    once, so they are O(1); date ranges are found by binary search.
+    """
+
+    def __init__(self, values, mask, dates, symbols, fields):
+        """
+        Wrap aligned arrays (no copies are made).
+
+        Parameters:
+        values (ndarray): (time, symbols, fields) array.
+        mask (ndarray): (time, symbols) bool array.
+        dates (DatetimeIndex): One date per row.
+        symbols (list): One symbol per column.
+        fields (list): One name per field.
+        """
+        self.values = values
+        self.mask = mask
+        self.dates = pd.DatetimeIndex(dates).as_unit('ns')
+        self.symbols = list(symbols)
+        self.fields = list(fields)
+        if values.shape != (len(self.dates), len(self.symbols), len(self.fields)):
+            raise ValueError("values do not match the dates, symbols and fields")
+        self.date_values = self.dates.asi8
+        self.date_index = {value: row for row, value in enumerate(self.date_values.tolist())}
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.field_index = {field: i for i, field in enumerate(self.fields)}
+
+    @classmethod
+    def from_frames(cls, frames, fields=DEFAULT_FIELDS, calendar='union', fill='ffill', fill_limit=None,
+                    dtype=np.float64):
+        """
+        Align per-symbol frames on one calendar.
+
+        Parameters:
+        frames (dict): Symbol -> DataFrame (e.g. from fetch_multiple_symbols);
+            empty frames are skipped.
+        fields (list): Columns to keep, in order (missing columns are NaN).
+        calendar: 'union', 'intersection' or an explicit DatetimeIndex.
+        fill (str): Gap policy, see fill_missing().
+        fill_limit (int): Longest gap filled.
+        dtype: Dtype of ``values``.
+
+        Returns:
+        Panel: The aligned panel.
+        """
+        frames = {symbol: frame for symbol, frame in frames.items() if frame is not None and not frame.empty}
+        fields = list(fields)
+        tz = common_tz([frame.index for frame in frames.values()])
+        indexes = {symbol: normalize_index(frame.index, tz) for symbol, frame in frames.items()}
+        dates = build_calendar(list(indexes.values()), calendar, tz)
+        calendar_values = dates.asi8
+
+        # Filled symbol by symbol in (symbol, time, field) order, where every symbol is one contiguous block
+        by_symbol = np.full((len(frames), len(dates), len(fields)), np.nan, dtype=dtype)
+        mask = np.zeros((len(frames), len(dates)), dtype=bool)
+        for column, (symbol, frame) in enumerate(frames.items()):
+            if frame.columns.nlevels > 1:
+                frame = frame.copy()
+                frame.columns = frame.columns.get_level_values(0)
+            rows, keep = align_rows(calendar_values, indexes[symbol])
+            block = by_symbol[column]
+            for j, field in enumerate(fields):
+                if field in frame.columns:
+                    block[rows, j] = frame[field].to_numpy(dtype=dtype, na_value=np.nan)[keep]
+            mask[column, rows] = True
+        values = np.ascontiguousarray(by_symbol.transpose(1, 0, 2))
+        del by_symbol
+        mask = np.ascontiguousarray(mask.T)
+        fill_missing(values, mask, fill, fill_limit, fields)
+        return cls(values, mask, dates, list(frames), fields)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def field(self, name):
+        """One field as a (time x symbol) view."""
+        return self.values[:, :, self.field_index[name]]
+
+    @property
+    def close(self):
+        return self.field('Close')
+
+    def row(self, date):
+        """Row of a calendar date; KeyError if the date is not on the calendar."""
+        return self.date_index[self._ns(date)]
+
+    def loc(self, date, symbol, field=None):
+        """Value of one field (or all fields) of a symbol on a date, in O(1)."""
+        values = self.values[self.row(date), self.symbol_index[symbol]]
+        return values if field is None else values[self.field_index[field]]
+
+    def _ns(self, date):
+        timestamp = pd.Timestamp(date)
+        tz = self.dates.tz
+        if tz is not None and timestamp.tz is None:
+            timestamp = timestamp.tz_localize(tz)
+        elif tz is None and timestamp.tz is not None:
+            timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+        return timestamp.as_unit('ns').value
+
+    def date_slice(self, start=None, end=None):
+        """Row slice covering the dates in [start, end] (either bound may be None)."""
+        first = 0 if start is None else int(np.searchsorted(self.date_values, self._ns(start), side='left'))
+        last = len(self.dates) if end is None else int(np.searchsorted(self.date_values, self._ns(end), side='right'))
+        return slice(first, last)
+
+    def slice(self, start=None, end=None, symbols=None):
+        """
+        Sub-panel between two dates (views when all symbols are kept).
+
+        Parameters:
+        start, end: Date bounds (inclusive).
+        symbols (list): Symbols to keep (default: all).
+
+        Returns:
+        Panel: The sub-panel.
+        """
+        rows = self.date_slice(start, end)
+        values, mask = self.values[rows], self.mask[rows]
+        if symbols is not None:
+            columns = [self.symbol_index[symbol] for symbol in symbols]
+            values, mask = values[:, columns], mask[:, columns]
+        return Panel(values, mask, self.dates[rows], self.symbols if symbols is None else symbols, self.fields)
+
+    def to_frame(self, symbol, dropna=False):
+        """
+        One symbol's fields as a DataFrame.
+
+        Parameters:
+        symbol (str): Symbol to read.
+        dropna (bool): Keep only the dates on which the symbol had a real bar.
+
+        Returns:
+        DataFrame: Dates x fields.
+        """
+        column = self.symbol_index[symbol]
+        frame = pd.DataFrame(self.values[:, column], index=self.dates, columns=self.fields)
+        return frame[self.mask[:, column]] if dropna else frame
+
+
+class PanelLoader:
+    """Fetches many symbols through YFinanceAPI and aligns them into a Panel."""
+
+    def __init__(self, api=None, fields=DEFAULT_FIELDS, calendar='union', fill='ffill', fill_limit=None):
+        """
+        Initialize the loader.
+
+        Parameters:
+        api (YFinanceAPI): Data source (default: a new YFinanceAPI).
+        fields (list): Fields kept per symbol.
+        calendar: 'union', 'intersection' or an explicit DatetimeIndex.
+        fill (str): Gap policy ('none', 'ffill' or 'flat').
+        fill_limit (int): Longest gap filled.
+        """
+        self.logger = logging.getLogger(__name__)
+        if api is None:
+            from .yfinance_api import YFinanceAPI
+            api = YFinanceAPI()
+        self.api = api
+        self.fields = list(fields)
+        self.calendar = calendar
+        self.fill = fill
+        self.fill_limit = fill_limit
+
+    def load(self, symbols, start_date=None, end_date=None, interval='1d'):
+        """
+        Fetch and align the symbols.
+
+        Parameters:
+        symbols (list): Symbols to load; those without data are left out.
+        start_date (str): The start date in 'YYYY-MM-DD' format.
+        end_date (str): The end date in 'YYYY-MM-DD' format.
+        interval (str): Data interval.
+
+        Returns:
+        Panel: The aligned panel.
+        """
+        frames = self.api.fetch_multiple_symbols(symbols, start_date, end_date, interval)
+        missing = [symbol for symbol, frame in frames.items() if frame is None or frame.empty]
+        if missing:
+            self.logger.warning(f"No data for {len(missing)} symbols: {', '.join(missing[:10])}")
+        return Panel.from_frames(frames, self.fields, self.calendar, self.fill, self.fill_limit)
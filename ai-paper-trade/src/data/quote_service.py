@@ -0,0 +1,254 @@
+# quote_service.py
+
+import time
+import logging
+import threading
+from concurrent.futures import Future
+
+from utils.config import Config
+
+
+class StaticQuoteSource:
+    """
+    Local quote source serving prices from a dict; a stand-in for the live
+    source in tests and simulations. Symbols without a price are reported
+    missing, and every request is counted.
+    """
+
+    def __init__(self, prices=None, delay=0.0):
+        """
+        Initialize the source.
+
+        Parameters:
+        prices (dict): Symbol -> price.
+        delay (float): Seconds every fetch takes (to exercise coalescing).
+        """
+        self.prices = dict(prices or {})
+        self.delay = delay
+        self.calls = 0
+        self.requested = []
+
+    def set_price(self, symbol, price):
+        self.prices[symbol] = price
+
+    def fetch(self, symbols):
+        self.calls += 1
+        self.requested.append(list(symbols))
+        if self.delay:
+            time.sleep(self.delay)
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+
+class YFinanceQuoteSource:
+    """Latest closes of many symbols from one grouped yf.download request."""
+
+    def __init__(self, downloader=None, period='5d', interval='1d'):
+        """
+        Initialize the source.
+
+        Parameters:
+        downloader (callable): Replacement for yf.download.
+        period (str): History requested per symbol; the last valid close is the quote.
+        interval (str): Bar interval of that history.
+        """
+        self.downloader = downloader
+        self.period = period
+        self.interval = interval
+
+    def fetch(self, symbols):
+        downloader = self.downloader
+        if downloader is None:
+            import yfinance as yf
+            downloader = yf.download
+        data = downloader(list(symbols), period=self.period, interval=self.interval, group_by='ticker',
+                          auto_adjust=False, threads=False, progress=False)
+        prices = {}
+        if data is None or data.empty:
+            return prices
+        for symbol in symbols:
+            try:
+                closes = data[symbol]['Close'] if data.columns.nlevels > 1 else data['Close']
+            except KeyError:
+                continue
+            closes = closes.dropna()
+            if len(closes):
+                prices[symbol] = float(closes.iloc[-1])
+        return prices
+
+
+class QuoteService:
+    """
+    Shared cache of latest prices in front of a quote source.
+
+    Quotes expire after a per-symbol TTL. Expired and unknown symbols are
+    refreshed together, in batches of up to ``batch_size`` symbols per
+    source request, and concurrent callers asking for a symbol that is
+    already being fetched wait for that fetch instead of issuing their own.
+    When a refresh fails the last known price is served, flagged as stale;
+    every quote carries its fetch time and age.
+    """
+
+    def __init__(self, source=None, ttl=None, batch_size=None, clock=time.time):
+        """
+        Initialize the service.
+
+        Parameters:
+        source: Object with fetch(symbols) -> dict of symbol -> price
+            (default: YFinanceQuoteSource).
+        ttl (float): Default quote lifetime in seconds (default: Config.QUOTE_TTL).
+        batch_size (int): Maximum symbols per source request (default: Config.QUOTE_BATCH_SIZE).
+        clock (callable): Time source in seconds.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.source = source if source is not None else YFinanceQuoteSource()
+        self.ttl = Config.QUOTE_TTL if ttl is None else ttl
+        self.batch_size = max(1, Config.QUOTE_BATCH_SIZE if batch_size is None else batch_size)
+        self.clock = clock
+        self._ttls = {}
+        self._cache = {}  # symbol -> (price, fetched_at)
+        self._in_flight = {}  # symbol -> Future resolved when its fetch is done
+        self._lock = threading.Lock()
+        self.metrics = dict.fromkeys(['hits', 'misses', 'coalesced', 'requests', 'symbols_fetched',
+                                      'errors', 'stale_served'], 0)
+
+    def set_ttl(self, symbol, ttl):
+        """Override the TTL of one symbol (None restores the default)."""
+        if ttl is None:
+            self._ttls.pop(symbol, None)
+        else:
+            self._ttls[symbol] = ttl
+
+    def update(self, symbol, price, timestamp=None):
+        """Store a price pushed from elsewhere (e.g. a streaming feed)."""
+        with self._lock:
+            self._cache[symbol] = (price, self.clock() if timestamp is None else timestamp)
+
+    def invalidate(self, symbol=None):
+        """Forget one symbol's quote, or all of them."""
+        with self._lock:
+            if symbol is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(symbol, None)
+
+    def get_price(self, symbol):
+        """Latest price of a symbol, or None when no price is available."""
+        return self.get_quote(symbol)['price']
+
+    def get_quote(self, symbol):
+        return self.get_quotes([symbol])[symbol]
+
+    def get_quotes(self, symbols, refresh=False):
+        """
+        Quotes for many symbols, refreshing expired ones in batched requests.
+
+        Parameters:
+        symbols (list): Symbols to quote.
+        refresh (bool): Refetch every symbol regardless of its TTL.
+
+        Returns:
+        dict: Symbol -> quote dict with 'price' (None if unavailable), 'fetched_at',
+        'age' (seconds), 'stale' (older than its TTL) and 'error'.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        owned, futures, waiting = [], {}, {}
+        now = self.clock()
+        with self._lock:
+            for symbol in symbols:
+                entry = self._cache.get(symbol)
+                if not refresh and entry is not None and now - entry[1] <= self._ttls.get(symbol, self.ttl):
+                    self.metrics['hits'] += 1
+                    continue
+                self.metrics['misses'] += 1
+                flight = self._in_flight.get(symbol)
+                if flight is not None:
+                    self.metrics['coalesced'] += 1
+                    waiting[symbol] = flight
+                else:
+                    self._in_flight[symbol] = futures[symbol] = Future()
+                    owned.append(symbol)
+
+        errors = {}
+        try:
+            for start in range(0, len(owned), self.batch_size):
+                errors.update(self._fetch(owned[start:start + self.batch_size]))
+        finally:
+            # Never leave a future of this call unresolved, or later callers would wait on it forever
+            self._resolve(futures, "quote request aborted")
+        for symbol, flight in waiting.items():
+            error = flight.result()
+            if error is not None:
+                errors[symbol] = error
+
+        now = self.clock()
+        with self._lock:
+            quotes = {symbol: self._quote(symbol, now, errors.get(symbol)) for symbol in symbols}
+        return quotes
+
+    def refresh(self, symbols):
+        """Refetch the given symbols now, in batched requests."""
+        return self.get_quotes(symbols, refresh=True)
+
+    def _fetch(self, batch):
+        """Fetch one batch from the source and resolve its in-flight futures; returns per-symbol errors."""
+        try:
+            prices = self.source.fetch(batch)
+            if not isinstance(prices, dict):
+                raise TypeError(f"quote source returned {type(prices).__name__}, expected a dict")
+            error = None
+        except Exception as e:
+            self.logger.error(f"Quote request for {len(batch)} symbols failed: {str(e)}")
+            prices, error = {}, str(e)
+
+        fetched_at = self.clock()
+        errors = {}
+        with self._lock:
+            self.metrics['requests'] += 1
+            self.metrics['symbols_fetched'] += len(prices)
+            for symbol in batch:
+                try:
+                    price = float(prices[symbol]) if prices.get(symbol) is not None else None
+                except (TypeError, ValueError):
+                    price, errors[symbol] = None, f"invalid quote {prices[symbol]!r}"
+                if price is not None and price == price:
+                    self._cache[symbol] = (price, fetched_at)
+                else:
+                    errors.setdefault(symbol, error or "no quote returned")
+                    self.metrics['errors'] += 1
+                self._in_flight.pop(symbol).set_result(errors.get(symbol))
+        return errors
+
+    def _resolve(self, futures, error):
+        """Resolve the still-pending futures (symbol -> Future) of one call with an error."""
+        with self._lock:
+            for symbol, flight in futures.items():
+                if not flight.done():
+                    if self._in_flight.get(symbol) is flight:
+                        del self._in_flight[symbol]
+                    flight.set_result(error)
+
+    def _quote(self, symbol, now, error):
+        entry = self._cache.get(symbol)
+        if entry is None:
+            return {'symbol': symbol, 'price': None, 'fetched_at': None, 'age': None, 'stale': True, 'error': error}
+        price, fetched_at = entry
+        age = now - fetched_at
+        stale = age > self._ttls.get(symbol, self.ttl)
+        if stale:
+            self.metrics['stale_served'] += 1
+            self.logger.warning(f"Serving a stale quote for {symbol} ({age:.0f}s old): {error or 'not refreshed'}")
+        return {'symbol': symbol, 'price': price, 'fetched_at': fetched_at, 'age': age, 'stale': stale,
+                'error': error}
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def get_quote_service():
+    """The process-wide QuoteService backed by yfinance, created on first use."""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = QuoteService()
+        return _default_service
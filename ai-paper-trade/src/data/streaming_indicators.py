@@ -0,0 +1,240 @@
+# streaming_indicators.py
+
+import numpy as np
+
+from .indicators import indicator_params
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer over the last ``period`` bars of one or many symbols.
+
+    Keeps a running sum and a running sum of squared deviations (updated
+    with the add/remove form of Welford's algorithm), so the window mean
+    and sample standard deviation cost O(1) per bar. Both are recomputed
+    exactly from the buffer every time it wraps around, which bounds the
+    floating-point drift at amortized O(1) cost. A window containing a NaN
+    (or not yet filled) yields NaN, like a pandas rolling window.
+    """
+
+    def __init__(self, period, n_symbols=1):
+        self.period = period
+        self.values = np.zeros((period, n_symbols))
+        self.valid = np.zeros((period, n_symbols), dtype=bool)
+        self.position = 0
+        self.total = np.zeros(n_symbols)
+        self.mean = np.zeros(n_symbols)
+        self.m2 = np.zeros(n_symbols)
+        self.n_invalid = np.full(n_symbols, period)
+
+    def push(self, x):
+        """Add one bar per symbol, evicting the oldest one."""
+        ok = ~np.isnan(x)
+        value = np.where(ok, x, 0.0)
+        old = self.values[self.position]
+
+        self.total += value - old
+        new_mean = self.mean + (value - old) / self.period
+        self.m2 += (value - old) * (value - new_mean + old - self.mean)
+        self.mean = new_mean
+        self.n_invalid += (~ok).astype(int) - (~self.valid[self.position]).astype(int)
+
+        self.values[self.position] = value
+        self.valid[self.position] = ok
+        self.position = (self.position + 1) % self.period
+        if self.position == 0:
+            self._resync()
+
+    def _resync(self):
+        self.total = self.values.sum(axis=0)
+        self.mean = self.total / self.period
+        deviation = self.values - self.mean
+        self.m2 = np.einsum('ps,ps->s', deviation, deviation)
+
+    @property
+    def full(self):
+        return self.n_invalid == 0
+
+    def window_mean(self):
+        return np.where(self.full, self.total / self.period, np.nan)
+
+    def window_std(self):
+        if self.period < 2:
+            return np.full(self.total.shape, np.nan)
+        return np.where(self.full, np.sqrt(np.maximum(self.m2, 0.0) / (self.period - 1)), np.nan)
+
+
+class _StreamingIndicator:
+    """Shared scalar/vector handling: ``n_symbols=None`` means one scalar series."""
+
+    def __init__(self, n_symbols):
+        self._scalar = n_symbols is None
+        self.n_symbols = 1 if n_symbols is None else n_symbols
+
+    def _input(self, close):
+        return np.asarray(close, dtype=np.float64).reshape(self.n_symbols)
+
+    def _output(self, values):
+        return float(values[0]) if self._scalar else values
+
+
+class StreamingSMA(_StreamingIndicator):
+    """Simple moving average updated one bar at a time."""
+
+    def __init__(self, period=20, n_symbols=None):
+        super().__init__(n_symbols)
+        self.window = RollingWindow(period, self.n_symbols)
+
+    def update(self, close):
+        self.window.push(self._input(close))
+        return self._output(self.window.window_mean())
+
+
+class StreamingEMA(_StreamingIndicator):
+    """Exponential moving average (adjust=False) updated one bar at a time."""
+
+    def __init__(self, period=20, n_symbols=None):
+        super().__init__(n_symbols)
+        self.alpha = 2.0 / (period + 1.0)
+        self.state = np.full(self.n_symbols, np.nan)
+
+    def _step(self, x):
+        started = ~np.isnan(self.state)
+        updated = np.where(started, (1.0 - self.alpha) * self.state + self.alpha * x, x)
+        self.state = np.where(np.isnan(x), self.state, updated)
+        return self.state
+
+    def update(self, close):
+        return self._output(self._step(self._input(close)))
+
+
+class StreamingRSI(_StreamingIndicator):
+    """
+    RSI updated one bar at a time.
+
+    Uses the same rolling-mean gains and losses as the batch RSI (including
+    the zero gain/loss of the very first bar), so both agree exactly.
+    """
+
+    def __init__(self, period=14, n_symbols=None):
+        super().__init__(n_symbols)
+        self.gains = RollingWindow(period, self.n_symbols)
+        self.losses = RollingWindow(period, self.n_symbols)
+        self.previous = np.full(self.n_symbols, np.nan)
+
+    def update(self, close):
+        x = self._input(close)
+        delta = x - self.previous
+        self.previous = x
+        self.gains.push(np.where(delta > 0, delta, 0.0))
+        self.losses.push(-np.where(delta < 0, delta, 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rs = self.gains.window_mean() / self.losses.window_mean()
+            return self._output(100 - (100 / (1 + rs)))
+
+
+class StreamingMACD(_StreamingIndicator):
+    """MACD line, signal line and histogram updated one bar at a time."""
+
+    def __init__(self, fast=12, slow=26, signal=9, n_symbols=None):
+        super().__init__(n_symbols)
+        self.fast = StreamingEMA(fast, self.n_symbols)
+        self.slow = StreamingEMA(slow, self.n_symbols)
+        self.signal = StreamingEMA(signal, self.n_symbols)
+
+    def update(self, close):
+        x = self._input(close)
+        macd_line = self.fast._step(x) - self.slow._step(x)
+        signal_line = self.signal._step(macd_line).copy()
+        return {
+            'macd': self._output(macd_line),
+            'signal': self._output(signal_line),
+            'histogram': self._output(macd_line - signal_line),
+        }
+
+
+class StreamingBollinger(_StreamingIndicator):
+    """Bollinger bands updated one bar at a time."""
+
+    def __init__(self, period=20, std_dev=2, n_symbols=None):
+        super().__init__(n_symbols)
+        self.std_dev = std_dev
+        self.window = RollingWindow(period, self.n_symbols)
+
+    def update(self, close):
+        self.window.push(self._input(close))
+        middle = self.window.window_mean()
+        std = self.window.window_std()
+        return {
+            'middle': self._output(middle),
+            'upper': self._output(middle + (std * self.std_dev)),
+            'lower': self._output(middle - (std * self.std_dev)),
+        }
+
+
+STREAMING_INDICATORS = {
+    'sma': StreamingSMA,
+    'ema': StreamingEMA,
+    'rsi': StreamingRSI,
+    'macd': StreamingMACD,
+    'bollinger': StreamingBollinger,
+}
+
+
+class StreamingIndicatorSet:
+    """
+    Streaming counterpart of ``IndicatorEngine.compute``.
+
+    Takes the same indicator configuration and produces the same output
+    column names, one bar (for every symbol) at a time. Missing bars
+    should be forward-filled before they are pushed; a NaN bar leaves the
+    EMA-based indicators unchanged.
+    """
+
+    def __init__(self, indicators, n_symbols=None):
+        """
+        Initialize the indicator set.
+
+        Parameters:
+        indicators (dict): Indicator names mapped to their parameters.
+        n_symbols (int): Number of symbols per bar, or None for one scalar series.
+        """
+        self.indicators = {}
+        for indicator, params in indicators.items():
+            kind = indicator.lower()
+            if kind not in STREAMING_INDICATORS:
+                raise ValueError(f"Unsupported indicator type: {indicator}")
+            self.indicators[indicator] = STREAMING_INDICATORS[kind](
+                **indicator_params(kind, params), n_symbols=n_symbols)
+
+    def update(self, close):
+        """
+        Push one bar.
+
+        Parameters:
+        close (float or numpy.ndarray): The new close (one per symbol).
+
+        Returns:
+        dict: Output column name -> latest value(s).
+        """
+        columns = {}
+        for indicator, streaming in self.indicators.items():
+            values = streaming.update(close)
+            if isinstance(values, dict):
+                for line, line_values in values.items():
+                    columns[f"{indicator}_{line}"] = line_values
+            else:
+                columns[indicator] = values
+        return columns
+
+    def warm_up(self, history):
+        """
+        Feed historical bars (oldest first) and return the latest values.
+
+        Parameters:
+        history (array-like): Closes of shape (time,) or (time, symbols).
+        """
+        columns = {}
+        for close in np.asarray(history, dtype=np.float64):
+            columns = self.update(close)
+        return columns
@@ -1,6 +1,6 @@
 # yfinance_api.py
 
-import yfinance as yf
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -8,16 +8,50 @@ import time
 import logging
 from functools import lru_cache
 
+from utils.config import Config
+from .ohlcv_cache import OHLCVCache
+from .fetch_engine import ConcurrentFetcher
+from .indicators import compute_indicators
+from .quote_service import QuoteService, YFinanceQuoteSource, get_quote_service
+
+
+# yfinance is imported on the first request only; importing it costs more than the rest of the package
+def _download(*args, **kwargs):
+    import yfinance as yf
+    return yf.download(*args, **kwargs)
+
+
+def _ticker(symbol):
+    import yfinance as yf
+    return yf.Ticker(symbol)
+
+
 class YFinanceAPI:
-    def __init__(self, cache_timeout=3600):
+    def __init__(self, cache_timeout=3600, cache_dir=None, use_cache=True, downloader=None, quote_service=None):
         """
         Initialize the YFinance API wrapper.
         
         Parameters:
         cache_timeout (int): Cache timeout in seconds for API calls (default: 1 hour)
+        cache_dir (str): Directory of the on-disk OHLCV cache (default: under Config.HISTORICAL_DATA_PATH)
+        use_cache (bool): Answer fetch_data from the on-disk cache where possible
+        downloader (callable): Replacement for yf.download, e.g. a local stand-in for tests
+        quote_service (QuoteService): Source of current prices (default: the shared service,
+            or one using `downloader` when that is given)
         """
         self.logger = logging.getLogger(__name__)
         self.cache_timeout = cache_timeout
+        self.downloader = downloader if downloader is not None else _download
+        self.last_fetch_report = {}
+        if quote_service is None:
+            quote_service = get_quote_service() if downloader is None \
+                else QuoteService(YFinanceQuoteSource(downloader))
+        self.quote_service = quote_service
+        self.cache = None
+        if use_cache:
+            if cache_dir is None:
+                cache_dir = os.path.join(Config.HISTORICAL_DATA_PATH, Config.OHLCV_CACHE_DIR)
+            self.cache = OHLCVCache(cache_dir, ttl=cache_timeout)
         
     def fetch_data(self, symbol, start_date, end_date, interval='1d', actions=True):
         """
@@ -34,13 +68,47 @@ class YFinanceAPI:
         pandas.DataFrame: A DataFrame containing the historical stock data.
         """
         try:
-            data = yf.download(symbol, start=start_date, end=end_date, interval=interval, actions=actions)
+            if self.cache is None or start_date is None or end_date is None:
+                data = self._download(symbol, start_date, end_date, interval, actions)
+            else:
+                data = self._fetch_cached(symbol, start_date, end_date, interval, actions)
             if data.empty:
                 self.logger.warning(f"No data found for {symbol} from {start_date} to {end_date}")
             return data
         except Exception as e:
             self.logger.error(f"Error fetching data for {symbol}: {str(e)}")
             return pd.DataFrame()
+
+    def _download(self, symbol, start_date, end_date, interval, actions):
+        """Download one symbol through the configured downloader and flatten its columns."""
+        data = self.downloader(symbol, start=start_date, end=end_date, interval=interval, actions=actions)
+        if isinstance(data.columns, pd.MultiIndex):
+            data = data.xs(symbol, axis=1, level=-1) if symbol in data.columns.get_level_values(-1) \
+                else data.droplevel(-1, axis=1)
+        return data
+
+    def _fetch_cached(self, symbol, start_date, end_date, interval, actions):
+        """
+        Serve a date range from the on-disk cache, downloading only the
+        missing head and/or tail of the range. A missing range that
+        downloads without error but without bars is cached as empty.
+        """
+        for missing_start, missing_end in self.cache.missing_ranges(symbol, interval, start_date, end_date):
+            fetched = self._download(symbol, self._format_date(missing_start),
+                                     self._format_date(missing_end), interval, True)
+            self.cache.update(symbol, interval, fetched, missing_start, missing_end)
+
+        data = self.cache.read(symbol, interval, start_date, end_date)
+        if not actions:
+            data = data.drop(columns=['Dividends', 'Stock Splits'], errors='ignore')
+        return data
+
+    @staticmethod
+    def _format_date(timestamp):
+        """Format a range bound the way yf.download expects it."""
+        if timestamp == timestamp.normalize():
+            return timestamp.strftime('%Y-%m-%d')
+        return timestamp.to_pydatetime()
     
     def fetch_current_price(self, symbol):
         """
@@ -50,32 +118,55 @@ class YFinanceAPI:
         symbol (str): The stock symbol to fetch the current price for.
         
         Returns:
-        float: The current price of the stock.
+        float: The current price of the stock, or None if it is unavailable.
+        """
+        quote = self.quote_service.get_quote(symbol)
+        if quote['price'] is None:
+            self.logger.error(f"Error fetching current price for {symbol}: {quote['error']}")
+        elif quote['stale']:
+            self.logger.warning(f"Serving a stale price for {symbol} ({quote['age']:.0f}s old)")
+        return quote['price']
+
+    def fetch_current_prices(self, symbols):
         """
-        try:
-            stock = yf.Ticker(symbol)
-            current_price = stock.history(period='1d')['Close'].iloc[-1]
-            return current_price
-        except Exception as e:
-            self.logger.error(f"Error fetching current price for {symbol}: {str(e)}")
-            return None
+        Fetch the current prices of many symbols, refreshing them in batched requests.
+
+        Parameters:
+        symbols (list): Stock symbols.
+
+        Returns:
+        dict: Symbol -> quote dict ('price', 'fetched_at', 'age', 'stale', 'error').
+        """
+        return self.quote_service.get_quotes(symbols)
     
-    def fetch_multiple_symbols(self, symbols, start_date=None, end_date=None, interval='1d'):
+    def fetch_multiple_symbols(self, symbols, start_date=None, end_date=None, interval='1d',
+                               max_workers=None, batch_size=None):
         """
         Fetch data for multiple symbols at once.
         
+        Symbols are downloaded in grouped batches on a bounded thread pool;
+        per-symbol status, attempts and timing of the last call are kept in
+        ``self.last_fetch_report``.
+        
         Parameters:
         symbols (list): List of stock symbols to fetch data for.
         start_date (str): The start date for fetching data in 'YYYY-MM-DD' format.
         end_date (str): The end date for fetching data in 'YYYY-MM-DD' format.
         interval (str): Data interval.
+        max_workers (int): Maximum concurrent downloads (default: Config.FETCH_MAX_WORKERS).
+        batch_size (int): Symbols per grouped download (default: Config.FETCH_BATCH_SIZE).
         
         Returns:
         dict: A dictionary with symbols as keys and DataFrames as values.
         """
-        result = {}
-        for symbol in symbols:
-            result[symbol] = self.fetch_data(symbol, start_date, end_date, interval)
+        fetcher = ConcurrentFetcher(
+            self,
+            max_workers=max_workers or Config.FETCH_MAX_WORKERS,
+            batch_size=batch_size or Config.FETCH_BATCH_SIZE,
+            max_retries=Config.FETCH_MAX_RETRIES,
+            backoff=Config.FETCH_RETRY_BACKOFF,
+        )
+        result, self.last_fetch_report = fetcher.fetch(symbols, start_date, end_date, interval)
         return result
     
     @lru_cache(maxsize=128)
@@ -90,7 +181,7 @@ class YFinanceAPI:
         dict: Company information.
         """
         try:
-            stock = yf.Ticker(symbol)
+            stock = _ticker(symbol)
             return stock.info
         except Exception as e:
             self.logger.error(f"Error fetching company info for {symbol}: {str(e)}")
@@ -109,7 +200,7 @@ class YFinanceAPI:
         pandas.DataFrame: Financial statement data.
         """
         try:
-            stock = yf.Ticker(symbol)
+            stock = _ticker(symbol)
             if statement_type == 'income':
                 return stock.income_stmt if period == 'annual' else stock.quarterly_income_stmt
             elif statement_type == 'balance':
@@ -134,7 +225,7 @@ class YFinanceAPI:
         tuple: (calls DataFrame, puts DataFrame)
         """
         try:
-            stock = yf.Ticker(symbol)
+            stock = _ticker(symbol)
             dates = stock.options
             
             if not dates:
@@ -164,7 +255,7 @@ class YFinanceAPI:
         pandas.Series: Dividend history.
         """
         try:
-            stock = yf.Ticker(symbol)
+            stock = _ticker(symbol)
             return stock.dividends
         except Exception as e:
             self.logger.error(f"Error fetching dividends for {symbol}: {str(e)}")
@@ -181,7 +272,7 @@ class YFinanceAPI:
         pandas.DataFrame: Analyst recommendations.
         """
         try:
-            stock = yf.Ticker(symbol)
+            stock = _ticker(symbol)
             return stock.recommendations
         except Exception as e:
             self.logger.error(f"Error fetching recommendations for {symbol}: {str(e)}")
@@ -198,7 +289,7 @@ class YFinanceAPI:
         tuple: (Major holders DataFrame, Institutional holders DataFrame)
         """
         try:
-            stock = yf.Ticker(symbol)
+            stock = _ticker(symbol)
             return stock.major_holders, stock.institutional_holders
         except Exception as e:
             self.logger.error(f"Error fetching major holders for {symbol}: {str(e)}")
@@ -216,7 +307,7 @@ class YFinanceAPI:
         list: List of news items.
         """
         try:
-            stock = yf.Ticker(symbol)
+            stock = _ticker(symbol)
             news = stock.news
             return news[:limit] if news and len(news) > limit else news
         except Exception as e:
@@ -331,6 +422,8 @@ class YFinanceAPI:
         """
         Get historical data with calculated technical indicators.
         
+        All indicators are computed in one pass by the shared IndicatorEngine.
+        
         Parameters:
         symbol (str): The stock symbol.
         start_date (str): Start date in 'YYYY-MM-DD' format.
@@ -347,15 +440,8 @@ class YFinanceAPI:
         if not indicators:
             return price_data
             
-        result = price_data.copy()
-        
-        for indicator, params in indicators.items():
-            indicator_data = self.calculate_technical_indicator(price_data, indicator, **params)
-            if indicator_data is not None:
-                if isinstance(indicator_data, pd.DataFrame):
-                    for col in indicator_data.columns:
-                        result[f"{indicator}_{col}"] = indicator_data[col]
-                else:
-                    result[indicator] = indicator_data
-                    
-        return result
\ No newline at end of file
+        try:
+            return compute_indicators(price_data, indicators)
+        except Exception as e:
+            self.logger.error(f"Error calculating indicators for {symbol}: {str(e)}")
+            return price_data
\ No newline at end of file
@@ -1,34 +1,112 @@
 # ai-paper-trade/src/main.py
+"""
+Command-line entry point.
+
+Start-up imports only the standard library and the configuration; every
+command imports what it uses. A backtest on synthetic prices loads numpy
+and nothing else, and only reading a CSV brings in pandas. yfinance is
+loaded only when data is downloaded, and matplotlib only when a chart is
+written.
+
+    python src/main.py backtest                                  # synthetic prices
+    python src/main.py backtest --csv data/historical/AAPL.csv --chart equity.png
+    python src/main.py download AAPL --start 2020-01-01 --end 2024-01-01
+"""
+
+import argparse
+import json
+import logging
+import sys
 
-import yfinance as yf
-from data.data_loader import DataLoader
-from models.neural_network import NeuralNetwork
-from models.trading_agent import TradingAgent
-from simulation.market_simulator import MarketSimulator
-from simulation.paper_trader import PaperTrader
-from training.reinforcement_learning import ReinforcementLearning
 from utils.config import Config
 
-def main():
-    # Load historical stock data
-    data_loader = DataLoader()
-    historical_data = data_loader.load_data()
 
-    # Initialize the neural network
-    neural_network = NeuralNetwork()
-    
-    # Train the trading agent
-    trading_agent = TradingAgent(neural_network)
-    reinforcement_learning = ReinforcementLearning(trading_agent)
-    reinforcement_learning.train(historical_data)
+def load_prices(args):
+    """Close prices of the backtest: from a CSV, a download, or a synthetic series."""
+    if args.csv:
+        import numpy as np
+        from data.data_loader import read_csv_chunks
+        chunks = read_csv_chunks(args.csv, start_date=args.start, end_date=args.end)
+        return np.concatenate([chunk['Close'].to_numpy(dtype=np.float64) for chunk in chunks])
+    if args.ticker:
+        from data.data_loader import DataLoader
+        loader = DataLoader(args.ticker, args.start, args.end)
+        loader.load_data()
+        return loader.preprocess_data()['Close'].to_numpy(dtype='float64')
+    from simulation.synthetic import SyntheticMarket
+    return SyntheticMarket(args.model, seed=args.seed).generate(1, args.steps)[0, :, 0]
+
+
+def backtest(args):
+    """Backtest the threshold strategy and print its performance report."""
+    from simulation.paper_trader import PaperTrader
+    from trading.strategy import TradingStrategy
+    from utils.analytics import backtest_report
+
+    prices = load_prices(args)
+    signals = TradingStrategy(args.buy_margin, args.sell_margin, args.lookback).generate_signals(prices)
+    result = PaperTrader(None, args.initial_balance).backtest(prices, signals, record_history=False)
+    report = backtest_report(result, prices, args.initial_balance, args.periods_per_year)
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for name, value in report.items():
+            print(f"{name:22s} {value:.6g}")
+    if args.chart:
+        from utils.visualization import render_trading_performance
+        render_trading_performance(None, result['equity'], args.chart, title="Backtest")
+        logging.getLogger(__name__).info(f"Equity chart written to {args.chart}")
+    return report
+
+
+def download(args):
+    """Download a ticker's daily bars to a CSV that `backtest --csv` streams."""
+    from data.data_loader import DataLoader
+    loader = DataLoader(args.ticker, args.start, args.end)
+    loader.load_data()
+    path = loader.save_data(args.output)
+    print(path)
+    return path
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='ai-paper-trade', description="Paper trading and backtesting tools.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('backtest', help="Backtest the threshold strategy on historical or synthetic prices.")
+    source = run.add_mutually_exclusive_group()
+    source.add_argument('--csv', help="CSV of bars with a Close column (e.g. written by `download`).")
+    source.add_argument('--ticker', help="Download this ticker's history first (needs yfinance).")
+    run.add_argument('--start', help="First date (inclusive).")
+    run.add_argument('--end', help="Last date (exclusive).")
+    run.add_argument('--model', default='gbm', help="Synthetic return model when no data is given.")
+    run.add_argument('--steps', type=int, default=2520, help="Synthetic bars when no data is given.")
+    run.add_argument('--seed', type=int, help="Seed of the synthetic prices.")
+    run.add_argument('--buy-margin', type=float, default=0.0)
+    run.add_argument('--sell-margin', type=float, default=0.0)
+    run.add_argument('--lookback', type=int, help="Bars of history behind the thresholds (default: all).")
+    run.add_argument('--initial-balance', type=float, default=Config.INITIAL_CAPITAL)
+    run.add_argument('--periods-per-year', type=int, default=252)
+    run.add_argument('--json', action='store_true', help="Print the report as JSON.")
+    run.add_argument('--chart', help="Write the equity curve to this image file (needs matplotlib).")
+    run.set_defaults(handler=backtest)
+
+    fetch = commands.add_parser('download', help="Download a ticker's history to CSV (needs yfinance).")
+    fetch.add_argument('ticker')
+    fetch.add_argument('--start', required=True)
+    fetch.add_argument('--end', required=True)
+    fetch.add_argument('--output', help="CSV path (default: under Config.HISTORICAL_DATA_PATH).")
+    fetch.set_defaults(handler=download)
+    return parser
+
 
-    # Simulate market conditions
-    market_simulator = MarketSimulator()
-    simulated_data = market_simulator.simulate_market()
+def main(argv=None):
+    logging.basicConfig(level=Config.LOGGING_LEVEL)
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+    return 0
 
-    # Execute paper trading
-    paper_trader = PaperTrader(trading_agent)
-    paper_trader.execute_trades(simulated_data)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
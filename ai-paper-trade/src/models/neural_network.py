@@ -1,41 +1,165 @@
+import numpy as np
+
+from utils.config import Config
+
+
 class NeuralNetwork:
-    def __init__(self, input_size, hidden_size, output_size):
+    def __init__(self, input_size, hidden_size, output_size, dtype=np.float64, seed=None):
         self.input_size = input_size
         self.hidden_size = hidden_size
         self.output_size = output_size
+        self.dtype = np.dtype(dtype)
+        self.rng = np.random.default_rng(seed)
         self.weights_input_hidden = self.initialize_weights(input_size, hidden_size)
         self.weights_hidden_output = self.initialize_weights(hidden_size, output_size)
+        self.loss_history = []
+        self._buffers = None
 
     def initialize_weights(self, input_size, output_size):
-        return np.random.randn(input_size, output_size) * 0.01
+        return (self.rng.standard_normal((input_size, output_size)) * 0.01).astype(self.dtype)
 
     def forward(self, x):
+        x = np.asarray(x, dtype=self.dtype)
         self.hidden_layer_activation = np.dot(x, self.weights_input_hidden)
         self.hidden_layer_output = self.activation_function(self.hidden_layer_activation)
         self.output_layer_activation = np.dot(self.hidden_layer_output, self.weights_hidden_output)
         return self.output_layer_activation
 
+    def predict(self, x):
+        """
+        Batch inference without touching the training state.
+
+        :param x: One observation of shape (input_size,) or a batch of shape (n, input_size).
+        :return: Outputs of shape (output_size,) or (n, output_size).
+        """
+        x = np.asarray(x, dtype=self.dtype)
+        hidden = self.activation_function(np.dot(x, self.weights_input_hidden))
+        return np.dot(hidden, self.weights_hidden_output)
+
+    def get_weights(self):
+        """Copies of the weight matrices, e.g. to broadcast to rollout workers."""
+        return {
+            'weights_input_hidden': self.weights_input_hidden.copy(),
+            'weights_hidden_output': self.weights_hidden_output.copy(),
+        }
+
+    def set_weights(self, weights):
+        """Load weights from get_weights() in place."""
+        self.weights_input_hidden[...] = weights['weights_input_hidden']
+        self.weights_hidden_output[...] = weights['weights_hidden_output']
+
     def activation_function(self, x):
         return 1 / (1 + np.exp(-x))  # Sigmoid activation function
 
-    def train(self, x, y, learning_rate, epochs):
+    def train(self, x, y, learning_rate=None, epochs=None, batch_size=None, shuffle=True):
+        """
+        Train with shuffled mini-batches.
+
+        Activations, deltas and gradients live in buffers that are allocated
+        once and reused for every step, and the weights are updated in place,
+        so memory stays flat across epochs. The mean loss of every epoch is
+        appended to loss_history.
+
+        :param x: Inputs of shape (n, input_size) (or one sample of shape (input_size,)).
+        :param y: Targets of shape (n, output_size) (or one target of shape (output_size,)).
+        :param learning_rate: Step size (default: Config.LEARNING_RATE).
+        :param epochs: Passes over the data (default: Config.EPOCHS).
+        :param batch_size: Samples per update (default: Config.BATCH_SIZE).
+        :param shuffle: Visit the samples in a new random order every epoch.
+        :return: Mean squared error of the last epoch.
+        """
+        learning_rate = Config.LEARNING_RATE if learning_rate is None else learning_rate
+        epochs = Config.EPOCHS if epochs is None else epochs
+        batch_size = Config.BATCH_SIZE if batch_size is None else batch_size
+
+        x = np.asarray(x, dtype=self.dtype).reshape(-1, self.input_size)
+        y = np.asarray(y, dtype=self.dtype).reshape(-1, self.output_size)
+        n_samples = len(x)
+        batch_size = max(1, min(batch_size, n_samples))
+        buffers = self._get_buffers(batch_size)
+        order = np.arange(n_samples)
+
+        loss = float('nan')
         for epoch in range(epochs):
-            output = self.forward(x)
-            loss = self.calculate_loss(y, output)
-            self.backpropagation(x, y, output, learning_rate)
+            if shuffle:
+                self.rng.shuffle(order)
+            total = 0.0
+            for start in range(0, n_samples, batch_size):
+                rows = order[start:start + batch_size]
+                n = len(rows)
+                xb, yb = buffers['x'][:n], buffers['y'][:n]
+                np.take(x, rows, axis=0, out=xb)
+                np.take(y, rows, axis=0, out=yb)
+                total += self._train_batch(xb, yb, learning_rate, buffers, n)
+            loss = total / n_samples
+            self.loss_history.append(loss)
+        return loss
+
+    def _get_buffers(self, batch_size):
+        if self._buffers is None or self._buffers['x'].shape[0] != batch_size \
+                or self._buffers['x'].dtype != self.dtype:
+            shapes = {
+                'x': (batch_size, self.input_size),
+                'y': (batch_size, self.output_size),
+                'hidden': (batch_size, self.hidden_size),
+                'hidden_delta': (batch_size, self.hidden_size),
+                'hidden_slope': (batch_size, self.hidden_size),
+                'output': (batch_size, self.output_size),
+                'grad_input_hidden': (self.input_size, self.hidden_size),
+                'grad_hidden_output': (self.hidden_size, self.output_size),
+            }
+            self._buffers = {name: np.empty(shape, dtype=self.dtype) for name, shape in shapes.items()}
+        return self._buffers
+
+    def _train_batch(self, x, y, learning_rate, buffers, n):
+        """One forward/backward pass over a batch held in the shared buffers; returns its summed loss."""
+        hidden = buffers['hidden'][:n]
+        output = buffers['output'][:n]
+        hidden_delta = buffers['hidden_delta'][:n]
+        hidden_slope = buffers['hidden_slope'][:n]
+        grad_input_hidden = buffers['grad_input_hidden']
+        grad_hidden_output = buffers['grad_hidden_output']
+
+        # Forward: sigmoid hidden layer, linear output layer
+        np.dot(x, self.weights_input_hidden, out=hidden)
+        np.negative(hidden, out=hidden)
+        np.exp(hidden, out=hidden)
+        hidden += 1
+        np.reciprocal(hidden, out=hidden)
+        np.dot(hidden, self.weights_hidden_output, out=output)
+
+        # Output error (y - output) doubles as the output delta of the linear layer
+        np.subtract(y, output, out=output)
+        batch_loss = float(np.einsum('ij,ij->', output, output)) / self.output_size
+
+        np.dot(output, self.weights_hidden_output.T, out=hidden_delta)
+        np.subtract(1, hidden, out=hidden_slope)
+        hidden_slope *= hidden
+        hidden_delta *= hidden_slope
+
+        step = self.dtype.type(learning_rate / n)
+        np.dot(hidden.T, output, out=grad_hidden_output)
+        np.dot(x.T, hidden_delta, out=grad_input_hidden)
+        grad_hidden_output *= step
+        grad_input_hidden *= step
+        self.weights_hidden_output += grad_hidden_output
+        self.weights_input_hidden += grad_input_hidden
+        return batch_loss
 
     def calculate_loss(self, y_true, y_pred):
         return np.mean((y_true - y_pred) ** 2)  # Mean Squared Error
 
     def backpropagation(self, x, y, output, learning_rate):
-        output_error = y - output
-        output_delta = output_error * self.activation_derivative(output)
+        x = np.asarray(x, dtype=self.dtype).reshape(-1, self.input_size)
+        output_delta = (np.asarray(y, dtype=self.dtype) - output).reshape(-1, self.output_size)  # linear output layer
 
+        hidden_layer_output = self.hidden_layer_output.reshape(-1, self.hidden_size)
         hidden_layer_error = output_delta.dot(self.weights_hidden_output.T)
-        hidden_layer_delta = hidden_layer_error * self.activation_derivative(self.hidden_layer_output)
+        hidden_layer_delta = hidden_layer_error * self.activation_derivative(hidden_layer_output)
 
-        self.weights_hidden_output += self.hidden_layer_output.T.dot(output_delta) * learning_rate
-        self.weights_input_hidden += x.T.dot(hidden_layer_delta) * learning_rate
+        step = learning_rate / len(x)
+        self.weights_hidden_output += hidden_layer_output.T.dot(output_delta) * step
+        self.weights_input_hidden += x.T.dot(hidden_layer_delta) * step
 
     def activation_derivative(self, x):
-        return x * (1 - x)  # Derivative of the sigmoid function
\ No newline at end of file
+        return x * (1 - x)  # Derivative of the sigmoid function
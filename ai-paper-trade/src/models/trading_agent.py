@@ -1,16 +1,72 @@
+from enum import IntEnum
+
+import numpy as np
+
+from utils.config import Config
+
+
+class Action(IntEnum):
+    """Action codes; the one definition of SELL/HOLD/BUY, shared by the simulators and the order book."""
+    SELL = -1
+    HOLD = 0
+    BUY = 1
+
+
+# Action code + 1 -> the name decide_action has always returned
+ACTION_NAMES = ('sell', 'hold', 'buy')
+
+
 class TradingAgent:
-    def __init__(self, neural_network):
+    """
+    Turns network predictions into Action codes.
+
+    Agents trained by ReinforcementLearning also provide ``act(state)`` and
+    ``learn(states, actions, rewards, next_states, dones, weights=None)``.
+    learn() always receives arrays with one row per transition, a batch of
+    one when learning transition by transition. ``weights`` holds the
+    importance-sampling weights of a prioritized replay batch (None for
+    uniform sampling) and should scale each transition's error and loss
+    term, or the prioritized sampling biases the updates. learn() may
+    return the per-transition errors, which become the transitions' new
+    priorities.
+    """
+
+    def __init__(self, neural_network, buy_threshold=None, sell_threshold=None):
+        """
+        :param neural_network: Network scoring observations; the first output is the signal.
+        :param buy_threshold: Signals above this buy (default: Config.BUY_THRESHOLD).
+        :param sell_threshold: Signals below this sell (default: Config.SELL_THRESHOLD).
+        """
         self.neural_network = neural_network
+        self.buy_threshold = Config.BUY_THRESHOLD if buy_threshold is None else buy_threshold
+        self.sell_threshold = Config.SELL_THRESHOLD if sell_threshold is None else sell_threshold
+
+    def decide_actions(self, observations, buy_threshold=None, sell_threshold=None):
+        """
+        Decide for a whole batch with one forward pass.
+
+        :param observations: Array of shape (n, features).
+        :param buy_threshold: Override of the agent's buy threshold.
+        :param sell_threshold: Override of the agent's sell threshold.
+        :return: int8 array of n Action codes.
+        """
+        observations = np.asarray(observations)
+        predictions = np.asarray(self.neural_network.predict(observations))
+        return self._interpret_predictions(predictions.reshape(len(observations), -1)[:, 0],
+                                           buy_threshold, sell_threshold)
 
     def decide_action(self, current_data):
-        prediction = self.neural_network.predict(current_data)
-        action = self._interpret_prediction(prediction)
-        return action
+        """Decide for one observation; returns 'buy', 'sell' or 'hold'."""
+        code = self.decide_actions(np.asarray(current_data)[None])[0]
+        return ACTION_NAMES[code + 1]
+
+    def _interpret_predictions(self, signals, buy_threshold=None, sell_threshold=None):
+        buy_threshold = self.buy_threshold if buy_threshold is None else buy_threshold
+        sell_threshold = self.sell_threshold if sell_threshold is None else sell_threshold
+        actions = np.zeros(len(signals), dtype=np.int8)
+        actions[signals > buy_threshold] = Action.BUY
+        actions[signals < sell_threshold] = Action.SELL
+        return actions
 
     def _interpret_prediction(self, prediction):
-        if prediction > 0.5:
-            return 'buy'
-        elif prediction < -0.5:
-            return 'sell'
-        else:
-            return 'hold'
\ No newline at end of file
+        return ACTION_NAMES[self._interpret_predictions(np.ravel(prediction)[:1])[0] + 1]
@@ -1,5 +1,15 @@
+from .synthetic import SyntheticMarket, TRADING_DAYS
+
+
 class MarketSimulator:
-    def __init__(self, historical_data):
+    def __init__(self, historical_data=None, seed=None):
+        """
+        :param historical_data: Prices to replay (default: one year of synthetic GBM prices).
+        :param seed: Seed of the synthetic data.
+        """
+        self.seed = seed
+        if historical_data is None:
+            historical_data = self.generate_synthetic_data()
         self.historical_data = historical_data
         self.current_index = 0
         self.current_price = self.historical_data[self.current_index]
@@ -20,6 +30,33 @@ class MarketSimulator:
     def get_current_price(self):
         return self.current_price
 
-    def simulate_market_conditions(self):
-        # This method can be expanded to simulate various market conditions
-        pass
\ No newline at end of file
+    def generate_synthetic_data(self, n_steps=TRADING_DAYS, model='gbm', **params):
+        """
+        One synthetic price series, e.g. to replay with step().
+
+        :param n_steps: Number of prices.
+        :param model: Return model name (see synthetic.MODELS) or instance.
+        :param params: SyntheticMarket / model parameters (mu, sigma, s0, ...).
+        :return: Prices of shape (n_steps,).
+        """
+        params.setdefault('seed', self.seed)
+        return SyntheticMarket(model, **params).generate(1, n_steps)[0, :, 0]
+
+    def simulate_market_conditions(self, n_paths=1000, n_steps=TRADING_DAYS, model='gbm', n_symbols=1,
+                                   correlation=None, path_chunk=None, **params):
+        """
+        Many scenarios of correlated synthetic prices for stress tests.
+
+        :param n_paths: Number of scenarios.
+        :param n_steps: Steps per scenario.
+        :param model: 'gbm', 'jump_diffusion', 'garch', 'bootstrap' or a model instance.
+        :param n_symbols: Symbols per scenario.
+        :param correlation: Scalar or (symbols, symbols) correlation of the shocks.
+        :param path_chunk: Scenarios generated per block; see SyntheticMarket.stream() to
+            consume blocks without holding every scenario in memory.
+        :param params: Other SyntheticMarket / model parameters.
+        :return: Prices of shape (n_paths, n_steps, n_symbols), usable by VectorizedMarketSimulator.
+        """
+        params.setdefault('seed', self.seed)
+        market = SyntheticMarket(model, n_symbols=n_symbols, correlation=correlation, **params)
+        return market.generate(n_paths, n_steps, path_chunk)
@@ -1,11 +1,17 @@
+import numpy as np
+
+
 class PaperTrader:
     def __init__(self, trading_agent, initial_balance=10000):
         self.trading_agent = trading_agent
+        self.initial_balance = initial_balance
         self.balance = initial_balance
         self.position = 0  # Number of shares held
+        self.last_price = None
         self.trade_history = []
 
     def execute_trade(self, action, price):
+        self.last_price = price
         if action == 'buy':
             self.position += 1
             self.balance -= price
@@ -21,13 +27,78 @@ class PaperTrader:
             action = self.trading_agent.predict_action(data_point)
             self.execute_trade(action, price)
 
+    def backtest(self, prices, actions, record_history=True):
+        """
+        Vectorized equivalent of calling execute_trade(action, price) for every bar.
+
+        Positions follow from a cumulative sum of the buy/sell signals that is
+        reflected at zero (a sell without a position is ignored, exactly like
+        execute_trade); cash is a sequential cumulative sum of the executed
+        cash flows, so every value matches the per-step loop bit for bit.
+
+        :param prices: Price per bar, shape (bars,).
+        :param actions: Action per bar: 'buy'/'sell'/'hold' strings or codes 1/-1/0.
+        :param record_history: Also append the executed trades to trade_history.
+        :return: Dict with per-bar 'position', 'cash' and 'equity' arrays and the executed
+            trades as 'trade_index', 'trade_side' (1 buy, -1 sell) and 'trade_price'.
+        """
+        prices = np.asarray(prices)
+        signals = self._action_codes(actions)
+        if len(signals) != len(prices):
+            raise ValueError("prices and actions must have the same length")
+        if len(prices) == 0:
+            empty = np.zeros(0)
+            return {'position': empty, 'cash': empty, 'equity': empty, 'trade_index': np.zeros(0, dtype=np.intp),
+                    'trade_side': np.zeros(0, dtype=np.int8), 'trade_price': empty}
+
+        # Lindley recursion p[t] = max(0, p[t-1] + s[t]) in closed form
+        walk = self.position + np.cumsum(signals, dtype=np.int64)
+        position = walk - np.minimum(np.minimum.accumulate(walk), 0)
+        executed = np.diff(position, prepend=self.position)
+
+        flows = np.empty(len(prices) + 1, dtype=np.result_type(prices, float))
+        flows[0] = self.balance
+        flows[1:] = np.where(executed > 0, -prices, np.where(executed < 0, prices, 0))
+        cash = np.add.accumulate(flows)[1:]
+        equity = cash + position * prices
+
+        trade_index = np.flatnonzero(executed)
+        trade_side = executed[trade_index].astype(np.int8)
+        trade_price = prices[trade_index]
+
+        self.balance = cash[-1].item()
+        self.position = int(position[-1])
+        self.last_price = prices[-1].item()
+        if record_history:
+            sides = np.where(trade_side > 0, 'buy', 'sell').tolist()
+            self.trade_history.extend(zip(sides, trade_price.tolist()))
+
+        return {
+            'position': position,
+            'cash': cash,
+            'equity': equity,
+            'trade_index': trade_index,
+            'trade_side': trade_side,
+            'trade_price': trade_price,
+        }
+
+    @staticmethod
+    def _action_codes(actions):
+        actions = np.asarray(actions)
+        if actions.dtype.kind in 'UOS':
+            return (actions == 'buy').astype(np.int8) - (actions == 'sell').astype(np.int8)
+        return np.sign(actions).astype(np.int8)
+
     def get_balance(self):
-        return self.balance + (self.position * market_data[-1]['close'])
+        if self.last_price is None:
+            return self.balance
+        return self.balance + (self.position * self.last_price)
 
     def get_trade_history(self):
         return self.trade_history
 
     def reset(self):
-        self.balance = 10000
+        self.balance = self.initial_balance
         self.position = 0
-        self.trade_history = []
\ No newline at end of file
+        self.last_price = None
+        self.trade_history = []
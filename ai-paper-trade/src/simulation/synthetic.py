@@ -0,0 +1,248 @@
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+class GBMModel:
+    """Geometric Brownian motion: constant drift and volatility (annualized)."""
+
+    n_streams = 1
+
+    def __init__(self, mu=0.05, sigma=0.2):
+        """
+        :param mu: Annual drift, scalar or one per symbol.
+        :param sigma: Annual volatility, scalar or one per symbol.
+        """
+        self.mu = np.asarray(mu, dtype=np.float64)
+        self.sigma = np.asarray(sigma, dtype=np.float64)
+
+    def init_state(self, n_paths, n_symbols):
+        return None
+
+    def log_returns(self, market, rngs, n_steps, n_paths, state):
+        z = market.normals(rngs[0], n_steps, n_paths)
+        drift = (self.mu - 0.5 * self.sigma ** 2) * market.dt
+        return drift + self.sigma * np.sqrt(market.dt) * z, state
+
+
+class JumpDiffusionModel(GBMModel):
+    """
+    Merton jump-diffusion: GBM plus Poisson-arriving jumps with normally
+    distributed log sizes, independent per symbol. The drift is compensated
+    so ``mu`` stays the expected annual return.
+    """
+
+    n_streams = 3
+
+    def __init__(self, mu=0.05, sigma=0.2, jump_intensity=0.5, jump_mean=-0.05, jump_std=0.1):
+        """
+        :param mu: Annual drift.
+        :param sigma: Annual diffusion volatility.
+        :param jump_intensity: Expected jumps per year.
+        :param jump_mean: Mean log jump size.
+        :param jump_std: Standard deviation of the log jump size.
+        """
+        super().__init__(mu, sigma)
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+
+    def log_returns(self, market, rngs, n_steps, n_paths, state):
+        returns, state = super().log_returns(market, rngs, n_steps, n_paths, state)
+        shape = (n_steps, n_paths, market.n_symbols)
+        counts = rngs[1].poisson(self.jump_intensity * market.dt, shape)
+        sizes = counts * self.jump_mean + np.sqrt(counts) * self.jump_std * rngs[2].standard_normal(shape)
+        compensation = self.jump_intensity * (np.exp(self.jump_mean + 0.5 * self.jump_std ** 2) - 1) * market.dt
+        return returns + sizes - compensation, state
+
+
+class GARCHModel:
+    """
+    GARCH(1, 1) volatility: every step's variance reacts to the previous
+    shock (``alpha``) and persists (``beta``), producing calm and turbulent
+    regimes around the long-run annual volatility ``sigma``.
+    """
+
+    n_streams = 1
+
+    def __init__(self, mu=0.05, sigma=0.2, alpha=0.08, beta=0.9):
+        """
+        :param mu: Annual drift.
+        :param sigma: Long-run annual volatility.
+        :param alpha: Reaction of the variance to the last squared shock.
+        :param beta: Persistence of the variance (alpha + beta < 1).
+        """
+        if alpha + beta >= 1:
+            raise ValueError("alpha + beta must be below 1 for a stationary variance")
+        self.mu = np.asarray(mu, dtype=np.float64)
+        self.sigma = np.asarray(sigma, dtype=np.float64)
+        self.alpha = alpha
+        self.beta = beta
+
+    def init_state(self, n_paths, n_symbols):
+        return None  # starts at the long-run variance, set on the first call
+
+    def log_returns(self, market, rngs, n_steps, n_paths, state):
+        long_run = self.sigma ** 2 * market.dt
+        omega = long_run * (1 - self.alpha - self.beta)
+        variance = np.broadcast_to(long_run, (n_paths, market.n_symbols)).copy() if state is None else state
+        z = market.normals(rngs[0], n_steps, n_paths)
+        drift = self.mu * market.dt
+        for step in range(n_steps):
+            shock = np.sqrt(variance) * z[step]
+            z[step] = drift - 0.5 * variance + shock
+            variance = omega + self.alpha * shock * shock + self.beta * variance
+        return z, variance
+
+
+class BootstrapModel:
+    """
+    Block bootstrap of historical log returns.
+
+    Whole rows (dates) are resampled, so the cross-sectional correlation of
+    the history is kept, in blocks of ``block_size`` consecutive dates to
+    keep short-range dependence such as volatility clustering. Blocks wrap
+    around the end of the history.
+    """
+
+    n_streams = 1
+
+    def __init__(self, returns, block_size=20):
+        """
+        :param returns: Historical log returns of shape (time,) or (time, symbols).
+        :param block_size: Consecutive dates per resampled block.
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        self.returns = returns.reshape(len(returns), -1)
+        if not len(self.returns):
+            raise ValueError("No historical returns to resample")
+        self.block_size = max(1, block_size)
+
+    @classmethod
+    def from_prices(cls, prices, block_size=20):
+        """Bootstrap the log returns of a price history of shape (time,) or (time, symbols)."""
+        prices = np.asarray(prices, dtype=np.float64)
+        return cls(np.diff(np.log(prices), axis=0), block_size)
+
+    def init_state(self, n_paths, n_symbols):
+        if self.returns.shape[1] != n_symbols:
+            raise ValueError("The history has a different number of symbols than the market")
+        return np.zeros(n_paths, dtype=np.int64), np.zeros(n_paths, dtype=np.int64)
+
+    def log_returns(self, market, rngs, n_steps, n_paths, state):
+        position, left = state
+        history = len(self.returns)
+        rows = np.empty((n_steps, n_paths), dtype=np.int64)
+        for step in range(n_steps):
+            starts = rngs[0].integers(0, history, n_paths)
+            new_block = left == 0
+            position = np.where(new_block, starts, (position + 1) % history)
+            left = np.where(new_block, self.block_size, left) - 1
+            rows[step] = position
+        return self.returns[rows], (position, left)
+
+
+MODELS = {
+    'gbm': GBMModel,
+    'jump_diffusion': JumpDiffusionModel,
+    'garch': GARCHModel,
+    'bootstrap': BootstrapModel,
+}
+
+
+class SyntheticMarket:
+    """
+    Vectorized generator of many correlated synthetic price paths.
+
+    A return model (GBM, jump-diffusion, GARCH or bootstrap) produces log
+    returns for all paths and symbols at once; Gaussian shocks are
+    correlated across symbols through the Cholesky factor of
+    ``correlation``. Random numbers are drawn time-major from one
+    independent stream per model component, and model state (last price,
+    GARCH variance, bootstrap block position) is carried between chunks, so
+    streaming over time yields exactly the prices of a single generate()
+    call. Streaming over paths bounds memory to one block of paths; every
+    block is seeded from its own child of the seed.
+    """
+
+    def __init__(self, model='gbm', n_symbols=1, correlation=None, s0=100.0, dt=1.0 / TRADING_DAYS,
+                 seed=None, dtype=np.float64, **params):
+        """
+        :param model: A model instance or a name in MODELS ('gbm', 'jump_diffusion', 'garch', 'bootstrap').
+        :param n_symbols: Symbols per path.
+        :param correlation: Correlation of the Gaussian shocks: a scalar for every pair or a
+            (symbols, symbols) matrix (default: independent).
+        :param s0: Starting price, scalar or one per symbol.
+        :param dt: Years per step (default: one trading day).
+        :param seed: Seed of the generator.
+        :param dtype: Dtype of the generated prices.
+        :param params: Model parameters when ``model`` is a name.
+        """
+        self.model = MODELS[model](**params) if isinstance(model, str) else model
+        self.n_symbols = n_symbols
+        self.s0 = np.broadcast_to(np.asarray(s0, dtype=np.float64), (n_symbols,))
+        self.dt = dt
+        self.seed = seed
+        self.dtype = np.dtype(dtype)
+        self.cholesky = self._cholesky(correlation, n_symbols)
+
+    @staticmethod
+    def _cholesky(correlation, n_symbols):
+        if correlation is None or n_symbols == 1:
+            return None
+        correlation = np.asarray(correlation, dtype=np.float64)
+        if correlation.ndim == 0:
+            correlation = np.full((n_symbols, n_symbols), float(correlation))
+            np.fill_diagonal(correlation, 1.0)
+        if correlation.shape != (n_symbols, n_symbols):
+            raise ValueError("correlation must be a scalar or a (symbols, symbols) matrix")
+        return np.linalg.cholesky(correlation)
+
+    def normals(self, rng, n_steps, n_paths):
+        """Correlated standard normal shocks of shape (steps, paths, symbols)."""
+        z = rng.standard_normal((n_steps, n_paths, self.n_symbols))
+        return z if self.cholesky is None else z @ self.cholesky.T
+
+    def stream(self, n_paths, n_steps, path_chunk=None, step_chunk=None):
+        """
+        Generate prices chunk by chunk.
+
+        :param n_paths: Number of paths.
+        :param n_steps: Steps per path (prices are the closes after each step, starting from s0).
+        :param path_chunk: Paths per block (default: all); blocks are independent streams.
+        :param step_chunk: Steps per chunk (default: all).
+        :return: Generator of (path_slice, step_slice, prices) with prices of shape
+            (paths, steps, symbols); all step chunks of a path block come before the next block.
+        """
+        path_chunk = path_chunk or n_paths
+        step_chunk = step_chunk or n_steps
+        blocks = -(-n_paths // path_chunk)
+        block_seeds = np.random.SeedSequence(self.seed).spawn(blocks)
+        for block, block_seed in enumerate(block_seeds):
+            first = block * path_chunk
+            paths = min(path_chunk, n_paths - first)
+            rngs = [np.random.default_rng(child) for child in block_seed.spawn(self.model.n_streams)]
+            state = self.model.init_state(paths, self.n_symbols)
+            log_price = np.broadcast_to(np.log(self.s0), (paths, self.n_symbols)).copy()
+            for start in range(0, n_steps, step_chunk):
+                steps = min(step_chunk, n_steps - start)
+                returns, state = self.model.log_returns(self, rngs, steps, paths, state)
+                log_prices = np.cumsum(returns, axis=0)
+                log_prices += log_price
+                log_price = log_prices[-1].copy()
+                prices = np.exp(log_prices).astype(self.dtype, copy=False).transpose(1, 0, 2)
+                yield slice(first, first + paths), slice(start, start + steps), np.ascontiguousarray(prices)
+
+    def generate(self, n_paths, n_steps, path_chunk=None):
+        """
+        All prices at once.
+
+        :param n_paths: Number of paths.
+        :param n_steps: Steps per path.
+        :param path_chunk: Paths generated per block (same meaning as in stream()).
+        :return: Prices of shape (paths, steps, symbols).
+        """
+        prices = np.empty((n_paths, n_steps, self.n_symbols), dtype=self.dtype)
+        for paths, steps, chunk in self.stream(n_paths, n_steps, path_chunk):
+            prices[paths, steps] = chunk
+        return prices
@@ -0,0 +1,127 @@
+import numpy as np
+
+from models.trading_agent import Action
+
+# Action codes of the vectorized simulator and backtests (defined by Action).
+SELL, HOLD, BUY = Action.SELL, Action.HOLD, Action.BUY
+
+
+class VectorizedMarketSimulator:
+    """
+    Batched counterpart of MarketSimulator that advances many independent
+    environments per call.
+
+    Prices are held as one contiguous (env x time x symbol) array; a
+    (time x symbol) array is shared by all environments without copying.
+    Each environment keeps its own clock, cash and per-symbol positions,
+    and every call to step() takes one action per (env, symbol) and returns
+    observations, rewards and done flags as arrays.
+    """
+
+    def __init__(self, prices, n_envs=None, window=10, initial_balance=10000, trade_size=1,
+                 transaction_cost=0.0, random_start=False, auto_reset=True, seed=None):
+        """
+        :param prices: Prices of shape (time,), (time, symbols) or (envs, time, symbols).
+        :param n_envs: Number of environments sharing a 1-D/2-D price array.
+        :param window: Number of log returns per symbol in an observation.
+        :param initial_balance: Starting cash of every environment.
+        :param trade_size: Shares bought or sold per BUY/SELL action.
+        :param transaction_cost: Cost as a fraction of traded value.
+        :param random_start: Start episodes at a random time instead of the first bar.
+        :param auto_reset: Reset finished environments inside step().
+        :param seed: Seed for the random episode starts.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim == 1:
+            prices = prices[:, None]
+        if prices.ndim == 2:
+            self.n_envs = 1 if n_envs is None else n_envs
+            self._shared = True
+            prices = np.ascontiguousarray(prices)[None]
+        elif prices.ndim == 3:
+            if n_envs is not None and n_envs != prices.shape[0]:
+                raise ValueError("n_envs does not match the first dimension of prices")
+            self.n_envs = prices.shape[0]
+            self._shared = False
+            prices = np.ascontiguousarray(prices)
+        else:
+            raise ValueError("prices must have 1, 2 or 3 dimensions")
+
+        self.prices = prices
+        self.n_steps = prices.shape[1]
+        self.n_symbols = prices.shape[2]
+        self.window = window
+        if self.n_steps < window + 1:
+            raise ValueError("Not enough price history for the observation window")
+
+        returns = np.zeros_like(prices)
+        returns[:, 1:] = np.log(prices[:, 1:] / prices[:, :-1])
+        # (price sets, time - window + 1, symbols, window) view over the returns
+        self._windows = np.lib.stride_tricks.sliding_window_view(returns, window, axis=1)
+        self._flat_prices = prices.reshape(-1, self.n_symbols)
+
+        self.initial_balance = initial_balance
+        self.trade_size = trade_size
+        self.transaction_cost = transaction_cost
+        self.random_start = random_start
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        self._envs = np.arange(self.n_envs)
+        self._source = np.zeros(self.n_envs, dtype=np.intp) if self._shared else self._envs
+        self.current_index = np.zeros(self.n_envs, dtype=np.intp)
+        self.cash = np.zeros(self.n_envs)
+        self.positions = np.zeros((self.n_envs, self.n_symbols))
+        self.reset()
+
+    def _start_index(self, count):
+        if self.random_start:
+            return self.rng.integers(self.window - 1, self.n_steps - 1, size=count)
+        return np.full(count, self.window - 1)
+
+    def reset(self, env_mask=None):
+        """Reset all environments (or those selected by a boolean mask) and return observations."""
+        envs = self._envs if env_mask is None else self._envs[env_mask]
+        self.current_index[envs] = self._start_index(len(envs))
+        self.cash[envs] = self.initial_balance
+        self.positions[envs] = 0.0
+        return self.observe()
+
+    def current_prices(self):
+        """Prices at the current index of every environment, shape (envs, symbols)."""
+        return self._flat_prices[self._source * self.n_steps + self.current_index]
+
+    def portfolio_values(self):
+        """Cash plus market value of the positions of every environment."""
+        return self.cash + np.einsum('es,es->e', self.positions, self.current_prices())
+
+    def observe(self):
+        """Last ``window`` log returns per symbol, shape (envs, symbols, window)."""
+        return self._windows[self._source, self.current_index - self.window + 1]
+
+    def step(self, actions):
+        """
+        Apply one action per (env, symbol) at the current prices and advance one bar.
+
+        :param actions: Action codes (BUY, SELL, HOLD) of shape (envs, symbols) or (envs,)
+            for single-symbol environments.
+        :return: (observations, rewards, dones); rewards are the change in portfolio value.
+        """
+        actions = np.asarray(actions).reshape(self.n_envs, self.n_symbols)
+        price = self.current_prices()
+
+        buys = np.where(actions == BUY, float(self.trade_size), 0.0)
+        sells = np.where(actions == SELL, np.minimum(self.positions, self.trade_size), 0.0)
+        traded = buys - sells
+        self.positions += traded
+        cost = np.einsum('es,es->e', np.abs(traded), price) * self.transaction_cost
+        self.cash -= np.einsum('es,es->e', traded, price) + cost
+
+        self.current_index += 1
+        next_price = self.current_prices()
+        rewards = np.einsum('es,es->e', self.positions, next_price - price) - cost
+        dones = self.current_index >= self.n_steps - 1
+
+        if self.auto_reset and dones.any():
+            self.reset(dones)
+        return self.observe(), rewards, dones
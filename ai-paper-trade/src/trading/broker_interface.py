@@ -1,153 +1,281 @@
-import pandas as pd
-from datetime import datetime
+import logging
+import math
+
+from data.quote_service import get_quote_service
+from .ledger import TransactionLedger
+from .portfolio import PortfolioState
 
 class BrokerInterface:
-    def __init__(self, api_key=None, api_secret=None, initial_balance=10000, paper_trading=True):
+    def __init__(self, api_key=None, api_secret=None, initial_balance=10000, paper_trading=True, exchange=None,
+                 ledger=None, quote_service=None):
+        """
+        :param exchange: Optional SimulatedExchange for paper trading. Without one, paper
+            orders fill immediately at the current price; with one, orders are matched
+            against the bars/ticks passed to process_bar/process_tick.
+        :param ledger: TransactionLedger recording the fills (default: an in-memory ledger).
+        :param quote_service: QuoteService for symbols without a pushed price
+            (default: the shared yfinance-backed service).
+        """
+        self.logger = logging.getLogger(__name__)
         self.api_key = api_key
         self.api_secret = api_secret
         self.paper_trading = paper_trading
-        self.balance = initial_balance
-        self.positions = {}  # Symbol -> {quantity, avg_price}
-        self.transaction_history = []
-        self.current_prices = {}  # Cache for current prices
+        self.portfolio = PortfolioState(initial_balance)
+        self.transaction_history = ledger if ledger is not None else TransactionLedger()
+        self.current_prices = {}  # Prices pushed with update_current_price (simulation)
+        self._quote_service = quote_service
+        self.exchange = exchange
+        # Cash and shares held back for open exchange orders, so that they cannot be
+        # committed twice before the orders fill
+        self._reservations = {}  # order_id -> {symbol, side, price, remaining}
+        self.reserved_cash = 0.0
+        self.reserved_shares = {}  # Symbol -> shares reserved by open sell orders
+        self._open_buys = 0  # Open buy reservations, to zero reserved_cash without a scan
+        if exchange is not None:
+            exchange.on_fill = self._on_fill
         
         # For paper trading, we don't need real API connections
         if not paper_trading and (api_key is None or api_secret is None):
             raise ValueError("API key and secret are required for live trading")
 
-    def place_order(self, symbol, quantity, order_type='market', price=None):
+    @property
+    def balance(self):
+        return self.portfolio.cash
+
+    @balance.setter
+    def balance(self, value):
+        self.portfolio.cash = value
+
+    @property
+    def positions(self):
+        """Symbol -> {quantity, avg_price}"""
+        return self.portfolio.positions
+
+    def place_order(self, symbol, quantity, order_type='market', price=None, stop_price=None):
         """
         Place an order with the brokerage.
         
         :param symbol: The stock symbol to trade.
         :param quantity: The number of shares to buy (positive) or sell (negative).
-        :param order_type: The type of order ('market', 'limit', etc.).
+        :param order_type: The type of order ('market', 'limit', 'stop' or 'stop_limit').
         :param price: The price for limit orders (optional).
+        :param stop_price: The trigger price for stop orders (exchange mode only).
         :return: Order confirmation or error message.
         """
         if self.paper_trading:
+            if self.exchange is not None:
+                return self._submit_to_exchange(symbol, quantity, order_type, price, stop_price)
             return self._execute_paper_trade(symbol, quantity, order_type, price)
         else:
             # Implement actual brokerage API call here
             pass
     
-    def _execute_paper_trade(self, symbol, quantity, order_type, price=None):
-        """Handle paper trading logic"""
-        # Get the current price if not provided (for market orders)
-        if price is None:
-            price = self._get_current_price(symbol)
-        
-        # Calculate the total cost/proceeds
-        total_value = quantity * price
-        commission = 0  # No commission for paper trading
-        
-        # Check if we have enough balance for buying
-        if quantity > 0:  # Buy order
-            if total_value + commission > self.balance:
+    def available_cash(self):
+        """Cash not reserved by open buy orders."""
+        return self.balance - self.reserved_cash
+
+    def available_shares(self, symbol):
+        """Shares of a symbol held and not reserved by open sell orders."""
+        return self.positions.get(symbol, {}).get('quantity', 0) - self.reserved_shares.get(symbol, 0)
+
+    def _check_order(self, symbol, quantity, price):
+        """Return an error response if the account cannot cover the order, else None."""
+        if quantity > 0:
+            required = quantity * price
+            if required > self.available_cash():
                 return {
                     "status": "error", 
-                    "message": f"Insufficient funds. Required: ${total_value + commission}, Available: ${self.balance}"
-                }
-            
-            # Update balance
-            self.balance -= (total_value + commission)
-            
-            # Update position
-            if symbol in self.positions:
-                # Calculate new average price
-                current_position = self.positions[symbol]
-                new_total_quantity = current_position['quantity'] + quantity
-                new_total_value = (current_position['quantity'] * current_position['avg_price']) + total_value
-                new_avg_price = new_total_value / new_total_quantity
-                
-                self.positions[symbol] = {
-                    'quantity': new_total_quantity,
-                    'avg_price': new_avg_price
-                }
-            else:
-                self.positions[symbol] = {
-                    'quantity': quantity,
-                    'avg_price': price
+                    "message": f"Insufficient funds. Required: ${required}, Available: ${self.available_cash()}"
                 }
-            
-        elif quantity < 0:  # Sell order
-            # Check if we have enough shares to sell
+        elif quantity < 0:
             sell_quantity = abs(quantity)
-            if symbol not in self.positions or self.positions[symbol]['quantity'] < sell_quantity:
+            if self.available_shares(symbol) < sell_quantity:
                 return {
                     "status": "error", 
-                    "message": f"Insufficient shares. Required: {sell_quantity}, Available: {self.positions.get(symbol, {}).get('quantity', 0)}"
+                    "message": f"Insufficient shares. Required: {sell_quantity}, Available: {self.available_shares(symbol)}"
                 }
-            
-            # Update balance
-            self.balance += (total_value - commission)
-            
-            # Update position
-            current_position = self.positions[symbol]
-            new_quantity = current_position['quantity'] - sell_quantity
-            
-            if new_quantity == 0:
-                del self.positions[symbol]  # Remove the position if all shares are sold
-            else:
-                self.positions[symbol]['quantity'] = new_quantity
+        return None
+
+    def _reserve(self, order_id, symbol, quantity, price):
+        """Hold back the cash (buys, at the reference price) or shares (sells) of an open order."""
+        self._reservations[order_id] = {'symbol': symbol, 'side': 1 if quantity > 0 else -1, 'price': price,
+                                        'remaining': abs(quantity)}
+        if quantity > 0:
+            self.reserved_cash += quantity * price
+            self._open_buys += 1
+        else:
+            self.reserved_shares[symbol] = self.reserved_shares.get(symbol, 0) - quantity
+
+    def _release(self, order_id, quantity=None):
+        """Release the reservation of filled shares of an order, or all of it when quantity is None."""
+        reservation = self._reservations.get(order_id)
+        if reservation is None:
+            return
+        quantity = reservation['remaining'] if quantity is None else min(quantity, reservation['remaining'])
+        reservation['remaining'] -= quantity
+        symbol = reservation['symbol']
+        if reservation['side'] > 0:
+            self.reserved_cash -= quantity * reservation['price']
+        else:
+            self.reserved_shares[symbol] -= quantity
+            if self.reserved_shares[symbol] <= 0:
+                del self.reserved_shares[symbol]
+        if reservation['remaining'] <= 0:
+            del self._reservations[order_id]
+            if reservation['side'] > 0:
+                self._open_buys -= 1
+        if self._open_buys == 0:
+            self.reserved_cash = 0.0  # no drift once no buy is open
+
+    def _fillable(self, symbol, quantity, price):
+        """The part of a fill the account can still cover (market and stop fills may be priced above their reservation)."""
+        if quantity > 0:
+            affordable = math.floor(self.available_cash() / price) if price > 0 else quantity
+            return max(0, min(quantity, affordable))
+        return -max(0, min(-quantity, self.available_shares(symbol)))
+
+    def _execute_paper_trade(self, symbol, quantity, order_type, price=None):
+        """Handle paper trading logic"""
+        # Get the current price if not provided (for market orders)
+        if price is None:
+            price, error = self._get_current_price(symbol)
+            if price is None:
+                return {"status": "error", "message": error}
         
-        # Record the transaction
-        self.transaction_history.append({
-            'timestamp': datetime.now(),
-            'symbol': symbol,
-            'quantity': quantity,
-            'price': price,
-            'order_type': order_type,
-            'total_value': total_value,
-            'commission': commission
-        })
+        error = self._check_order(symbol, quantity, price)
+        if error is not None:
+            return error
         
+        self._apply_fill(symbol, quantity, price, order_type)
         return {
             "status": "success",
             "message": f"Order executed: {'Bought' if quantity > 0 else 'Sold'} {abs(quantity)} shares of {symbol} at ${price}",
             "order_id": len(self.transaction_history)
         }
+
+    def _apply_fill(self, symbol, quantity, price, order_type, commission=0, timestamp=None):
+        """Book a (possibly partial) fill into the portfolio and the transaction history."""
+        total_value = quantity * price
+        self.portfolio.apply_fill(symbol, quantity, price, commission)
+        
+        # Record the transaction
+        self.transaction_history.append(symbol, quantity, price, order_type, commission, timestamp, total_value)
+
+    def _submit_to_exchange(self, symbol, quantity, order_type, price=None, stop_price=None):
+        """Validate an order against the account and hand it to the simulated exchange."""
+        reference = price if price is not None else stop_price
+        if reference is None:
+            reference, error = self._get_current_price(symbol)
+            if reference is None:
+                return {"status": "error", "message": error}
+        error = self._check_order(symbol, quantity, reference)
+        if error is not None:
+            return error
+        try:
+            order = self.exchange.submit(symbol, quantity, order_type, limit_price=price, stop_price=stop_price)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+        self._reserve(order.order_id, symbol, quantity, reference)
+        return {
+            "status": "accepted",
+            "message": f"Order accepted: {order_type} {'buy' if quantity > 0 else 'sell'} {abs(quantity)} shares of {symbol}",
+            "order_id": order.order_id
+        }
+
+    def _on_fill(self, fill):
+        """
+        Book an exchange fill after releasing its reservation. A fill the account can no
+        longer cover is clipped and the rest of its order cancelled.
+        """
+        symbol, quantity, price = fill['symbol'], fill['quantity'], fill['price']
+        self._release(fill['order_id'], abs(quantity))
+        allowed = self._fillable(symbol, quantity, price)
+        if allowed != quantity:
+            self.logger.warning(f"Order {fill['order_id']}: booking {allowed} of a {quantity} share fill of "
+                                f"{symbol} the account cannot cover; cancelling the rest of the order")
+            self.exchange.cancel(fill['order_id'])
+            self._release(fill['order_id'])
+        if allowed:
+            self._apply_fill(symbol, allowed, price, fill['order_type'], timestamp=fill['timestamp'])
+
+    def process_bar(self, symbol, bar, timestamp=None):
+        """
+        Match open exchange orders against a new bar and mark the symbol at its close.
+        
+        :param bar: Mapping with 'Open', 'High', 'Low', 'Close' and optionally 'Volume'.
+        :return: List of fills.
+        """
+        fills = self.exchange.process_bar(symbol, bar, timestamp) if self.exchange is not None else []
+        self.update_current_price(symbol, bar['Close'])
+        return fills
+
+    def process_tick(self, symbol, price, size=None, timestamp=None):
+        """Match open exchange orders against a trade print and mark the symbol at its price."""
+        fills = self.exchange.process_tick(symbol, price, size, timestamp) if self.exchange is not None else []
+        self.update_current_price(symbol, price)
+        return fills
+
+    def cancel_order(self, order_id):
+        """Cancel a resting exchange order."""
+        if self.exchange is not None and self.exchange.cancel(order_id):
+            self._release(order_id)
+            return {"status": "success", "message": f"Order {order_id} cancelled"}
+        return {"status": "error", "message": f"No open order {order_id}"}
+
+    def get_open_orders(self):
+        """Orders resting on the simulated exchange."""
+        return self.exchange.open_orders() if self.exchange is not None else []
     
+    @property
+    def quote_service(self):
+        if self._quote_service is None:
+            self._quote_service = get_quote_service()
+        return self._quote_service
+
     def _get_current_price(self, symbol):
-        """Get the current price for a symbol (simulated for paper trading)"""
+        """
+        Get the current price for a symbol: the last pushed price, else a quote from the
+        quote service (cached with a TTL). A quote the service could not refresh within
+        its TTL is stale and not traded at.
+
+        :return: (price, None), or (None, error message) if no usable price is available.
+        """
         if symbol in self.current_prices:
-            return self.current_prices[symbol]
-        
-        # In a real implementation, you would fetch from your yfinance_api.py
-        # For now, we'll use a placeholder
-        try:
-            import yfinance as yf
-            data = yf.Ticker(symbol).history(period='1d')
-            price = float(data['Close'].iloc[-1])
-            self.current_prices[symbol] = price
-            return price
-        except:
-            # Default price if fetching fails
-            return 100.0  # Placeholder
+            return self.current_prices[symbol], None
+
+        quote = self.quote_service.get_quote(symbol)
+        if quote['price'] is None:
+            return None, f"No price available for {symbol}"
+        if quote['stale']:
+            self.logger.warning(f"Rejecting order for {symbol}: quote is {quote['age']:.0f}s old "
+                                f"({quote['error'] or 'not refreshed'})")
+            return None, f"Stale quote for {symbol}: last price is {quote['age']:.0f}s old"
+        self.portfolio.update_price(symbol, quote['price'])
+        return quote['price'], None
 
     def get_account_balance(self):
         """
         Retrieve the current account balance.
         
+        The portfolio is valued incrementally as fills and prices arrive, so this is O(1).
+        
         :return: Account balance.
         """
         if self.paper_trading:
             return {
-                'cash_balance': self.balance,
-                'portfolio_value': self.get_portfolio_value(),
-                'total_value': self.balance + self.get_portfolio_value()
+                'cash_balance': self.portfolio.cash,
+                'portfolio_value': self.portfolio.market_value,
+                'total_value': self.portfolio.total_value,
+                'unrealized_pl': self.portfolio.unrealized_pl,
+                'realized_pl': self.portfolio.realized_pl
             }
         else:
             # Implement actual brokerage API call here
             pass
 
     def get_portfolio_value(self):
-        """Calculate the current value of all positions"""
-        total_value = 0
-        for symbol, position in self.positions.items():
-            current_price = self._get_current_price(symbol)
-            total_value += position['quantity'] * current_price
-        return total_value
+        """Current value of all positions at their latest prices (O(1))"""
+        return self.portfolio.market_value
 
     def get_open_positions(self):
         """
@@ -158,9 +286,10 @@ class BrokerInterface:
         if self.paper_trading:
             result = []
             for symbol, position in self.positions.items():
-                current_price = self._get_current_price(symbol)
-                market_value = position['quantity'] * current_price
-                unrealized_pl = market_value - (position['quantity'] * position['avg_price'])
+                current_price = self.portfolio.prices[symbol]
+                market_value = self.portfolio.position_value(symbol)
+                cost = position['quantity'] * position['avg_price']
+                unrealized_pl = market_value - cost
                 
                 result.append({
                     'symbol': symbol,
@@ -169,7 +298,7 @@ class BrokerInterface:
                     'current_price': current_price,
                     'market_value': market_value,
                     'unrealized_pl': unrealized_pl,
-                    'unrealized_pl_percent': (unrealized_pl / (position['quantity'] * position['avg_price'])) * 100
+                    'unrealized_pl_percent': (unrealized_pl / cost) * 100 if cost else 0.0
                 })
             return result
         else:
@@ -192,17 +321,23 @@ class BrokerInterface:
     def reset_paper_account(self, initial_balance=10000):
         """Reset the paper trading account to initial state"""
         if self.paper_trading:
-            self.balance = initial_balance
-            self.positions = {}
-            self.transaction_history = []
+            self.portfolio.reset(initial_balance)
+            self.transaction_history.clear()
+            if self.exchange is not None:
+                self.exchange.cancel_all()
+            self._reservations.clear()
+            self.reserved_cash = 0.0
+            self.reserved_shares.clear()
+            self._open_buys = 0
             return {"status": "success", "message": "Paper trading account has been reset"}
         else:
             return {"status": "error", "message": "Cannot reset a live trading account"}
 
     def get_transaction_history(self):
         """Get the history of all transactions"""
-        return pd.DataFrame(self.transaction_history)
+        return self.transaction_history.to_frame()
 
     def update_current_price(self, symbol, price):
-        """Update the current price of a symbol (useful for simulation)"""
-        self.current_prices[symbol] = price
\ No newline at end of file
+        """Update the current price of a symbol (useful for simulation); revalues only that symbol"""
+        self.current_prices[symbol] = price
+        self.portfolio.update_price(symbol, price)
\ No newline at end of file
@@ -0,0 +1,192 @@
+import itertools
+import logging
+import math
+
+import numpy as np
+
+from .order_book import BUY, ORDER_TYPES, SELL, Order, OrderBook
+
+
+class SimulatedExchange:
+    """
+    Matching engine for paper trading.
+
+    Orders are kept in one OrderBook per symbol and matched against the
+    market data pushed in with process_bar/process_tick: stop orders
+    trigger when the market trades through their stop price, market orders
+    fill at the next traded price plus slippage, and limit orders fill once
+    the market reaches their limit. The quantity filled per bar or tick is
+    capped at a share of its traded volume, so large orders fill partially
+    over several bars. Only symbols with open orders do any work, which
+    keeps replaying a wide universe cheap.
+    """
+
+    def __init__(self, participation=None, slippage_bps=0.0, lot_size=1, on_fill=None):
+        """
+        :param participation: Largest share of a bar's/tick's volume one side may fill
+            (None: unlimited).
+        :param slippage_bps: Slippage of market and stop fills in basis points.
+        :param lot_size: Volume-capped fills are rounded down to multiples of this.
+        :param on_fill: Callback receiving every fill dict (e.g. BrokerInterface._on_fill).
+        """
+        self.logger = logging.getLogger(__name__)
+        self.participation = participation
+        self.slippage = slippage_bps / 10000.0
+        self.lot_size = lot_size
+        self.on_fill = on_fill
+        self.books = {}
+        self._order_ids = itertools.count(1)
+        self._order_symbols = {}
+        self._column_key = None
+        self._column_index = {}
+        self._fire_low = None
+        self._fire_high = None
+        self._dirty = set()
+
+    def book(self, symbol):
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol)
+        return book
+
+    def submit(self, symbol, quantity, order_type='market', limit_price=None, stop_price=None, timestamp=None):
+        """
+        Submit an order.
+
+        :param quantity: Shares to buy (positive) or sell (negative).
+        :param order_type: 'market', 'limit', 'stop' or 'stop_limit'.
+        :return: The accepted Order.
+        """
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Unsupported order type: {order_type}")
+        if quantity == 0:
+            raise ValueError("Order quantity must not be zero")
+        if order_type in ('limit', 'stop_limit') and limit_price is None:
+            raise ValueError(f"{order_type} orders need a limit price")
+        if order_type in ('stop', 'stop_limit') and stop_price is None:
+            raise ValueError(f"{order_type} orders need a stop price")
+
+        order = Order(next(self._order_ids), symbol, BUY if quantity > 0 else SELL, abs(quantity),
+                      order_type, limit_price, stop_price, timestamp)
+        self.book(symbol).add(order)
+        self._order_symbols[order.order_id] = symbol
+        self._dirty.add(symbol)
+        return order
+
+    def cancel(self, order_id):
+        """Cancel an open order; returns whether it was still open."""
+        symbol = self._order_symbols.pop(order_id, None)
+        if symbol is None:
+            return False
+        self._dirty.add(symbol)
+        return self.books[symbol].cancel(order_id) is not None
+
+    def cancel_all(self):
+        for order_id in list(self._order_symbols):
+            self.cancel(order_id)
+
+    def open_orders(self, symbol=None):
+        books = self.books.values() if symbol is None else [self.book(symbol)]
+        return [order.to_dict() for book in books for order in book.orders.values()]
+
+    def _capacity(self, volume):
+        if self.participation is None or volume is None or volume != volume:
+            return math.inf
+        return math.floor(volume * self.participation / self.lot_size) * self.lot_size
+
+    def _match(self, symbol, reference, low, high, volume, timestamp):
+        book = self.books.get(symbol)
+        if book is None or not book.orders or not book.touched(low, high):
+            return []
+        return self._execute(book, reference, low, high, volume, timestamp)
+
+    def _execute(self, book, reference, low, high, volume, timestamp):
+        self._dirty.add(book.symbol)
+        capacity = self._capacity(volume)
+        book.trigger_stops(low, high, reference)
+        fills = book.match(BUY, reference, low, capacity, self.slippage)
+        fills += book.match(SELL, reference, high, capacity, self.slippage)
+        return self._report(fills, timestamp)
+
+    def _report(self, fills, timestamp):
+        reports = []
+        for order, quantity, price in fills:
+            if order.status == 'filled':
+                self._order_symbols.pop(order.order_id, None)
+            fill = {
+                'order_id': order.order_id,
+                'symbol': order.symbol,
+                'quantity': order.side * quantity,
+                'price': price,
+                'order_type': order.order_type,
+                'remaining': order.side * order.remaining,
+                'status': order.status,
+                'timestamp': timestamp,
+            }
+            reports.append(fill)
+            if self.on_fill is not None:
+                self.on_fill(fill)
+        return reports
+
+    def process_bar(self, symbol, bar, timestamp=None):
+        """
+        Match the open orders of a symbol against one OHLCV bar.
+
+        :param bar: Mapping (dict or DataFrame row) with 'Open', 'High', 'Low', 'Close'
+            and optionally 'Volume'.
+        :return: List of fill dicts.
+        """
+        return self._match(symbol, bar['Open'], bar['Low'], bar['High'], bar.get('Volume'), timestamp)
+
+    def process_bars(self, bars, timestamp=None):
+        """
+        Process one bar for many symbols; only symbols with open orders are looked at.
+
+        :param bars: Dict of symbol -> bar mapping.
+        :return: List of fill dicts of all symbols.
+        """
+        fills = []
+        for symbol in [symbol for symbol, book in self.books.items() if book.orders and symbol in bars]:
+            fills += self.process_bar(symbol, bars[symbol], timestamp)
+        return fills
+
+    def process_bar_arrays(self, symbols, opens, highs, lows, volumes=None, timestamp=None):
+        """
+        Process one bar of a whole universe given as parallel arrays (e.g. one row of
+        each (time x symbol) OHLCV array).
+
+        The exchange keeps, per column, the prices at which each book starts to fill
+        or trigger (refreshed only for books that changed), so one vectorized
+        comparison selects the few symbols that need matching.
+
+        :param symbols: Symbol names, in the column order of the price arrays.
+        :return: List of fill dicts of all symbols.
+        """
+        columns = self._columns(symbols)
+        for symbol in self._dirty:
+            i = columns.get(symbol)
+            if i is not None:
+                self._fire_low[i], self._fire_high[i] = self.books[symbol].thresholds()
+        self._dirty.clear()
+
+        lows = np.asarray(lows, dtype=np.float64)
+        highs = np.asarray(highs, dtype=np.float64)
+        fills = []
+        for i in np.flatnonzero((lows <= self._fire_low) | (highs >= self._fire_high)).tolist():
+            fills += self._execute(self.books[self._column_key[i]], float(opens[i]), float(lows[i]), float(highs[i]),
+                                   None if volumes is None else float(volumes[i]), timestamp)
+        return fills
+
+    def _columns(self, symbols):
+        key = tuple(symbols)
+        if self._column_key != key:
+            self._column_key = key
+            self._column_index = {symbol: i for i, symbol in enumerate(key)}
+            self._fire_low = np.full(len(key), -np.inf)
+            self._fire_high = np.full(len(key), np.inf)
+            self._dirty.update(self.books)
+        return self._column_index
+
+    def process_tick(self, symbol, price, size=None, timestamp=None):
+        """Match the open orders of a symbol against one trade print."""
+        return self._match(symbol, price, price, price, size, timestamp)
@@ -0,0 +1,213 @@
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+# Column name -> dtype of one ledger row; 'symbol' and 'order_type' hold interned codes
+COLUMNS = {
+    'timestamp': np.dtype('datetime64[ns]'),
+    'symbol': np.dtype(np.int32),
+    'quantity': np.dtype(np.float64),
+    'price': np.dtype(np.float64),
+    'order_type': np.dtype(np.int16),
+    'total_value': np.dtype(np.float64),
+    'commission': np.dtype(np.float64),
+}
+
+
+def _to_nanoseconds(timestamp):
+    if timestamp is None:
+        return time.time_ns()
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    return pd.Timestamp(timestamp).value
+
+
+class TransactionLedger:
+    """
+    Columnar, append-only record of fills.
+
+    Rows are written into preallocated chunks of typed NumPy columns, so an
+    append is a handful of scalar stores and memory grows one chunk at a
+    time. Symbols and order types are interned into small integer codes.
+    Each chunk can be viewed as a DataFrame without copying its numeric
+    columns (``frames()``); ``to_frame()`` concatenates them. With a
+    ``spill_dir``, chunks beyond ``max_memory_chunks`` are written to disk as
+    ``.npy`` files and memory-mapped back, which keeps the resident size
+    bounded for very long runs.
+
+    Timestamps are stored as UTC nanoseconds; fills without one are stamped
+    with ``time.time_ns()``.
+    """
+
+    def __init__(self, chunk_size=65536, spill_dir=None, max_memory_chunks=None):
+        """
+        :param chunk_size: Rows per chunk.
+        :param spill_dir: Directory for spilled chunks (None keeps everything in memory).
+        :param max_memory_chunks: Full chunks kept in memory before the oldest are spilled
+            (default: 4 when spill_dir is set).
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.chunk_size = chunk_size
+        self.spill_dir = spill_dir
+        self.max_memory_chunks = 4 if max_memory_chunks is None and spill_dir else max_memory_chunks
+        self.symbols = []
+        self.order_types = []
+        self._symbol_codes = {}
+        self._order_type_codes = {}
+        self.clear()
+
+    def clear(self):
+        """Drop all fills, including spilled chunks."""
+        for index in range(getattr(self, '_spilled', 0)):
+            shutil.rmtree(self._segment_path(index), ignore_errors=True)
+        self._chunks = []  # full chunks: dict of column -> array (in memory or memory-mapped)
+        self._spilled = 0
+        self._current = self._new_chunk()
+        self._fill = 0
+        self._length = 0
+        self._frame_cache = None
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._spill_prefix = os.path.join(self.spill_dir, f"ledger-{os.getpid()}-{id(self)}-{time.time_ns()}")
+
+    def _new_chunk(self):
+        return {name: np.empty(self.chunk_size, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    def __len__(self):
+        return self._length
+
+    @staticmethod
+    def _intern(value, table, codes):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    def append(self, symbol, quantity, price, order_type='market', commission=0.0, timestamp=None, total_value=None):
+        """Record one fill; amortized O(1)."""
+        chunk, row = self._current, self._fill
+        chunk['timestamp'][row] = _to_nanoseconds(timestamp)
+        chunk['symbol'][row] = self._intern(symbol, self.symbols, self._symbol_codes)
+        chunk['quantity'][row] = quantity
+        chunk['price'][row] = price
+        chunk['order_type'][row] = self._intern(order_type, self.order_types, self._order_type_codes)
+        chunk['total_value'][row] = quantity * price if total_value is None else total_value
+        chunk['commission'][row] = commission
+        self._length += 1
+        self._fill = row + 1
+        if self._fill == self.chunk_size:
+            self._seal()
+
+    def _seal(self):
+        self._chunks.append(self._current)
+        self._current = self._new_chunk()
+        self._fill = 0
+        if self.max_memory_chunks is not None and self.spill_dir:
+            while len(self._chunks) - self._spilled > self.max_memory_chunks:
+                self._spill(self._spilled)
+
+    def _segment_path(self, index):
+        return f"{self._spill_prefix}-{index:06d}"
+
+    def _spill(self, index):
+        directory = self._segment_path(index)
+        os.makedirs(directory, exist_ok=True)
+        spilled = {}
+        for name, values in self._chunks[index].items():
+            path = os.path.join(directory, f"{name}.npy")
+            np.save(path, values)
+            spilled[name] = np.load(path, mmap_mode='r')
+        self._chunks[index] = spilled
+        self._spilled += 1
+
+    @property
+    def nbytes(self):
+        """Bytes held in memory (spilled chunks are excluded)."""
+        chunks = self._chunks[self._spilled:] + [self._current]
+        return sum(values.nbytes for chunk in chunks for values in chunk.values())
+
+    def chunks(self):
+        """Column arrays (views, no copies) of every chunk, oldest first."""
+        for chunk in self._chunks:
+            yield chunk
+        if self._fill:
+            yield {name: values[:self._fill] for name, values in self._current.items()}
+
+    def _frame(self, chunk):
+        columns = dict(chunk)
+        columns['symbol'] = pd.Categorical.from_codes(chunk['symbol'], categories=list(self.symbols))
+        columns['order_type'] = pd.Categorical.from_codes(chunk['order_type'], categories=list(self.order_types))
+        return pd.DataFrame(columns, columns=list(COLUMNS), copy=False)
+
+    def frames(self):
+        """One DataFrame per chunk; the numeric columns are views of the ledger's arrays."""
+        for chunk in self.chunks():
+            yield self._frame(chunk)
+
+    def to_frame(self):
+        """
+        All fills as one DataFrame.
+
+        The result is cached until the next append, so repeated reporting
+        calls do not rebuild it.
+        """
+        if self._frame_cache is not None and self._frame_cache[0] == self._length:
+            return self._frame_cache[1]
+        frames = list(self.frames())
+        if not frames:
+            frame = self._frame({name: values[:0] for name, values in self._current.items()})
+        elif len(frames) == 1:
+            frame = frames[0]
+        else:
+            frame = pd.concat(frames, ignore_index=True)
+        self._frame_cache = (self._length, frame)
+        return frame
+
+    def to_arrow(self):
+        """
+        All fills as a pyarrow Table (one record batch per chunk, numeric columns zero-copy).
+
+        Requires the optional pyarrow package.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("to_arrow requires pyarrow (pip install pyarrow)") from e
+        symbols = pa.array(self.symbols, type=pa.string())
+        order_types = pa.array(self.order_types, type=pa.string())
+        batches = []
+        for chunk in self.chunks():
+            arrays = [pa.array(np.asarray(chunk[name])) for name in COLUMNS]
+            arrays[1] = pa.DictionaryArray.from_arrays(arrays[1], symbols)
+            arrays[4] = pa.DictionaryArray.from_arrays(arrays[4], order_types)
+            batches.append(pa.RecordBatch.from_arrays(arrays, names=list(COLUMNS)))
+        if not batches:
+            return pa.Table.from_pandas(self.to_frame(), preserve_index=False)
+        return pa.Table.from_batches(batches)
+
+    def __getitem__(self, index):
+        """One fill as a dict (negative indices count from the end)."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ledger index out of range")
+        chunk_index, row = divmod(index, self.chunk_size)
+        chunk = self._chunks[chunk_index] if chunk_index < len(self._chunks) else self._current
+        return {
+            'timestamp': pd.Timestamp(chunk['timestamp'][row]),
+            'symbol': self.symbols[chunk['symbol'][row]],
+            'quantity': float(chunk['quantity'][row]),
+            'price': float(chunk['price'][row]),
+            'order_type': self.order_types[chunk['order_type'][row]],
+            'total_value': float(chunk['total_value'][row]),
+            'commission': float(chunk['commission'][row]),
+        }
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from models.trading_agent import Action
+
+
+class ReplayQuoteFeed:
+    """
+    Replays a (time x symbol) price array as a live quote stream, one
+    snapshot of every symbol per ``interval`` seconds. NaN marks a symbol
+    without a new quote in that snapshot.
+    """
+
+    def __init__(self, prices, symbols, interval=1.0):
+        """
+        :param prices: Prices of shape (time, symbols).
+        :param symbols: Symbol names, one per column.
+        :param interval: Seconds between snapshots (0 replays as fast as possible).
+        """
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.symbols = list(symbols)
+        if self.prices.ndim != 2 or self.prices.shape[1] != len(self.symbols):
+            raise ValueError("prices must have shape (time, len(symbols))")
+        self.interval = interval
+
+    async def stream(self):
+        """Yield tick dicts with 'sequence', 'timestamp' (epoch seconds) and 'prices'."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for sequence, prices in enumerate(self.prices):
+            delay = start + sequence * self.interval - loop.time()
+            # Sleeping (even for 0 s) hands control back to the engine between ticks
+            await asyncio.sleep(max(delay, 0.0))
+            yield {'sequence': sequence, 'timestamp': time.time(), 'prices': prices}
+
+
+class LiveTradingEngine:
+    """
+    Asyncio loop trading a universe of symbols from a quote stream.
+
+    Every tick updates a ring buffer of the last ``window`` log returns per
+    symbol and scores the whole universe with one batched forward pass
+    (TradingAgent.decide_actions). Resulting orders (and the new marks) are
+    handed to the broker on a dedicated worker thread, so broker calls never
+    block the event loop. Ticks arriving while the engine is still busy wait
+    in a bounded queue; when it is full the oldest tick is dropped. Likewise
+    at most one tick is routed at a time: ticks processed while the broker is
+    still busy are merged into one pending routing that keeps the latest
+    actions and marks, so orders never queue up behind a slow broker. Drops,
+    queue depth, coalesced routings, processing latency and cadence overruns
+    are counted in ``metrics``.
+    """
+
+    def __init__(self, trading_agent, broker, symbols, window=10, trade_size=1, queue_size=1,
+                 buy_threshold=None, sell_threshold=None, interval=1.0, latency_window=10000):
+        """
+        :param trading_agent: TradingAgent whose neural_network takes ``window`` features.
+        :param broker: BrokerInterface receiving the orders.
+        :param symbols: Symbol names, in the column order of the feed.
+        :param window: Log returns per symbol in an observation.
+        :param trade_size: Shares per BUY; a SELL sells up to this many held shares.
+        :param queue_size: Ticks buffered before the oldest is dropped.
+        :param buy_threshold: Predictions above this buy (default: the agent's threshold).
+        :param sell_threshold: Predictions below this sell (default: the agent's threshold).
+        :param interval: Expected seconds between ticks; slower ticks count as overruns.
+        :param latency_window: Latest tick latencies kept for report().
+        """
+        self.logger = logging.getLogger(__name__)
+        self.trading_agent = trading_agent
+        self.broker = broker
+        self.symbols = list(symbols)
+        self.window = window
+        self.trade_size = trade_size
+        self.queue_size = queue_size
+        self.buy_threshold = buy_threshold
+        self.sell_threshold = sell_threshold
+        self.interval = interval
+
+        n_symbols = len(self.symbols)
+        # Every return is written twice so the latest window is always one contiguous slice
+        self._returns = np.zeros((n_symbols, 2 * window))
+        self._position = 0
+        self._last_prices = np.full(n_symbols, np.nan)
+        self._ticks_seen = 0
+        self._executor = None  # Created per run()
+        self._routing = None  # Future of the routing job in flight
+        self._pending = None  # (prices, actions) waiting for it to finish
+        self.latencies = deque(maxlen=latency_window)
+        self.metrics = dict.fromkeys(['ticks_received', 'ticks_processed', 'ticks_dropped', 'max_queue_depth',
+                                      'overruns', 'orders_submitted', 'orders_rejected', 'routes_coalesced'], 0)
+
+    def observe(self, prices):
+        """Push one snapshot; returns the (symbols, window) log-return observations."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(prices / self._last_prices)
+        returns[~np.isfinite(returns)] = 0.0
+        self._returns[:, self._position] = returns
+        self._returns[:, self._position + self.window] = returns
+        self._position = (self._position + 1) % self.window
+        self._last_prices = np.where(np.isnan(prices), self._last_prices, prices)
+        self._ticks_seen += 1
+        return self._returns[:, self._position:self._position + self.window]
+
+    def decide(self, observations):
+        """Action codes (int8) for a (symbols, window) batch of observations."""
+        return self.trading_agent.decide_actions(observations, self.buy_threshold, self.sell_threshold)
+
+    def _route(self, prices, actions):
+        """Runs on the broker thread: mark prices, then place the orders of one tick."""
+        broker = self.broker
+        for i in np.flatnonzero(~np.isnan(prices)).tolist():
+            broker.update_current_price(self.symbols[i], float(prices[i]))
+        submitted = rejected = 0
+        for i in np.flatnonzero(actions != Action.HOLD).tolist():
+            symbol = self.symbols[i]
+            if actions[i] == Action.BUY:
+                quantity = self.trade_size
+            else:
+                quantity = -min(broker.positions.get(symbol, {}).get('quantity', 0), self.trade_size)
+                if quantity == 0:
+                    continue
+            response = broker.place_order(symbol, quantity)
+            if response.get('status') == 'error':
+                rejected += 1
+            else:
+                submitted += 1
+        return submitted, rejected
+
+    def _dispatch(self, prices, actions):
+        """Route one tick, or hold it as the pending tick while a routing job is in flight."""
+        if self._routing is not None:
+            if self._pending is not None:
+                # The pending tick is superseded: keep its marks for symbols without a new quote
+                prices = np.where(np.isnan(prices), self._pending[0], prices)
+                self.metrics['routes_coalesced'] += 1
+            self._pending = (prices, actions)
+            return
+        self._routing = asyncio.get_running_loop().run_in_executor(self._executor, self._route, prices, actions)
+        self._routing.add_done_callback(self._routed)
+
+    def _routed(self, future):
+        self._routing = None
+        if future.exception() is not None:
+            self.logger.error(f"Order routing failed: {future.exception()}")
+        else:
+            submitted, rejected = future.result()
+            self.metrics['orders_submitted'] += submitted
+            self.metrics['orders_rejected'] += rejected
+        if self._pending is not None:
+            prices, actions = self._pending
+            self._pending = None
+            self._dispatch(prices, actions)
+
+    async def _receive(self, feed, queue):
+        async for tick in feed.stream():
+            self.metrics['ticks_received'] += 1
+            if queue.full():
+                queue.get_nowait()
+                self.metrics['ticks_dropped'] += 1
+            queue.put_nowait(tick)
+            self.metrics['max_queue_depth'] = max(self.metrics['max_queue_depth'], queue.qsize())
+        await queue.put(None)
+
+    async def _process(self, queue):
+        while True:
+            tick = await queue.get()
+            if tick is None:
+                break
+            started = time.perf_counter()
+            prices = np.asarray(tick['prices'], dtype=np.float64)
+            observations = self.observe(prices)
+            if self._ticks_seen > self.window:
+                actions = self.decide(observations)
+            else:
+                actions = np.zeros(len(self.symbols), dtype=np.int8)  # warming up: hold
+
+            self._dispatch(prices, actions)
+
+            elapsed = time.perf_counter() - started
+            self.latencies.append(elapsed)
+            if elapsed > self.interval:
+                self.metrics['overruns'] += 1
+            self.metrics['ticks_processed'] += 1
+            # Let the feed and the routing callbacks run between ticks
+            await asyncio.sleep(0)
+
+    async def run(self, feed):
+        """
+        Trade until the feed is exhausted.
+
+        :param feed: Object with an async ``stream()`` of tick dicts (see ReplayQuoteFeed).
+        :return: Metrics dict (see report()).
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='broker')
+        try:
+            await asyncio.gather(self._receive(feed, queue), self._process(queue))
+            # Drain the routing in flight and the pending tick it hands over to
+            while self._routing is not None:
+                await asyncio.wait({self._routing})
+                await asyncio.sleep(0)
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        report = self.report()
+        self.logger.info(f"Live run finished: {report}")
+        return report
+
+    def run_replay(self, feed):
+        """Blocking wrapper around run() for scripts."""
+        return asyncio.run(self.run(feed))
+
+    def report(self):
+        """Metrics plus mean/p99/max inference-and-dispatch latency in milliseconds."""
+        report = dict(self.metrics)
+        latencies = np.asarray(self.latencies) * 1000.0
+        report['latency_ms_mean'] = float(latencies.mean()) if len(latencies) else 0.0
+        report['latency_ms_p99'] = float(np.percentile(latencies, 99)) if len(latencies) else 0.0
+        report['latency_ms_max'] = float(latencies.max()) if len(latencies) else 0.0
+        return report
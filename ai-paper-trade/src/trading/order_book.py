@@ -0,0 +1,254 @@
+import heapq
+import itertools
+import math
+from collections import deque
+
+from models.trading_agent import Action
+
+# Order sides, the BUY and SELL action codes
+BUY, SELL = Action.BUY, Action.SELL
+ORDER_TYPES = ('market', 'limit', 'stop', 'stop_limit')
+
+
+class Order:
+    """A single order; quantity is always positive and side gives the direction."""
+
+    __slots__ = ('order_id', 'symbol', 'side', 'quantity', 'remaining', 'order_type', 'limit_price',
+                 'stop_price', 'trigger_price', 'status', 'timestamp')
+
+    def __init__(self, order_id, symbol, side, quantity, order_type='market', limit_price=None,
+                 stop_price=None, timestamp=None):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.remaining = quantity
+        self.order_type = order_type
+        self.limit_price = limit_price
+        self.stop_price = stop_price
+        self.trigger_price = None  # price at which a stop order was triggered
+        self.status = 'open'  # open, partially_filled, filled or cancelled
+        self.timestamp = timestamp
+
+    @property
+    def resting(self):
+        """Whether the order sits on a price level of the book."""
+        return self.order_type == 'limit' or (self.order_type == 'stop_limit' and self.trigger_price is not None)
+
+    def to_dict(self):
+        return {
+            'order_id': self.order_id,
+            'symbol': self.symbol,
+            'quantity': self.side * self.quantity,
+            'remaining': self.side * self.remaining,
+            'order_type': self.order_type,
+            'limit_price': self.limit_price,
+            'stop_price': self.stop_price,
+            'status': self.status,
+            'timestamp': self.timestamp,
+        }
+
+
+class OrderBook:
+    """
+    Open orders of one symbol, organized for matching against market data.
+
+    Limit orders rest on price levels (a FIFO queue per price) indexed by a
+    heap per side, so the best bid/ask is found in O(1) amortized time.
+    Stop orders wait in heaps keyed by their stop price until the market
+    trades through it, then become market orders (stop) or resting limit
+    orders (stop_limit). Cancelled orders and emptied levels are removed
+    from the heaps and queues lazily.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.orders = {}
+        self._levels = {BUY: {}, SELL: {}}
+        self._level_volume = {BUY: {}, SELL: {}}
+        self._heaps = {BUY: [], SELL: []}  # bids are stored negated
+        self._stops = {BUY: [], SELL: []}  # sell stops are stored negated
+        self._market = {BUY: deque(), SELL: deque()}
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self.orders)
+
+    def _best(self, side):
+        heap = self._heaps[side]
+        levels = self._levels[side]
+        while heap:
+            price = -heap[0] if side == BUY else heap[0]
+            if price in levels:
+                return price
+            heapq.heappop(heap)
+        return None
+
+    @property
+    def best_bid(self):
+        return self._best(BUY)
+
+    @property
+    def best_ask(self):
+        return self._best(SELL)
+
+    def depth(self, side, levels=5):
+        """Best ``levels`` (price, open quantity) pairs of one side."""
+        volumes = self._level_volume[side]
+        prices = sorted(volumes, reverse=side == BUY)[:levels]
+        return [(price, volumes[price]) for price in prices]
+
+    def add(self, order):
+        self.orders[order.order_id] = order
+        if order.order_type in ('stop', 'stop_limit'):
+            key = order.stop_price if order.side == BUY else -order.stop_price
+            heapq.heappush(self._stops[order.side], (key, next(self._sequence), order))
+        elif order.order_type == 'market':
+            self._market[order.side].append(order)
+        else:
+            self._rest(order)
+
+    def _rest(self, order):
+        side, price = order.side, order.limit_price
+        level = self._levels[side].get(price)
+        if level is None:
+            level = self._levels[side][price] = deque()
+            self._level_volume[side][price] = 0
+            heapq.heappush(self._heaps[side], -price if side == BUY else price)
+        level.append(order)
+        self._level_volume[side][price] += order.remaining
+
+    def _reduce_level(self, side, price, quantity):
+        volume = self._level_volume[side][price] - quantity
+        if volume <= 0:
+            del self._level_volume[side][price]
+            del self._levels[side][price]
+        else:
+            self._level_volume[side][price] = volume
+
+    def cancel(self, order_id):
+        """Cancel an open order; returns it, or None if it is not open."""
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return None
+        order.status = 'cancelled'
+        if order.resting:
+            self._reduce_level(order.side, order.limit_price, order.remaining)
+        return order
+
+    def trigger_stops(self, low, high, reference):
+        """
+        Trigger the stop orders whose stop price lies within [low, high].
+
+        A stop triggers at its stop price, or at ``reference`` (the first
+        traded price) when the market gapped through it.
+        """
+        triggered = []
+        buys = self._stops[BUY]
+        while buys and buys[0][0] <= high:
+            order = heapq.heappop(buys)[2]
+            if order.status != 'cancelled':
+                self._trigger(order, max(order.stop_price, reference))
+                triggered.append(order)
+        sells = self._stops[SELL]
+        while sells and -sells[0][0] >= low:
+            order = heapq.heappop(sells)[2]
+            if order.status != 'cancelled':
+                self._trigger(order, min(order.stop_price, reference))
+                triggered.append(order)
+        return triggered
+
+    def thresholds(self):
+        """
+        Prices at which the market starts to interact with the book.
+
+        :return: (fire_low, fire_high): some order fills or triggers once the market
+            trades at or below fire_low or at or above fire_high.
+        """
+        for side in (BUY, SELL):
+            market = self._market[side]
+            while market and market[0].status == 'cancelled':
+                market.popleft()
+            if market:
+                return math.inf, -math.inf
+            stops = self._stops[side]
+            while stops and stops[0][2].status == 'cancelled':
+                heapq.heappop(stops)
+        bid, ask = self._best(BUY), self._best(SELL)
+        buy_stops, sell_stops = self._stops[BUY], self._stops[SELL]
+        fire_low = max(-math.inf if bid is None else bid, -sell_stops[0][0] if sell_stops else -math.inf)
+        fire_high = min(math.inf if ask is None else ask, buy_stops[0][0] if buy_stops else math.inf)
+        return fire_low, fire_high
+
+    def touched(self, low, high):
+        """Whether a market trading within [low, high] can fill or trigger any order."""
+        fire_low, fire_high = self.thresholds()
+        return low <= fire_low or high >= fire_high
+
+    def _trigger(self, order, price):
+        order.trigger_price = price
+        if order.order_type == 'stop':
+            self._market[order.side].append(order)
+        else:
+            self._rest(order)
+
+    def _fill(self, order, quantity, price, fills):
+        order.remaining -= quantity
+        if order.remaining <= 0:
+            order.status = 'filled'
+            del self.orders[order.order_id]
+        else:
+            order.status = 'partially_filled'
+        fills.append((order, quantity, price))
+
+    def match(self, side, reference, through, capacity, slippage=0.0):
+        """
+        Fill the orders of one side against the market, in price-time priority.
+
+        :param side: BUY or SELL.
+        :param reference: First traded price (bar open or tick price); market orders fill there.
+        :param through: Most favourable traded price (low for buys, high for sells); limit
+            orders fill when the market reached their price.
+        :param capacity: Largest total quantity that can be filled (e.g. a share of the volume).
+        :param slippage: Fraction by which market and stop fills are worse than the reference.
+        :return: List of (order, quantity, price) fills.
+        """
+        fills = []
+        market = self._market[side]
+        while market and capacity > 0:
+            order = market[0]
+            if order.status == 'cancelled':
+                market.popleft()
+                continue
+            base = reference if order.trigger_price is None else order.trigger_price
+            quantity = min(order.remaining, capacity)
+            capacity -= quantity
+            self._fill(order, quantity, base * (1 + side * slippage), fills)
+            if order.remaining <= 0:
+                market.popleft()
+
+        levels = self._levels[side]
+        while capacity > 0:
+            best = self._best(side)
+            if best is None or (best < through if side == BUY else best > through):
+                break
+            level = levels[best]
+            while level and capacity > 0:
+                order = level[0]
+                if order.status == 'cancelled':
+                    level.popleft()
+                    continue
+                start = reference if order.trigger_price is None else order.trigger_price
+                # A limit order never fills worse than its limit, and better when the market opened beyond it
+                price = min(best, start) if side == BUY else max(best, start)
+                quantity = min(order.remaining, capacity)
+                capacity -= quantity
+                self._fill(order, quantity, price, fills)
+                self._reduce_level(side, best, quantity)
+                if order.remaining <= 0:
+                    level.popleft()
+            if not level and best in levels:
+                # only rounding dust was left on the level
+                del levels[best]
+                del self._level_volume[side][best]
+        return fills
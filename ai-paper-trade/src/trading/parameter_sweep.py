@@ -0,0 +1,168 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from simulation.paper_trader import PaperTrader
+from utils.analytics import backtest_report
+from .strategy import TradingStrategy
+
+# Metrics of every configuration kept in the sweep results
+SUMMARY_COLUMNS = ('total_return', 'max_drawdown', 'sharpe', 'trade_count')
+
+# Price series of the current worker process, memory-mapped by _init_worker
+_WORKER_PRICES = None
+
+
+def _init_worker(prices_path):
+    global _WORKER_PRICES
+    _WORKER_PRICES = np.load(prices_path, mmap_mode='r')
+
+
+def _summarize(backtest, prices, initial_balance, periods_per_year):
+    """Return, drawdown, Sharpe ratio and trade count of one backtest."""
+    report = backtest_report(backtest, prices, initial_balance, periods_per_year)
+    return {name: report[name] for name in SUMMARY_COLUMNS}
+
+
+def _evaluate_chunk(configurations, initial_balance, periods_per_year):
+    """Backtest a chunk of strategy configurations against the shared prices."""
+    prices = np.asarray(_WORKER_PRICES)
+    results = []
+    for params in configurations:
+        signals = TradingStrategy(**params).generate_signals(prices)
+        backtest = PaperTrader(None, initial_balance).backtest(prices, signals, record_history=False)
+        results.append({**params, **_summarize(backtest, prices, initial_balance, periods_per_year)})
+    return results
+
+
+class ParameterSweep:
+    """
+    Grid search over TradingStrategy parameters on a process pool.
+
+    The price series is written once to a ``.npy`` file that every worker
+    memory-maps, so all workers share the same pages instead of receiving a
+    pickled copy. Finished results are appended to a JSON-lines file as
+    they arrive; running the same sweep again skips every configuration
+    already in that file, which makes an interrupted sweep resumable.
+    Every record carries a digest of the prices and backtest settings it was
+    computed on, so results of other data in the same file are not reused.
+    """
+
+    def __init__(self, prices, param_grid, initial_balance=10000, n_workers=None, results_path=None,
+                 chunk_size=8, periods_per_year=252):
+        """
+        :param prices: Price series to backtest on.
+        :param param_grid: Dict of TradingStrategy parameter name -> list of values.
+        :param initial_balance: Starting cash of every backtest.
+        :param n_workers: Number of worker processes (default: CPU count; 1 runs in-process).
+        :param results_path: JSON-lines file that makes the sweep resumable.
+        :param chunk_size: Configurations per task sent to a worker.
+        :param periods_per_year: Bars per year used to annualize the Sharpe ratio.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self.param_grid = param_grid
+        self.initial_balance = initial_balance
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.results_path = results_path
+        self.chunk_size = max(1, chunk_size)
+        self.periods_per_year = periods_per_year
+        self.data_digest = self._digest()
+
+    def _digest(self):
+        """Fingerprint of the prices (shape and contents) and the backtest settings."""
+        digest = hashlib.sha256(self.prices.tobytes())
+        digest.update(json.dumps([self.prices.shape, self.initial_balance, self.periods_per_year]).encode())
+        return digest.hexdigest()
+
+    def configurations(self):
+        """All parameter combinations of the grid, in a stable order."""
+        names = sorted(self.param_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*(self.param_grid[n] for n in names))]
+
+    @staticmethod
+    def _key(params):
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def _load_completed(self):
+        completed = {}
+        if self.results_path and os.path.exists(self.results_path):
+            with open(self.results_path) as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # partially written line from an interrupted run
+                    if record.get('data') != self.data_digest:
+                        continue  # computed on other prices or settings
+                    completed[self._key(record['params'])] = record['result']
+        return completed
+
+    def run(self):
+        """
+        Run every configuration that has not been completed yet.
+
+        :return: DataFrame with one row per configuration: its parameters followed by
+            total_return, max_drawdown, sharpe and trade_count.
+        """
+        configurations = self.configurations()
+        completed = self._load_completed()
+        pending = [params for params in configurations if self._key(params) not in completed]
+        if completed:
+            self.logger.info(f"Resuming sweep: {len(completed)} done, {len(pending)} pending")
+
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+        args = (self.initial_balance, self.periods_per_year)
+        results_file = self._open_results() if self.results_path else None
+
+        with tempfile.TemporaryDirectory() as workdir:
+            prices_path = os.path.join(workdir, 'prices.npy')
+            np.save(prices_path, self.prices)
+            try:
+                if self.n_workers == 1:
+                    _init_worker(prices_path)
+                    for chunk in chunks:
+                        self._record(_evaluate_chunk(chunk, *args), completed, results_file)
+                else:
+                    with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                             initargs=(prices_path,)) as executor:
+                        futures = [executor.submit(_evaluate_chunk, chunk, *args) for chunk in chunks]
+                        for future in as_completed(futures):
+                            self._record(future.result(), completed, results_file)
+            finally:
+                if results_file is not None:
+                    results_file.close()
+
+        names = sorted(self.param_grid)
+        rows = [{**params, **completed[self._key(params)]} for params in configurations]
+        return pd.DataFrame(rows, columns=names + list(SUMMARY_COLUMNS))
+
+    def _open_results(self):
+        results_file = open(self.results_path, 'a+')
+        if results_file.tell() > 0:
+            results_file.seek(results_file.tell() - 1)
+            if results_file.read(1) != '\n':
+                results_file.write('\n')  # terminate a torn last line
+        return results_file
+
+    def _record(self, results, completed, results_file):
+        names = sorted(self.param_grid)
+        for row in results:
+            params = {name: row[name] for name in names}
+            result = {key: value for key, value in row.items() if key not in params}
+            completed[self._key(params)] = result
+            if results_file is not None:
+                results_file.write(json.dumps({'data': self.data_digest, 'params': params, 'result': result},
+                                                  default=str) + '\n')
+        if results_file is not None:
+            results_file.flush()
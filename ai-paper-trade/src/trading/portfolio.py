@@ -0,0 +1,100 @@
+class PortfolioState:
+    """
+    Cash, positions and their valuation, maintained incrementally.
+
+    Every position is marked at its latest price. Fills and price updates
+    adjust the affected symbol and the running totals by the change they
+    cause, so cash, market value, cost basis, unrealized and total value are
+    O(1) to read and a price tick only touches one symbol. The totals are
+    recomputed exactly every ``resync_every`` updates to bound the
+    floating-point drift of the running sums.
+    """
+
+    def __init__(self, cash=0.0, resync_every=100000):
+        """
+        :param cash: Starting cash.
+        :param resync_every: Updates between exact recomputations of the totals.
+        """
+        self.resync_every = resync_every
+        self.reset(cash)
+
+    def reset(self, cash=0.0):
+        self.cash = cash
+        self.positions = {}  # Symbol -> {quantity, avg_price}
+        self.prices = {}  # Symbol -> latest mark
+        self.market_values = {}  # Symbol -> quantity * mark
+        self.market_value = 0.0
+        self.cost_basis = 0.0
+        self.realized_pl = 0.0
+        self._updates = 0
+
+    @property
+    def unrealized_pl(self):
+        return self.market_value - self.cost_basis
+
+    @property
+    def total_value(self):
+        return self.cash + self.market_value
+
+    def _revalue(self, symbol):
+        position = self.positions.get(symbol)
+        value = position['quantity'] * self.prices[symbol] if position is not None else 0.0
+        self.market_value += value - self.market_values.pop(symbol, 0.0)
+        if position is not None:
+            self.market_values[symbol] = value
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self.resync()
+
+    def resync(self):
+        """Recompute the totals exactly from the positions."""
+        self.market_value = sum(self.market_values.values())
+        self.cost_basis = sum(p['quantity'] * p['avg_price'] for p in self.positions.values())
+        self._updates = 0
+
+    def update_price(self, symbol, price):
+        """Mark a symbol at a new price; O(1)."""
+        self.prices[symbol] = price
+        if symbol in self.positions:
+            self._revalue(symbol)
+
+    def apply_fill(self, symbol, quantity, price, commission=0.0):
+        """
+        Book a fill: buys (positive quantity) pay and sells receive quantity * price,
+        minus commission either way. Trades that grow a position average into its
+        price; trades that shrink it realize the P&L (before commission) against it,
+        and a trade through zero closes the position before opening the remainder.
+        A position opened from flat is marked at its fill price, replacing any mark left
+        from an earlier position; an open position keeps its latest market price.
+        """
+        if quantity == 0:
+            return
+        held = self.positions[symbol]['quantity'] if symbol in self.positions else 0
+        if held and (held > 0) != (quantity > 0) and abs(quantity) > abs(held):
+            # A fill through zero closes the position, then opens the rest on the other side
+            self.apply_fill(symbol, -held, price, commission)
+            self.apply_fill(symbol, quantity + held, price)
+            return
+        self.cash -= quantity * price + commission
+        position = self.positions.get(symbol)
+        if position is None:
+            position = self.positions[symbol] = {'quantity': 0, 'avg_price': price}
+            self.prices[symbol] = price
+        old_quantity, avg_price = position['quantity'], position['avg_price']
+        new_quantity = old_quantity + quantity
+
+        if (old_quantity > 0) == (quantity > 0) or old_quantity == 0:
+            position['avg_price'] = (old_quantity * avg_price + quantity * price) / new_quantity
+            self.cost_basis += quantity * price
+        else:
+            # Closing (part of) the position realizes the P&L against its average price
+            self.realized_pl += quantity * (avg_price - price)
+            self.cost_basis += quantity * avg_price
+        position['quantity'] = new_quantity
+        if new_quantity == 0:
+            del self.positions[symbol]
+
+        self._revalue(symbol)
+
+    def position_value(self, symbol):
+        return self.market_values.get(symbol, 0.0)
@@ -0,0 +1,85 @@
+from collections import deque
+
+import numpy as np
+
+
+class RollingExtrema:
+    """
+    Running minimum and maximum over the last ``window`` values (or over all
+    values when window is None), maintained with monotonic deques.
+
+    Every value enters and leaves each deque at most once, so a push costs
+    amortized O(1) regardless of the window size.
+    """
+
+    def __init__(self, window=None):
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.count = 0
+        self._minima = deque()  # (index, value), values increasing
+        self._maxima = deque()  # (index, value), values decreasing
+
+    def push(self, value):
+        """Add a value, evicting the ones that fall out of the window."""
+        while self._minima and self._minima[-1][1] >= value:
+            self._minima.pop()
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._minima.append((self.count, value))
+        self._maxima.append((self.count, value))
+        self.count += 1
+
+        if self.window is not None:
+            oldest = self.count - self.window
+            if self._minima[0][0] < oldest:
+                self._minima.popleft()
+            if self._maxima[0][0] < oldest:
+                self._maxima.popleft()
+
+    @property
+    def min(self):
+        return self._minima[0][1] if self._minima else None
+
+    @property
+    def max(self):
+        return self._maxima[0][1] if self._maxima else None
+
+    def __len__(self):
+        return self.count if self.window is None else min(self.count, self.window)
+
+
+def _rolling_reduce(values, window, reduce, fill):
+    """
+    Trailing-window reduction (van Herk/Gil-Werman) in O(n) vectorized steps
+    along the last axis.
+
+    Element t is reduce(values[..., max(0, t - window + 1):t + 1]); the first
+    window - 1 elements use the shorter windows available.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[-1]
+    if window is None or window >= n:
+        return reduce.accumulate(values, axis=-1) if n else values.copy()
+
+    # Left-pad with the identity so early elements see partial windows, then
+    # right-pad to a whole number of blocks of size window
+    padded_length = -(-(n + window - 1) // window) * window
+    padded = np.full(values.shape[:-1] + (padded_length,), fill)
+    padded[..., window - 1:window - 1 + n] = values
+
+    blocks = padded.reshape(values.shape[:-1] + (-1, window))
+    prefix = reduce.accumulate(blocks, axis=-1).reshape(padded.shape)
+    suffix = reduce.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+    starts = np.arange(n)
+    return reduce(suffix[..., starts], prefix[..., starts + window - 1])
+
+
+def rolling_min(values, window=None):
+    """Trailing rolling minimum along the last axis; window None gives the expanding minimum."""
+    return _rolling_reduce(values, window, np.minimum, np.inf)
+
+
+def rolling_max(values, window=None):
+    """Trailing rolling maximum along the last axis; window None gives the expanding maximum."""
+    return _rolling_reduce(values, window, np.maximum, -np.inf)
@@ -1,6 +1,19 @@
+import numpy as np
+
+from .rolling_extrema import RollingExtrema, rolling_max, rolling_min
+
+
 class TradingStrategy:
-    def __init__(self):
-        pass
+    def __init__(self, buy_margin=0.0, sell_margin=0.0, lookback=None):
+        """
+        :param buy_margin: Fraction above the historical low that still counts as a buy.
+        :param sell_margin: Fraction below the historical high that already counts as a sell.
+        :param lookback: Number of most recent bars the thresholds look at (None: all history).
+        """
+        self.buy_margin = buy_margin
+        self.sell_margin = sell_margin
+        self.lookback = lookback
+        self._extrema = RollingExtrema(lookback)
 
     def buy(self, current_price, threshold):
         """Determine if the conditions are right to buy."""
@@ -39,9 +52,55 @@ class TradingStrategy:
     def calculate_buy_threshold(self, historical_data):
         """Calculate the buy threshold based on historical data."""
         # Implement logic to calculate buy threshold
-        return min(historical_data)  # Example logic
+        return min(self._window(historical_data)) * (1 + self.buy_margin)  # Example logic
 
     def calculate_sell_threshold(self, historical_data):
         """Calculate the sell threshold based on historical data."""
         # Implement logic to calculate sell threshold
-        return max(historical_data)  # Example logic
\ No newline at end of file
+        return max(self._window(historical_data)) * (1 - self.sell_margin)  # Example logic
+
+    def _window(self, historical_data):
+        return historical_data if self.lookback is None else historical_data[-self.lookback:]
+
+    def on_bar(self, current_price):
+        """
+        Streaming execute_strategy: evaluate the new bar against the bars seen
+        so far, then add it to the rolling window.
+
+        Thresholds come from monotonic-deque rolling min/max, so each bar
+        costs amortized O(1) instead of a pass over the history. The first
+        bar has no history and holds.
+        """
+        action = "Hold"
+        if len(self._extrema):
+            if self.buy(current_price, self._extrema.min * (1 + self.buy_margin)):
+                action = "Buy"
+            elif self.sell(current_price, self._extrema.max * (1 - self.sell_margin)):
+                action = "Sell"
+        self._extrema.push(current_price)
+        return action
+
+    def reset(self):
+        """Forget the bars seen by on_bar."""
+        self._extrema = RollingExtrema(self.lookback)
+
+    def generate_signals(self, prices):
+        """
+        Vectorized execute_strategy over a whole price series.
+
+        Bar t is evaluated against the bars before it, i.e. the signal equals
+        execute_strategy(prices[t], prices[:t]); the first bar has no history
+        and holds. With a lookback the thresholds use vectorized rolling
+        min/max over the last ``lookback`` bars. Returns action codes:
+        1 buy, -1 sell, 0 hold.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        signals = np.zeros(len(prices), dtype=np.int8)
+        if len(prices) < 2:
+            return signals
+
+        buy_threshold = rolling_min(prices[:-1], self.lookback) * (1 + self.buy_margin)
+        sell_threshold = rolling_max(prices[:-1], self.lookback) * (1 - self.sell_margin)
+        current = prices[1:]
+        signals[1:] = np.where(current < buy_threshold, 1, np.where(current > sell_threshold, -1, 0))
+        return signals
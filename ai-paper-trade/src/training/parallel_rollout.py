@@ -0,0 +1,204 @@
+import logging
+import multiprocessing
+import queue
+import random
+import traceback
+
+import numpy as np
+
+
+def get_policy_weights(agent):
+    """Weights of the agent's policy, or None if the agent exposes none."""
+    if hasattr(agent, 'get_weights'):
+        return agent.get_weights()
+    if hasattr(getattr(agent, 'neural_network', None), 'get_weights'):
+        return agent.neural_network.get_weights()
+    return None
+
+
+def set_policy_weights(agent, weights):
+    if hasattr(agent, 'set_weights'):
+        agent.set_weights(weights)
+    elif hasattr(getattr(agent, 'neural_network', None), 'set_weights'):
+        agent.neural_network.set_weights(weights)
+
+
+def seed_worker(env, agent, seed):
+    """Seed the global RNGs and, where supported, the environment and the agent."""
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+    for component in (env, agent):
+        if hasattr(component, 'seed'):
+            component.seed(seed)
+
+
+def run_episode(env, agent, collect=True):
+    """
+    Play one episode with agent.act.
+
+    :param collect: Keep the transitions; otherwise only the totals are returned.
+    :return: Dict with 'total_reward' and 'length', plus 'states', 'actions',
+        'rewards', 'next_states' and 'dones' arrays when collect is True.
+    """
+    state = env.reset()
+    transitions = []
+    total_reward = 0.0
+    length = 0
+    done = False
+    while not done:
+        action = agent.act(state)
+        next_state, reward, done = env.step(action)
+        if collect:
+            transitions.append((state, action, reward, next_state, done))
+        total_reward += reward
+        length += 1
+        state = next_state
+
+    episode = {'total_reward': total_reward, 'length': length}
+    if collect:
+        states, actions, rewards, next_states, dones = zip(*transitions)
+        episode.update({
+            'states': np.asarray(states),
+            'actions': np.asarray(actions),
+            'rewards': np.asarray(rewards, dtype=np.float64),
+            'next_states': np.asarray(next_states),
+            'dones': np.asarray(dones, dtype=bool),
+        })
+    return episode
+
+
+def _rollout_worker(worker_id, env, agent, seed, tasks, results):
+    """Worker loop: apply broadcast weights and play the episodes it is sent until told to stop."""
+    try:
+        if seed is not None:
+            seed_worker(env, agent, seed)
+        while True:
+            task = tasks.get()
+            if task[0] == 'stop':
+                break
+            if task[0] == 'weights':
+                set_policy_weights(agent, task[1])
+            elif task[0] == 'run':
+                _, episode_id, collect = task
+                episode = run_episode(env, agent, collect)
+                episode.update({'worker': worker_id, 'episode': episode_id})
+                results.put(('episode', worker_id, episode))
+    except Exception:
+        results.put(('error', worker_id, traceback.format_exc()))
+
+
+class ParallelRollout:
+    """
+    Pool of worker processes playing episodes for a learner.
+
+    Every worker owns a copy of the environment and of the agent, seeded
+    with ``seed + worker_id``. Episodes are dealt round-robin (episode i
+    goes to worker i % n_workers) and each worker has one episode in flight,
+    so weights broadcast by the learner reach the workers before their
+    next episode. Finished episodes are streamed back as they complete.
+    """
+
+    def __init__(self, env, agent, n_workers=2, seed=None, start_method=None, timeout=None):
+        """
+        :param env: Environment with reset() and step(action) -> (next_state, reward, done);
+            copied into every worker.
+        :param agent: Agent with act(state); its policy weights are synchronized through
+            get_weights/set_weights (on the agent or its neural_network).
+        :param n_workers: Number of worker processes.
+        :param seed: Base seed; worker i is seeded with seed + i.
+        :param start_method: multiprocessing start method (default: the platform default).
+        :param timeout: Seconds to wait for an episode before checking that the workers are alive.
+        """
+        if n_workers < 1:
+            raise ValueError("n_workers must be at least 1")
+        self.logger = logging.getLogger(__name__)
+        self.env = env
+        self.agent = agent
+        self.n_workers = n_workers
+        self.seed = seed
+        self.timeout = 5.0 if timeout is None else timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._workers = []
+        self._tasks = []
+        self._results = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def start(self):
+        if self._workers:
+            return
+        self._results = self._context.Queue()
+        for worker_id in range(self.n_workers):
+            tasks = self._context.Queue()
+            seed = None if self.seed is None else self.seed + worker_id
+            process = self._context.Process(target=_rollout_worker, daemon=True,
+                                            args=(worker_id, self.env, self.agent, seed, tasks, self._results))
+            process.start()
+            self._tasks.append(tasks)
+            self._workers.append(process)
+        self.logger.info(f"Started {self.n_workers} rollout workers")
+
+    def close(self):
+        for tasks in self._tasks:
+            tasks.put(('stop',))
+        for process in self._workers:
+            process.join(timeout=self.timeout)
+            if process.is_alive():
+                process.terminate()
+        self._workers, self._tasks = [], []
+
+    def broadcast(self, weights=None):
+        """Send policy weights (default: the learner agent's current weights) to every worker."""
+        if weights is None:
+            weights = get_policy_weights(self.agent)
+        if weights is None:
+            return
+        for tasks in self._tasks:
+            tasks.put(('weights', weights))
+
+    def _next_result(self):
+        while True:
+            try:
+                return self._results.get(timeout=self.timeout)
+            except queue.Empty:
+                dead = [i for i, process in enumerate(self._workers) if not process.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Rollout workers {dead} exited unexpectedly")
+
+    def episodes(self, n_episodes, collect=True):
+        """
+        Play n_episodes across the workers and yield each episode as it finishes.
+
+        Episodes arrive in completion order; their 'episode' field gives the
+        round-robin index. Weights broadcast while iterating apply to every
+        episode a worker starts afterwards.
+        """
+        self.start()
+        pending = [list(range(worker_id, n_episodes, self.n_workers)) for worker_id in range(self.n_workers)]
+        in_flight = 0
+        for worker_id, episode_ids in enumerate(pending):
+            if episode_ids:
+                self._tasks[worker_id].put(('run', episode_ids.pop(0), collect))
+                in_flight += 1
+
+        while in_flight:
+            kind, worker_id, payload = self._next_result()
+            if kind == 'error':
+                raise RuntimeError(f"Rollout worker {worker_id} failed:\n{payload}")
+            in_flight -= 1
+            yield payload
+            if pending[worker_id]:
+                self._tasks[worker_id].put(('run', pending[worker_id].pop(0), collect))
+                in_flight += 1
+
+    def evaluate(self, n_episodes):
+        """Total reward of each of n_episodes, ordered by episode index."""
+        totals = np.zeros(n_episodes)
+        for episode in self.episodes(n_episodes, collect=False):
+            totals[episode['episode']] = episode['total_reward']
+        return totals
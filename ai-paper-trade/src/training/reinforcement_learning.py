@@ -1,8 +1,31 @@
+import logging
+
+import numpy as np
+
+from utils.config import Config
+from .parallel_rollout import ParallelRollout
+
+
 class ReinforcementLearning:
-    def __init__(self, trading_agent, market_simulator, reward_function):
+    def __init__(self, trading_agent, market_simulator, reward_function, replay_buffer=None,
+                 batch_size=None, warmup=None, update_every=1):
+        """
+        :param replay_buffer: Optional ReplayBuffer/PrioritizedReplayBuffer. When given,
+            transitions are stored and the agent learns from sampled batches instead of
+            from every single transition.
+        :param batch_size: Transitions per replayed batch (default: Config.BATCH_SIZE).
+        :param warmup: Transitions to collect before the first update (default: batch_size).
+        :param update_every: Environment steps between batch updates.
+        """
+        self.logger = logging.getLogger(__name__)
         self.trading_agent = trading_agent
         self.market_simulator = market_simulator
         self.reward_function = reward_function
+        self.replay_buffer = replay_buffer
+        self.batch_size = Config.BATCH_SIZE if batch_size is None else batch_size
+        self.warmup = self.batch_size if warmup is None else max(warmup, self.batch_size)
+        self.update_every = update_every
+        self.steps = 0
         self.state = None
         self.total_reward = 0
 
@@ -13,28 +36,105 @@ class ReinforcementLearning:
     def step(self, action):
         next_state, reward, done = self.market_simulator.step(action)
         self.total_reward += reward
-        self.trading_agent.learn(self.state, action, reward, next_state)
+        if self.replay_buffer is None:
+            self._learn_one(self.state, action, reward, next_state, done)
+        else:
+            self.replay_buffer.add(self.state, action, reward, next_state, done)
+            self.steps += 1
+            if len(self.replay_buffer) >= self.warmup and self.steps % self.update_every == 0:
+                self.learn_from_replay()
         self.state = next_state
         return next_state, reward, done
 
-    def train(self, episodes):
+    def _learn_one(self, state, action, reward, next_state, done):
+        """Let the agent learn from a single transition, as a batch of one (see TradingAgent)."""
+        self.trading_agent.learn(np.asarray(state)[None], np.asarray([action]), np.asarray([reward]),
+                                 np.asarray(next_state)[None], np.asarray([done]))
+
+    def learn_from_replay(self):
+        """
+        Let the agent learn from one batch sampled from the replay buffer.
+
+        A prioritized buffer's importance-sampling weights are passed as
+        ``weights`` (None for uniform sampling); if the agent returns
+        per-sample errors and the buffer is prioritized, they become the new
+        priorities of the sampled transitions.
+        """
+        batch = self.replay_buffer.sample(self.batch_size)
+        errors = self.trading_agent.learn(batch['states'], batch['actions'], batch['rewards'],
+                                          batch['next_states'], batch['dones'], weights=batch.get('weights'))
+        if errors is not None and hasattr(self.replay_buffer, 'update_priorities'):
+            self.replay_buffer.update_priorities(batch['indices'], np.asarray(errors))
+        return batch
+
+    def learn_from_episode(self, episode):
+        """Learn from an episode played elsewhere (e.g. by a rollout worker)."""
+        transitions = zip(episode['states'], episode['actions'], episode['rewards'],
+                          episode['next_states'], episode['dones'])
+        if self.replay_buffer is None:
+            for state, action, reward, next_state, done in transitions:
+                self._learn_one(state, action, reward, next_state, done)
+            return
+        for state, action, reward, next_state, done in transitions:
+            self.replay_buffer.add(state, action, reward, next_state, done)
+            self.steps += 1
+            if len(self.replay_buffer) >= self.warmup and self.steps % self.update_every == 0:
+                self.learn_from_replay()
+
+    def train(self, episodes, n_workers=1, broadcast_every=1, seed=None):
+        """
+        Train for a number of episodes.
+
+        :param n_workers: With more than one worker, episodes are played in parallel by
+            ParallelRollout workers on copies of the simulator and agent, and the learner
+            trains on their trajectories as they stream in.
+        :param broadcast_every: Episodes between broadcasts of the learner's weights to the workers.
+        :param seed: Base seed of the rollout workers.
+        :return: Total reward of each episode.
+        """
+        if n_workers > 1:
+            return self._train_parallel(episodes, n_workers, broadcast_every, seed)
+        totals = []
         for episode in range(episodes):
             self.reset()
             done = False
             while not done:
                 action = self.trading_agent.act(self.state)
                 next_state, reward, done = self.step(action)
-                if done:
-                    print(f"Episode {episode + 1}: Total Reward: {self.total_reward}")
+            totals.append(self.total_reward)
+            self.logger.info(f"Episode {episode + 1}: Total Reward: {self.total_reward}")
+        return totals
 
-    def evaluate(self, num_episodes):
-        total_rewards = []
-        for episode in range(num_episodes):
-            self.reset()
-            done = False
-            while not done:
-                action = self.trading_agent.act(self.state)
-                next_state, reward, done = self.step(action)
-            total_rewards.append(self.total_reward)
+    def _train_parallel(self, episodes, n_workers, broadcast_every, seed):
+        totals = np.zeros(episodes)
+        with ParallelRollout(self.market_simulator, self.trading_agent, n_workers, seed) as rollout:
+            for received, episode in enumerate(rollout.episodes(episodes), start=1):
+                self.learn_from_episode(episode)
+                totals[episode['episode']] = episode['total_reward']
+                self.logger.info(f"Episode {episode['episode'] + 1} (worker {episode['worker']}): "
+                                 f"Total Reward: {episode['total_reward']}")
+                if received % broadcast_every == 0:
+                    rollout.broadcast()
+        return totals.tolist()
+
+    def evaluate(self, num_episodes, n_workers=1, seed=None):
+        """
+        Average total reward over num_episodes.
+
+        With more than one worker the episodes are played in parallel without learning.
+        """
+        if n_workers > 1:
+            with ParallelRollout(self.market_simulator, self.trading_agent, n_workers, seed) as rollout:
+                total_rewards = rollout.evaluate(num_episodes).tolist()
+        else:
+            total_rewards = []
+            for episode in range(num_episodes):
+                self.reset()
+                done = False
+                while not done:
+                    action = self.trading_agent.act(self.state)
+                    next_state, reward, done = self.step(action)
+                total_rewards.append(self.total_reward)
         average_reward = sum(total_rewards) / num_episodes
-        print(f"Average Reward over {num_episodes} episodes: {average_reward}")
\ No newline at end of file
+        self.logger.info(f"Average Reward over {num_episodes} episodes: {average_reward}")
+        return average_reward
@@ -0,0 +1,222 @@
+import numpy as np
+
+from utils.config import Config
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of (state, action, reward, next_state, done)
+    transitions backed by preallocated NumPy arrays.
+
+    Inserting overwrites the oldest transition in O(1) and sampling is a
+    single vectorized gather, so the memory footprint (see ``nbytes``) is
+    fixed when the arrays are allocated, either at construction or, when
+    state_shape is None, on the first insert.
+    """
+
+    def __init__(self, capacity=None, state_shape=None, state_dtype=np.float32, action_dtype=np.int8, seed=None):
+        """
+        :param capacity: Transitions kept (default: Config.REPLAY_BUFFER_SIZE).
+        :param state_shape: Shape of one state (default: taken from the first insert).
+        :param state_dtype: Dtype of the stored states.
+        :param action_dtype: Dtype of the stored actions.
+        :param seed: Seed of the sampling generator.
+        """
+        capacity = Config.REPLAY_BUFFER_SIZE if capacity is None else capacity
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = int(capacity)
+        self.state_dtype = np.dtype(state_dtype)
+        self.action_dtype = np.dtype(action_dtype)
+        self.rng = np.random.default_rng(seed)
+        self.position = 0
+        self.size = 0
+        self.states = None
+        if state_shape is not None:
+            self._allocate(tuple(np.atleast_1d(state_shape)))
+
+    def _allocate(self, state_shape):
+        self.state_shape = state_shape
+        self.states = np.zeros((self.capacity,) + state_shape, dtype=self.state_dtype)
+        self.next_states = np.zeros((self.capacity,) + state_shape, dtype=self.state_dtype)
+        self.actions = np.zeros(self.capacity, dtype=self.action_dtype)
+        self.rewards = np.zeros(self.capacity, dtype=np.float32)
+        self.dones = np.zeros(self.capacity, dtype=bool)
+
+    @property
+    def nbytes(self):
+        if self.states is None:
+            return 0
+        return sum(a.nbytes for a in (self.states, self.next_states, self.actions, self.rewards, self.dones))
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        """Insert one transition; returns its slot index."""
+        if self.states is None:
+            self._allocate(np.shape(state))
+        index = self.position
+        self.states[index] = state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.next_states[index] = next_state
+        self.dones[index] = done
+        self.position = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return index
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Insert a batch of transitions (e.g. one step of many environments); returns their slot indices."""
+        states = np.asarray(states)
+        if self.states is None:
+            self._allocate(states.shape[1:])
+        count = len(states)
+        if count > self.capacity:
+            # Only the newest `capacity` transitions would survive anyway
+            skip = count - self.capacity
+            self.position = (self.position + skip) % self.capacity
+            states, actions, rewards = states[skip:], np.asarray(actions)[skip:], np.asarray(rewards)[skip:]
+            next_states, dones = np.asarray(next_states)[skip:], np.asarray(dones)[skip:]
+            count = self.capacity
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        return indices
+
+    def _gather(self, indices):
+        return {
+            'states': self.states[indices],
+            'actions': self.actions[indices],
+            'rewards': self.rewards[indices],
+            'next_states': self.next_states[indices],
+            'dones': self.dones[indices],
+            'indices': indices,
+        }
+
+    def sample(self, batch_size):
+        """
+        Sample transitions uniformly with replacement.
+
+        :return: Dict of 'states', 'actions', 'rewards', 'next_states', 'dones' and 'indices' arrays.
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        return self._gather(self.rng.integers(0, self.size, size=batch_size))
+
+
+class SumTree:
+    """
+    Array-backed binary tree whose internal nodes hold the sum of their
+    children, giving O(log n) prefix-sum search and priority updates. Both
+    operations are vectorized over a whole batch of leaves.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.leaf_offset = 1 << max(0, int(capacity - 1).bit_length())
+        self.depth = self.leaf_offset.bit_length() - 1
+        self.nodes = np.zeros(2 * self.leaf_offset)
+
+    @property
+    def total(self):
+        return self.nodes[1]
+
+    def leaves(self, indices):
+        return self.nodes[self.leaf_offset + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        """Set the priorities of the given leaves and refresh their ancestors."""
+        nodes = self.leaf_offset + np.asarray(indices)
+        self.nodes[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def update_one(self, index, priority):
+        """Scalar version of update() for single inserts."""
+        node = self.leaf_offset + index
+        nodes = self.nodes
+        change = priority - nodes[node]
+        while node:
+            nodes[node] += change
+            node >>= 1
+
+    def find(self, values):
+        """Leaf index of every value's position in the cumulative priority sum."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.intp)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            go_right = values >= self.nodes[left]
+            values -= np.where(go_right, self.nodes[left], 0.0)
+            nodes = left + go_right
+        return np.minimum(nodes - self.leaf_offset, self.capacity - 1)
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Replay buffer sampling transitions in proportion to priority ** alpha,
+    with importance-sampling weights corrected by beta.
+
+    New transitions get the largest priority seen so far, so each of them
+    is likely to be replayed at least once.
+    """
+
+    def __init__(self, capacity=None, state_shape=None, alpha=None, beta=None, epsilon=1e-6, **kwargs):
+        """
+        :param alpha: Priority exponent (default: Config.PRIORITY_ALPHA).
+        :param beta: Importance-sampling exponent (default: Config.PRIORITY_BETA).
+        :param epsilon: Added to every priority so that every transition can be sampled.
+        Other parameters are those of ReplayBuffer.
+        """
+        super().__init__(capacity, state_shape, **kwargs)
+        self.alpha = Config.PRIORITY_ALPHA if alpha is None else alpha
+        self.beta = Config.PRIORITY_BETA if beta is None else beta
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(self.capacity)
+
+    @property
+    def nbytes(self):
+        return super().nbytes + self.tree.nodes.nbytes
+
+    def add(self, state, action, reward, next_state, done):
+        index = super().add(state, action, reward, next_state, done)
+        self.tree.update_one(index, self.max_priority ** self.alpha)
+        return index
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        indices = super().add_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, np.full(len(indices), self.max_priority ** self.alpha))
+        return indices
+
+    def sample(self, batch_size, beta=None):
+        """
+        Sample transitions by priority using stratified segments of the sum tree.
+
+        :return: Same dict as ReplayBuffer.sample plus normalized importance 'weights'.
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        beta = self.beta if beta is None else beta
+        total = self.tree.total
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        indices = np.minimum(self.tree.find(np.minimum(values, np.nextafter(total, 0))), self.size - 1)
+
+        probabilities = np.maximum(self.tree.leaves(indices) / total, np.finfo(np.float64).tiny)
+        weights = (self.size * probabilities) ** -beta
+        batch = self._gather(indices)
+        batch['weights'] = (weights / weights.max()).astype(np.float32)
+        return batch
+
+    def update_priorities(self, indices, errors):
+        """Set new priorities from the absolute errors (e.g. TD errors) of sampled transitions."""
+        priorities = np.abs(np.asarray(errors, dtype=np.float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
@@ -1,6 +1,27 @@
+import numpy as np
+
+from utils import analytics
+
+
 class RewardFunctions:
-    def __init__(self):
-        pass
+    """
+    Trade rewards and per-step reward shaping.
+
+    Every method takes scalars or arrays. The trade methods work elementwise,
+    so a whole batch of trades is scored in one call; the shaping methods
+    work along the last axis of equity curves of shape (time,) or
+    (envs, time), returning one reward per step (time - 1 values).
+    """
+
+    def __init__(self, holding_reward=0.1, short_trade_threshold=1, short_trade_penalty=-1):
+        """
+        :param holding_reward: Reward per time step a position is held.
+        :param short_trade_threshold: Trades shorter than this are penalized.
+        :param short_trade_penalty: Penalty added to trades shorter than the threshold.
+        """
+        self.holding_reward = holding_reward
+        self.short_trade_threshold = short_trade_threshold
+        self.short_trade_penalty = short_trade_penalty
 
     def reward_for_profit(self, profit):
         """Calculate reward based on profit."""
@@ -8,7 +29,7 @@ class RewardFunctions:
 
     def reward_for_holding(self, holding_period):
         """Calculate reward for holding a position."""
-        return holding_period * 0.1  # Example: reward for each time step held
+        return holding_period * self.holding_reward
 
     def total_reward(self, profit, holding_period):
         """Calculate total reward based on profit and holding period."""
@@ -16,12 +37,95 @@ class RewardFunctions:
 
     def penalty_for_short_trades(self, trade_duration):
         """Apply a penalty for trades that are too short."""
-        if trade_duration < 1:  # Example threshold for short trades
-            return -1  # Penalty for short trades
+        if np.ndim(trade_duration):
+            return np.where(np.asarray(trade_duration) < self.short_trade_threshold, self.short_trade_penalty, 0)
+        if trade_duration < self.short_trade_threshold:
+            return self.short_trade_penalty
         return 0
 
     def evaluate_trade(self, profit, holding_period, trade_duration):
         """Evaluate a trade and return the final reward."""
         reward = self.total_reward(profit, holding_period)
         penalty = self.penalty_for_short_trades(trade_duration)
-        return reward + penalty
\ No newline at end of file
+        return reward + penalty
+
+    def evaluate_trades(self, profits, holding_periods, trade_durations):
+        """
+        Rewards of a batch of trades in one call (same rules as evaluate_trade).
+
+        :param profits: Profit per trade.
+        :param holding_periods: Holding period per trade.
+        :param trade_durations: Duration per trade.
+        :return: float64 array of rewards, broadcast over the inputs.
+        """
+        profits = np.asarray(profits, dtype=np.float64)
+        holding_periods = np.asarray(holding_periods, dtype=np.float64)
+        durations = np.asarray(trade_durations, dtype=np.float64)
+        penalties = np.where(durations < self.short_trade_threshold, float(self.short_trade_penalty), 0.0)
+        return profits + holding_periods * self.holding_reward + penalties
+
+    @staticmethod
+    def step_returns(equity):
+        """Simple return of every step of equity curves of shape (..., time)."""
+        return analytics.step_returns(equity)
+
+    @staticmethod
+    def rolling_sharpe(returns, window=20, periods_per_year=None):
+        """
+        Sharpe ratio of the trailing ``window`` returns at every step.
+
+        Steps with fewer than two returns in their window, or with a flat
+        window, score 0. Uses running sums, so the cost is O(time) for any window.
+
+        :param returns: Step returns of shape (..., time).
+        :param window: Returns per window.
+        :param periods_per_year: Annualize by sqrt(periods_per_year) (default: per-step ratio).
+        :return: Array of the same shape as returns.
+        """
+        return analytics.rolling_sharpe(returns, window, periods_per_year)
+
+    @staticmethod
+    def drawdowns(equity):
+        """Drawdown from the running peak at every point of equity curves of shape (..., time)."""
+        return analytics.drawdowns(equity)
+
+    @staticmethod
+    def transaction_cost_penalties(traded_value, cost_rate, equity=None):
+        """
+        Penalty of -cost_rate * |traded value| per step.
+
+        With ``equity`` (the portfolio value before each step, same shape as
+        traded_value) the cost is a fraction of it, on the scale of a step return.
+        """
+        penalties = -cost_rate * np.abs(np.asarray(traded_value, dtype=np.float64))
+        if equity is not None:
+            penalties = penalties / np.asarray(equity, dtype=np.float64)
+        return penalties
+
+    def shaped_rewards(self, equity, traded_value=None, cost_rate=0.0, drawdown_weight=0.0, sharpe_window=None,
+                       periods_per_year=None):
+        """
+        Per-step rewards of whole equity curves, e.g. every environment of a batched rollout.
+
+        The base reward of a step is its return, or the rolling Sharpe ratio
+        of the returns up to it when ``sharpe_window`` is set. The drawdown
+        after the step, times ``drawdown_weight``, and the transaction costs
+        of the step, as a fraction of the equity before it, are subtracted.
+
+        :param equity: Portfolio values of shape (time,) or (envs, time).
+        :param traded_value: Value traded on each step, shape (..., time - 1).
+        :param cost_rate: Cost as a fraction of traded value.
+        :param drawdown_weight: Weight of the drawdown penalty.
+        :param sharpe_window: Window of the rolling Sharpe base reward (None: plain returns).
+        :param periods_per_year: Annualization of the rolling Sharpe ratio.
+        :return: Rewards of shape (..., time - 1).
+        """
+        rewards = self.step_returns(equity)
+        if sharpe_window:
+            rewards = self.rolling_sharpe(rewards, sharpe_window, periods_per_year)
+        if drawdown_weight:
+            rewards = rewards - drawdown_weight * self.drawdowns(equity)[..., 1:]
+        if traded_value is not None and cost_rate:
+            rewards = rewards + self.transaction_cost_penalties(traded_value, cost_rate,
+                                                                    np.asarray(equity, dtype=np.float64)[..., :-1])
+        return rewards
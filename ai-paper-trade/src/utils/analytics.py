@@ -0,0 +1,306 @@
+import numpy as np
+
+from trading.rolling_extrema import rolling_max
+
+# A standard deviation below this fraction of the mean is rounding noise of a flat series
+_FLAT = 1e-10
+
+
+def _scalar(values):
+    """0-d results (a single equity curve) become Python numbers."""
+    return values.item() if np.ndim(values) == 0 else values
+
+
+def step_returns(equity):
+    """Simple return of every step of equity curves of shape (..., time)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return np.diff(equity, axis=-1) / equity[..., :-1]
+
+
+def drawdowns(equity):
+    """Drawdown from the running peak at every point of equity curves of shape (..., time)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return 1 - equity / np.maximum.accumulate(equity, axis=-1)
+
+
+def max_drawdown_duration(equity):
+    """Longest stretch of steps spent below a previous peak, per equity curve."""
+    equity = np.asarray(equity, dtype=np.float64)
+    steps = np.arange(equity.shape[-1])
+    at_peak = equity >= np.maximum.accumulate(equity, axis=-1)
+    last_peak = np.maximum.accumulate(np.where(at_peak, steps, 0), axis=-1)
+    return (steps - last_peak).max(axis=-1, initial=0)
+
+
+def annualized_return(equity, periods_per_year=252):
+    """Compound annual growth rate of equity curves of shape (..., time); -1 once equity is lost."""
+    equity = np.asarray(equity, dtype=np.float64)
+    periods = equity.shape[-1] - 1
+    if periods < 1:
+        return np.zeros(equity.shape[:-1])
+    growth = equity[..., -1] / equity[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annual = np.power(np.maximum(growth, 0.0), periods_per_year / periods) - 1
+    return np.where(growth > 0, annual, -1.0)
+
+
+def sharpe_ratio(returns, periods_per_year=252, risk_free=0.0):
+    """
+    Annualized Sharpe ratio of step returns of shape (..., time).
+
+    :param returns: Step returns.
+    :param periods_per_year: Steps per year.
+    :param risk_free: Annual risk-free rate.
+    :return: Ratio per series; 0 for fewer than two returns or a flat series.
+    """
+    excess = np.asarray(returns, dtype=np.float64) - risk_free / periods_per_year
+    if excess.shape[-1] < 2:
+        return np.zeros(excess.shape[:-1])
+    mean = excess.mean(axis=-1)
+    std = excess.std(axis=-1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = mean / std * np.sqrt(periods_per_year)
+    return np.where(std > _FLAT * np.abs(mean), ratio, 0.0)
+
+
+def sortino_ratio(returns, periods_per_year=252, risk_free=0.0):
+    """
+    Annualized Sortino ratio: mean excess return over the downside deviation.
+
+    :param returns: Step returns of shape (..., time).
+    :param periods_per_year: Steps per year.
+    :param risk_free: Annual risk-free rate, also the downside target.
+    :return: Ratio per series; 0 when no return falls below the target.
+    """
+    excess = np.asarray(returns, dtype=np.float64) - risk_free / periods_per_year
+    if excess.shape[-1] < 1:
+        return np.zeros(excess.shape[:-1])
+    downside = np.minimum(excess, 0.0)
+    deviation = np.sqrt(np.mean(downside * downside, axis=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = excess.mean(axis=-1) / deviation * np.sqrt(periods_per_year)
+    return np.where(deviation > 0, ratio, 0.0)
+
+
+def trade_metrics(equity, positions, prices, periods_per_year=252):
+    """
+    Exposure, turnover, trade count and hit rate from the positions held along equity curves.
+
+    Positions start from flat, so a position on the first bar counts as a
+    trade. With a trailing symbols axis on positions and prices, values are
+    summed over symbols and a bar is invested while any symbol is held.
+
+    :param equity: Portfolio values of shape (..., time).
+    :param positions: Units held after every bar, shape (..., time) or (..., time, symbols).
+    :param prices: Prices broadcastable to positions.
+    :param periods_per_year: Steps per year, to annualize turnover.
+    :return: Dict with 'exposure' (mean gross position value over equity), 'turnover'
+        (traded value per year over mean equity), 'trade_count' (position changes) and
+        'hit_rate' (share of invested steps that made money).
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    prices = np.broadcast_to(np.asarray(prices, dtype=np.float64), positions.shape)
+    by_symbol = positions.ndim == equity.ndim + 1
+    total = (lambda values: values.sum(axis=-1)) if by_symbol else (lambda values: values)
+
+    changes = np.diff(positions, axis=-2 if by_symbol else -1, prepend=0.0)
+    traded_value = total(np.abs(changes) * prices)
+    trade_count = total(changes != 0).sum(axis=-1)
+
+    held, move = (positions[..., :-1, :], np.diff(prices, axis=-2)) if by_symbol else \
+        (positions[..., :-1], np.diff(prices, axis=-1))
+    step_pnl = total(held * move)
+    invested = (held != 0).any(axis=-1) if by_symbol else held != 0
+    invested_steps = invested.sum(axis=-1)
+
+    mean_equity = equity.mean(axis=-1)
+    periods = max(equity.shape[-1] - 1, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exposure = np.mean(total(np.abs(positions * prices)) / equity, axis=-1)
+        turnover = traded_value.sum(axis=-1) / mean_equity * periods_per_year / periods
+        hit_rate = ((step_pnl > 0) & invested).sum(axis=-1) / invested_steps
+    return {
+        'exposure': _scalar(exposure),
+        'turnover': _scalar(np.where(mean_equity != 0, turnover, 0.0)),
+        'trade_count': _scalar(trade_count),
+        'hit_rate': _scalar(np.where(invested_steps > 0, hit_rate, 0.0)),
+    }
+
+
+def performance_report(equity, positions=None, prices=None, periods_per_year=252, risk_free=0.0):
+    """
+    Full metrics of one equity curve or a whole batch of them.
+
+    Every metric is computed for all curves at once along the last axis,
+    so a (backtests, time) array from a sweep is summarized in a handful of
+    array passes.
+
+    :param equity: Portfolio values of shape (time,) or (curves, time).
+    :param positions: Units held after every bar (see trade_metrics); adds trade metrics.
+    :param prices: Prices of the positions; required with positions.
+    :param periods_per_year: Steps per year used to annualize.
+    :param risk_free: Annual risk-free rate of the Sharpe and Sortino ratios.
+    :return: Dict of metric -> float for one curve or array of one value per curve:
+        total_return, annualized_return, volatility, sharpe, sortino, max_drawdown,
+        max_drawdown_duration, calmar, plus exposure, turnover, trade_count and
+        hit_rate when positions are given.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.shape[-1] == 0:
+        raise ValueError("Empty equity curve")
+    returns = step_returns(equity)
+    max_drawdown = drawdowns(equity).max(axis=-1)
+    annual = annualized_return(equity, periods_per_year)
+    volatility = returns.std(axis=-1, ddof=1) * np.sqrt(periods_per_year) if returns.shape[-1] > 1 else \
+        np.zeros(equity.shape[:-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calmar = np.where(max_drawdown > 0, annual / max_drawdown, 0.0)
+
+    report = {
+        'total_return': equity[..., -1] / equity[..., 0] - 1,
+        'annualized_return': annual,
+        'volatility': volatility,
+        'sharpe': sharpe_ratio(returns, periods_per_year, risk_free),
+        'sortino': sortino_ratio(returns, periods_per_year, risk_free),
+        'max_drawdown': max_drawdown,
+        'max_drawdown_duration': max_drawdown_duration(equity),
+        'calmar': calmar,
+    }
+    report = {name: _scalar(values) for name, values in report.items()}
+    if positions is not None:
+        if prices is None:
+            raise ValueError("prices are required with positions")
+        report.update(trade_metrics(equity, positions, prices, periods_per_year))
+    return report
+
+
+def backtest_report(backtest, prices, initial_balance, periods_per_year=252, risk_free=0.0):
+    """
+    performance_report of a PaperTrader.backtest() result.
+
+    The starting balance is prepended to the equity curve, so the first
+    bar's return and trades are included.
+
+    :param backtest: Dict returned by PaperTrader.backtest.
+    :param prices: The prices the backtest ran on.
+    :param initial_balance: Cash before the first bar.
+    :return: Dict of metrics (see performance_report).
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    equity = np.concatenate([[initial_balance], backtest['equity']])
+    positions = np.concatenate([[0], backtest['position']])
+    prices = np.concatenate([prices[:1], prices])
+    return performance_report(equity, positions, prices, periods_per_year, risk_free)
+
+
+def _window_sums(values, window):
+    """Sum and count of the trailing ``window`` values at every step, along the last axis."""
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    sums = np.pad(np.cumsum(values, axis=-1), pad)
+    steps = np.arange(1, values.shape[-1] + 1)
+    first = np.maximum(steps - window, 0)
+    return sums[..., steps] - sums[..., first], steps - first
+
+
+def rolling_mean_std(returns, window):
+    """
+    Trailing mean and sample standard deviation of every ``window`` returns.
+
+    Running sums make the cost O(time) for any window; centring on the
+    overall mean keeps the running sums of squares accurate.
+
+    :return: (mean, std, valid); valid is False where the window holds fewer
+        than two returns or is flat, and std is not meaningful there.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    offset = returns.mean(axis=-1, keepdims=True) if returns.shape[-1] else 0.0
+    centred = returns - offset
+    total, count = _window_sums(centred, window)
+    total_squares, _ = _window_sums(centred * centred, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (total_squares - total * total / count) / (count - 1)
+    # A variance at rounding level of the window's squares means a flat window
+    valid = (count > 1) & (variance > _FLAT * total_squares / count)
+    return total / count + offset, np.sqrt(np.maximum(variance, 0.0)), valid
+
+
+def rolling_sharpe(returns, window=20, periods_per_year=None):
+    """
+    Sharpe ratio of the trailing ``window`` returns at every step.
+
+    :param returns: Step returns of shape (..., time).
+    :param window: Returns per window.
+    :param periods_per_year: Annualize by sqrt(periods_per_year) (default: per-step ratio).
+    :return: Array of the same shape as returns; 0 where the window is too short or flat.
+    """
+    mean, std, valid = rolling_mean_std(returns, window)
+    scale = np.sqrt(periods_per_year) if periods_per_year else 1.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(valid, mean / std * scale, 0.0)
+
+
+def rolling_volatility(returns, window=20, periods_per_year=252):
+    """Annualized standard deviation of the trailing ``window`` returns at every step."""
+    _, std, valid = rolling_mean_std(returns, window)
+    return np.where(valid, std * np.sqrt(periods_per_year), 0.0)
+
+
+def rolling_sortino(returns, window=20, periods_per_year=252):
+    """Sortino ratio of the trailing ``window`` returns at every step (0 without downside)."""
+    returns = np.asarray(returns, dtype=np.float64)
+    total, count = _window_sums(returns, window)
+    downside = np.minimum(returns, 0.0)
+    downside_squares, _ = _window_sums(downside * downside, window)
+    deviation = np.sqrt(np.maximum(downside_squares, 0.0) / count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = total / count / deviation * np.sqrt(periods_per_year)
+    return np.where(deviation > 0, ratio, 0.0)
+
+
+def rolling_returns(equity, window=20):
+    """Return over the trailing ``window`` steps at every point of equity curves (shorter at the start)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    first = np.maximum(np.arange(equity.shape[-1]) - window, 0)
+    return equity / equity[..., first] - 1
+
+
+def rolling_drawdown(equity, window=20):
+    """Drawdown from the highest equity of the trailing ``window`` steps at every point."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return 1 - equity / rolling_max(equity, window + 1)
+
+
+def rolling_report(equity, window=20, periods_per_year=252):
+    """
+    Rolling metrics of one or many equity curves.
+
+    Every metric at step t covers the ``window`` returns up to t, and is
+    aligned with the returns: element t belongs to equity[..., t + 1].
+
+    :param equity: Portfolio values of shape (time,) or (curves, time).
+    :param window: Returns per window.
+    :param periods_per_year: Steps per year used to annualize.
+    :return: Dict of 'return', 'volatility', 'sharpe', 'sortino' and 'drawdown' arrays
+        of shape (..., time - 1).
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    returns = step_returns(equity)
+    return {
+        'return': rolling_returns(equity, window)[..., 1:],
+        'volatility': rolling_volatility(returns, window, periods_per_year),
+        'sharpe': rolling_sharpe(returns, window, periods_per_year),
+        'sortino': rolling_sortino(returns, window, periods_per_year),
+        'drawdown': rolling_drawdown(equity, window)[..., 1:],
+    }
+
+
+def report_frame(report, index=None):
+    """
+    DataFrame of a batch performance_report: one row per equity curve, one column per metric.
+
+    :param report: Dict returned by performance_report for a (curves, time) batch.
+    :param index: Row labels, e.g. the sweep configurations (default: curve number).
+    """
+    import pandas as pd
+    return pd.DataFrame({name: np.atleast_1d(values) for name, values in report.items()}, index=index)
@@ -10,6 +10,17 @@ class Config:
     INITIAL_CAPITAL = 10000  # Starting capital for paper trading
     TRADE_SIZE = 100  # Size of each trade
     HOLDING_PERIOD = 5  # Number of days to hold a position
+    BUY_THRESHOLD = 0.5  # Agent signals above this buy
+    SELL_THRESHOLD = -0.5  # Agent signals below this sell
+
+    # Data fetching
+    FETCH_MAX_WORKERS = 8  # Concurrent downloads in fetch_multiple_symbols
+    FETCH_BATCH_SIZE = 20  # Symbols per grouped yf.download call
+    FETCH_MAX_RETRIES = 3  # Per-symbol retries after a failed download
+    FETCH_RETRY_BACKOFF = 0.5  # Seconds before the first retry (doubles every retry)
+    QUOTE_TTL = 15  # Seconds a cached quote stays fresh
+    QUOTE_BATCH_SIZE = 100  # Symbols per quote refresh request
+    LOADER_CHUNK_SIZE = 100000  # Rows per chunk when streaming history from disk
 
     # Model hyperparameters
     LEARNING_RATE = 0.001
@@ -21,6 +32,9 @@ class Config:
     EXPLORATION_RATE = 1.0  # Initial exploration rate
     EXPLORATION_DECAY = 0.995  # Decay rate for exploration
     MIN_EXPLORATION_RATE = 0.01  # Minimum exploration rate
+    REPLAY_BUFFER_SIZE = 100000  # Transitions kept in the experience replay buffer
+    PRIORITY_ALPHA = 0.6  # How strongly prioritized replay favours high-error transitions
+    PRIORITY_BETA = 0.4  # Importance-sampling correction for prioritized replay
 
     # Logging settings
     LOGGING_LEVEL = "INFO"  # Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -28,4 +42,6 @@ class Config:
 
     # Other settings
     SIMULATION_SPEED = 100  # Speed of market simulation (e.g., 100x)
-    HISTORICAL_DATA_PATH = "data/historical/"  # Path to historical data files
\ No newline at end of file
+    HISTORICAL_DATA_PATH = "data/historical/"  # Path to historical data files
+    OHLCV_CACHE_DIR = "ohlcv_cache"  # Subdirectory of HISTORICAL_DATA_PATH for the OHLCV cache
+    CHART_MAX_POINTS = 2000  # Points per line after downsampling a chart
\ No newline at end of file
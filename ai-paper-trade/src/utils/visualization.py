@@ -1,22 +1,290 @@
-from matplotlib import pyplot as plt
-
-def plot_trading_performance(dates, portfolio_values, title="Trading Performance"):
-    plt.figure(figsize=(12, 6))
-    plt.plot(dates, portfolio_values, label='Portfolio Value', color='blue')
-    plt.title(title)
-    plt.xlabel('Date')
-    plt.ylabel('Portfolio Value')
-    plt.legend()
-    plt.grid()
-    plt.show()
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.config import Config
+
+
+def _positions(x, n):
+    """Numeric positions of the x values (dates become nanoseconds) for the downsampling geometry."""
+    if x is None:
+        return np.arange(n, dtype=np.float64)
+    import pandas as pd
+
+    if isinstance(x, pd.DatetimeIndex):
+        return x.as_unit('ns').asi8.astype(np.float64)
+    x = np.asarray(x)
+    if x.dtype.kind == 'M':
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    if x.dtype.kind == 'O':
+        return pd.DatetimeIndex(x).as_unit('ns').asi8.astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are kept; from every bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket is kept. Peaks and troughs survive, so
+    the shape of the line is preserved with far fewer points.
+
+    :param x: Positions of the points (None: evenly spaced).
+    :param y: Values of the points.
+    :param n_out: Number of points to keep.
+    :return: Sorted indices into y.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _positions(x, n)
+
+    # n_out - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    sizes = np.diff(edges)
+    average_x = np.append(np.add.reduceat(x[1:-1], edges[:-1] - 1) / sizes, x[-1])
+    average_y = np.append(np.add.reduceat(y[1:-1], edges[:-1] - 1) / sizes, y[-1])
+
+    kept = np.empty(n_out, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    last = 0
+    for bucket in range(n_out - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        next_x, next_y = average_x[bucket + 1], average_y[bucket + 1]
+        area = np.abs((x[last] - next_x) * (y[low:high] - y[last]) - (x[last] - x[low:high]) * (next_y - y[last]))
+        last = low + int(np.argmax(area))
+        kept[bucket + 1] = last
+    return kept
+
+
+def minmax_indices(y, n_out):
+    """
+    Indices of the minimum and maximum of equal-sized buckets of y.
+
+    Every extreme of the series is kept exactly, which makes the
+    downsampled line look identical to the full one at plot resolution.
+
+    :param y: Values of the points.
+    :param n_out: Maximum number of points to keep.
+    :return: Sorted indices into y, including the first and last points.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    buckets = (n_out - 2) // 2
+    size = -(-n // buckets)
+    padded = np.full(-(-n // size) * size, np.inf)
+    padded[:n] = y
+    starts = np.arange(0, len(padded), size)
+    minima = starts + padded.reshape(-1, size).argmin(axis=1)
+    padded[n:] = -np.inf
+    maxima = starts + padded.reshape(-1, size).argmax(axis=1)
+    return np.unique(np.concatenate([[0, n - 1], minima, maxima]))
+
+
+DOWNSAMPLERS = {
+    'lttb': lttb_indices,
+    'minmax': lambda x, y, n_out: minmax_indices(y, n_out),
+}
+
+
+def downsample(x, y, max_points=None, method='lttb'):
+    """
+    Downsample one line for plotting.
+
+    :param x: Positions (numbers, dates or None for the indices of y).
+    :param y: Values.
+    :param max_points: Points kept (default: Config.CHART_MAX_POINTS; 0 keeps every point).
+    :param method: 'lttb' or 'minmax'.
+    :return: (x, y) of the kept points; without x, the kept points' original
+        positions (indices) are returned as x, so the axis is not distorted.
+    """
+    y = np.asarray(y)
+    max_points = Config.CHART_MAX_POINTS if max_points is None else max_points
+    if not max_points or len(y) <= max_points:
+        return (np.arange(len(y)) if x is None else x), y
+    kept = DOWNSAMPLERS[method](x, y, max_points)
+    if x is None:
+        return kept, y[kept]
+    import pandas as pd
+
+    x = x[kept] if isinstance(x, pd.Index) else np.asarray(x)[kept]
+    return x, y[kept]
+
+
+def _series(x, y, label, color, max_points, method):
+    x, y = downsample(x, y, max_points, method)
+    return {'x': x, 'y': y, 'label': label, 'color': color}
+
+
+def performance_chart(dates, portfolio_values, title="Trading Performance", max_points=None, method='lttb'):
+    """Downsampled chart spec of a portfolio value curve (see render_chart)."""
+    return {
+        'title': title, 'xlabel': 'Date', 'ylabel': 'Portfolio Value',
+        'series': [_series(dates, portfolio_values, 'Portfolio Value', 'blue', max_points, method)],
+    }
+
+
+def predictions_chart(dates, actual_prices, predicted_prices, title="Model Predictions", max_points=None,
+                      method='lttb'):
+    """Downsampled chart spec of actual against predicted prices (see render_chart)."""
+    return {
+        'title': title, 'xlabel': 'Date', 'ylabel': 'Price',
+        'series': [_series(dates, actual_prices, 'Actual Prices', 'green', max_points, method),
+                   _series(dates, predicted_prices, 'Predicted Prices', 'red', max_points, method)],
+    }
+
+
+CHARTS = {
+    'performance': performance_chart,
+    'predictions': predictions_chart,
+}
 
-def plot_model_predictions(dates, actual_prices, predicted_prices, title="Model Predictions"):
-    plt.figure(figsize=(12, 6))
-    plt.plot(dates, actual_prices, label='Actual Prices', color='green')
-    plt.plot(dates, predicted_prices, label='Predicted Prices', color='red')
-    plt.title(title)
-    plt.xlabel('Date')
-    plt.ylabel('Price')
-    plt.legend()
-    plt.grid()
-    plt.show()
\ No newline at end of file
+
+def _draw(figure, chart):
+    axes = figure.add_subplot()
+    for series in chart['series']:
+        axes.plot(series['x'], series['y'], label=series['label'], color=series['color'])
+    axes.set_title(chart['title'])
+    axes.set_xlabel(chart['xlabel'])
+    axes.set_ylabel(chart['ylabel'])
+    axes.legend()
+    axes.grid()
+
+
+def render_chart(chart, path, dpi=100):
+    """
+    Draw a chart spec into an image file with the headless Agg canvas.
+
+    pyplot and its global state are not used, so this runs on machines
+    without a display and in any thread or worker process.
+
+    :param chart: Spec from performance_chart or predictions_chart.
+    :param path: Output file; the format follows the extension (.png, .svg, .pdf, ...).
+    :param dpi: Resolution of raster formats.
+    :return: The path written.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(12, 6))
+    FigureCanvasAgg(figure)
+    _draw(figure, chart)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    figure.savefig(path, dpi=dpi)
+    return path
+
+
+def render_trading_performance(dates, portfolio_values, path, title="Trading Performance", max_points=None,
+                               method='lttb', dpi=100):
+    """Write a downsampled portfolio value chart to an image file; returns the path."""
+    return render_chart(performance_chart(dates, portfolio_values, title, max_points, method), path, dpi)
+
+
+def render_model_predictions(dates, actual_prices, predicted_prices, path, title="Model Predictions",
+                             max_points=None, method='lttb', dpi=100):
+    """Write a downsampled actual vs. predicted price chart to an image file; returns the path."""
+    chart = predictions_chart(dates, actual_prices, predicted_prices, title, max_points, method)
+    return render_chart(chart, path, dpi)
+
+
+class ChartRenderer:
+    """
+    Renders charts to files on a pool of worker processes.
+
+    submit() downsamples in the calling process, so only a few thousand
+    points per line are sent to a worker, and returns a Future at once;
+    a training or backtest loop never waits for matplotlib. Failed renders
+    are logged rather than raised into the caller.
+    """
+
+    def __init__(self, n_workers=1, max_points=None, method='lttb', dpi=100):
+        """
+        :param n_workers: Worker processes drawing charts.
+        :param max_points: Points kept per line (default: Config.CHART_MAX_POINTS).
+        :param method: Downsampling method, 'lttb' or 'minmax'.
+        :param dpi: Resolution of raster formats.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.n_workers = max(1, n_workers)
+        self.max_points = max_points
+        self.method = method
+        self.dpi = dpi
+        self._executor = None
+
+    def submit(self, kind, path, *args, **kwargs):
+        """
+        Queue a chart for rendering.
+
+        :param kind: Chart type in CHARTS: 'performance' or 'predictions'.
+        :param path: Output image file.
+        :param args: Data of the chart, as for render_trading_performance / render_model_predictions.
+        :param kwargs: Other chart arguments, e.g. title.
+        :return: Future resolving to the path written.
+        """
+        kwargs.setdefault('max_points', self.max_points)
+        kwargs.setdefault('method', self.method)
+        chart = CHARTS[kind](*args, **kwargs)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers)
+        future = self._executor.submit(render_chart, chart, path, self.dpi)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def _log_failure(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(f"Chart rendering failed: {future.exception()}")
+
+    def close(self, wait=True):
+        """Shut the workers down, by default after the queued charts are written."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def render_batch(jobs, n_workers=None, max_points=None, method='lttb', dpi=100):
+    """
+    Render many charts in parallel, e.g. one per run of a sweep.
+
+    :param jobs: Iterable of dicts with 'kind', 'path' and the chart's arguments
+        (e.g. {'kind': 'performance', 'path': 'run1.png', 'dates': d, 'portfolio_values': v}).
+    :param n_workers: Worker processes (default: CPU count).
+    :return: Paths written, in job order.
+    """
+    with ChartRenderer(n_workers or os.cpu_count() or 1, max_points, method, dpi) as renderer:
+        futures = [renderer.submit(**job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def plot_trading_performance(dates, portfolio_values, title="Trading Performance", path=None, max_points=None,
+                             method='lttb'):
+    """Show the downsampled portfolio value chart interactively, or write it to path without blocking."""
+    chart = performance_chart(dates, portfolio_values, title, max_points, method)
+    return _show_or_render(chart, path)
+
+
+def plot_model_predictions(dates, actual_prices, predicted_prices, title="Model Predictions", path=None,
+                           max_points=None, method='lttb'):
+    """Show the downsampled actual vs. predicted price chart interactively, or write it to path."""
+    chart = predictions_chart(dates, actual_prices, predicted_prices, title, max_points, method)
+    return _show_or_render(chart, path)
+
+
+def _show_or_render(chart, path):
+    if path is not None:
+        return render_chart(chart, path)
+    from matplotlib import pyplot as plt
+    figure = plt.figure(figsize=(12, 6))
+    _draw(figure, chart)
+    plt.show()
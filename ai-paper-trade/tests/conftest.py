@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Modules under src/ import each other the way main.py runs them (``from utils.config
+# import Config``), so src/ has to be importable next to the project root.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'src')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
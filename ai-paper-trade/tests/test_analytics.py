@@ -0,0 +1,122 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.simulation.paper_trader import PaperTrader
+from src.utils import analytics
+
+
+def loop_report(equity, periods_per_year=252):
+    returns = [equity[t] / equity[t - 1] - 1 for t in range(1, len(equity))]
+    peak, max_drawdown, duration, longest = equity[0], 0.0, 0, 0
+    for value in equity:
+        if value >= peak:
+            peak, duration = value, 0
+        else:
+            duration += 1
+        max_drawdown = max(max_drawdown, 1 - value / peak)
+        longest = max(longest, duration)
+    downside = [min(r, 0.0) ** 2 for r in returns]
+    return {
+        'total_return': equity[-1] / equity[0] - 1,
+        'sharpe': np.mean(returns) / np.std(returns, ddof=1) * np.sqrt(periods_per_year),
+        'sortino': np.mean(returns) / np.sqrt(np.mean(downside)) * np.sqrt(periods_per_year),
+        'max_drawdown': max_drawdown,
+        'max_drawdown_duration': longest,
+    }
+
+
+class TestPerformanceReport(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.equity = 1000 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, (5, 400)), axis=1))
+
+    def test_single_curve_matches_loop(self):
+        report = analytics.performance_report(self.equity[0])
+        expected = loop_report(self.equity[0])
+        for name, value in expected.items():
+            self.assertAlmostEqual(report[name], value, places=9, msg=name)
+        self.assertIsInstance(report['sharpe'], float)
+        self.assertIsInstance(report['max_drawdown_duration'], int)
+        years = 399 / 252
+        self.assertAlmostEqual(report['annualized_return'], (1 + expected['total_return']) ** (1 / years) - 1)
+        self.assertAlmostEqual(report['calmar'], report['annualized_return'] / report['max_drawdown'])
+
+    def test_batch_matches_single_curves(self):
+        batch = analytics.performance_report(self.equity)
+        frame = analytics.report_frame(batch)
+        self.assertEqual(frame.shape, (5, 8))
+        for curve in range(5):
+            single = analytics.performance_report(self.equity[curve])
+            for name, value in single.items():
+                self.assertAlmostEqual(batch[name][curve], value, places=12, msg=name)
+
+    def test_flat_and_losing_curves(self):
+        report = analytics.performance_report(np.full(50, 100.0))
+        self.assertEqual((report['sharpe'], report['sortino'], report['max_drawdown'], report['calmar']),
+                         (0.0, 0.0, 0.0, 0.0))
+        steady = analytics.performance_report(100 * 1.001 ** np.arange(50))
+        self.assertEqual(steady['sharpe'], 0.0)
+        self.assertEqual(analytics.performance_report([100, 50, 0])['annualized_return'], -1.0)
+        with self.assertRaises(ValueError):
+            analytics.performance_report([])
+
+    def test_trade_metrics(self):
+        prices = np.array([10.0, 11, 12, 11, 13, 13])
+        positions = np.array([0.0, 1, 1, 1, 0, 0])
+        equity = np.array([100.0, 100, 101, 100, 102, 102])
+        metrics = analytics.trade_metrics(equity, positions, prices, periods_per_year=5)
+        self.assertEqual(metrics['trade_count'], 2)
+        self.assertAlmostEqual(metrics['hit_rate'], 2 / 3)
+        self.assertAlmostEqual(metrics['exposure'], np.mean(positions * prices / equity))
+        self.assertAlmostEqual(metrics['turnover'], (11 + 13) / equity.mean())
+
+        by_symbol = analytics.trade_metrics(equity, np.stack([positions, 2 * positions], axis=-1),
+                                            np.stack([prices, prices], axis=-1), periods_per_year=5)
+        self.assertEqual(by_symbol['trade_count'], 4)
+        self.assertAlmostEqual(by_symbol['exposure'], 3 * metrics['exposure'])
+        self.assertAlmostEqual(by_symbol['hit_rate'], metrics['hit_rate'])
+
+    def test_backtest_report(self):
+        rng = np.random.default_rng(1)
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+        actions = rng.choice([-1, 0, 1], 300, p=[0.1, 0.8, 0.1])
+        backtest = PaperTrader(None, 10000).backtest(prices, actions, record_history=False)
+        report = analytics.backtest_report(backtest, prices, 10000)
+        self.assertEqual(report['trade_count'], len(backtest['trade_index']))
+        self.assertAlmostEqual(report['total_return'], backtest['equity'][-1] / 10000 - 1)
+        self.assertTrue(0 <= report['hit_rate'] <= 1)
+
+
+class TestRollingMetrics(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.equity = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, (3, 200)), axis=1))
+
+    def test_rolling_matches_pandas(self):
+        window = 15
+        rolling = analytics.rolling_report(self.equity, window, periods_per_year=252)
+        for curve in range(3):
+            equity = pd.Series(self.equity[curve])
+            returns = equity.pct_change().iloc[1:]
+            sharpe = returns.rolling(window, min_periods=2).mean() / returns.rolling(window, min_periods=2).std()
+            np.testing.assert_allclose(rolling['sharpe'][curve, 1:], sharpe.iloc[1:] * np.sqrt(252), rtol=1e-8)
+            volatility = returns.rolling(window, min_periods=2).std() * np.sqrt(252)
+            np.testing.assert_allclose(rolling['volatility'][curve, 1:], volatility.iloc[1:], rtol=1e-8)
+            peak = equity.rolling(window + 1, min_periods=1).max()
+            np.testing.assert_allclose(rolling['drawdown'][curve], (1 - equity / peak).iloc[1:], atol=1e-12)
+            change = equity / equity.shift(window).fillna(equity.iloc[0]) - 1
+            np.testing.assert_allclose(rolling['return'][curve], change.iloc[1:], atol=1e-12)
+
+    def test_rolling_sortino_window(self):
+        returns = analytics.step_returns(self.equity[0])
+        sortino = analytics.rolling_sortino(returns, 10, periods_per_year=1)
+        window = returns[40:50]
+        expected = window.mean() / np.sqrt(np.mean(np.minimum(window, 0) ** 2))
+        self.assertAlmostEqual(sortino[49], expected, places=10)
+        self.assertEqual(analytics.rolling_sortino(np.full(20, 0.01), 5)[-1], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
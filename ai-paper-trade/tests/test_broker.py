@@ -0,0 +1,159 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.trading.broker_interface import BrokerInterface
+from src.trading.ledger import TransactionLedger
+from src.trading.portfolio import PortfolioState
+
+
+class TestTransactionLedger(unittest.TestCase):
+    def fill(self, ledger, n, start=0):
+        for i in range(start, start + n):
+            ledger.append(f"SYM{i % 3}", i + 1, 10.0 + i, 'limit' if i % 2 else 'market', 0.5, timestamp=i)
+
+    def test_rows_span_chunks(self):
+        ledger = TransactionLedger(chunk_size=4)
+        self.fill(ledger, 10)
+        self.assertEqual(len(ledger), 10)
+        frame = ledger.to_frame()
+        self.assertEqual(list(frame.columns),
+                         ['timestamp', 'symbol', 'quantity', 'price', 'order_type', 'total_value', 'commission'])
+        np.testing.assert_array_equal(frame['quantity'], np.arange(1, 11))
+        np.testing.assert_array_equal(frame['total_value'], np.arange(1, 11) * (10.0 + np.arange(10)))
+        self.assertEqual(frame['symbol'].tolist()[:4], ['SYM0', 'SYM1', 'SYM2', 'SYM0'])
+        self.assertEqual(frame['timestamp'].iloc[3], pd.Timestamp(3))
+        self.assertEqual(ledger[-1]['order_type'], 'limit')
+        self.assertEqual(ledger[5]['price'], 15.0)
+        self.assertEqual(len(list(ledger)), 10)
+
+    def test_chunk_frames_are_views(self):
+        ledger = TransactionLedger(chunk_size=8)
+        self.fill(ledger, 5)
+        frame = next(ledger.frames())
+        chunk = next(ledger.chunks())
+        self.assertTrue(np.shares_memory(frame['price'].to_numpy(), chunk['price']))
+        self.assertIs(ledger.to_frame(), ledger.to_frame())
+        self.fill(ledger, 1, start=5)
+        self.assertEqual(len(ledger.to_frame()), 6)
+
+    def test_spill_bounds_memory(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            ledger = TransactionLedger(chunk_size=16, spill_dir=spill_dir, max_memory_chunks=1)
+            self.fill(ledger, 100)
+            self.assertLessEqual(ledger.nbytes, 2 * TransactionLedger(chunk_size=16).nbytes)
+            self.assertEqual(len(os.listdir(spill_dir)), 5)
+            np.testing.assert_array_equal(ledger.to_frame()['quantity'], np.arange(1, 101))
+            ledger.clear()
+            self.assertEqual(len(ledger), 0)
+            self.assertEqual(os.listdir(spill_dir), [])
+
+    def test_empty_frame(self):
+        frame = TransactionLedger().to_frame()
+        self.assertEqual(len(frame), 0)
+        self.assertIn('price', frame.columns)
+
+
+class TestBrokerLedger(unittest.TestCase):
+    def test_fills_are_recorded(self):
+        broker = BrokerInterface(initial_balance=1000)
+        broker.update_current_price('AAPL', 10)
+        self.assertEqual(broker.place_order('AAPL', 5)['order_id'], 1)
+        self.assertEqual(broker.place_order('AAPL', -2)['order_id'], 2)
+        history = broker.get_transaction_history()
+        self.assertEqual(history['quantity'].tolist(), [5, -2])
+        self.assertEqual(history['total_value'].tolist(), [50, -20])
+        broker.reset_paper_account()
+        self.assertEqual(len(broker.get_transaction_history()), 0)
+
+
+class TestPortfolioState(unittest.TestCase):
+    def test_fills_and_prices_update_totals(self):
+        portfolio = PortfolioState(1000)
+        portfolio.apply_fill('AAPL', 10, 20.0)
+        portfolio.apply_fill('AAPL', 10, 30.0)
+        self.assertEqual(portfolio.positions['AAPL'], {'quantity': 20, 'avg_price': 25.0})
+        self.assertEqual(portfolio.cash, 500)
+        portfolio.update_price('AAPL', 40.0)
+        self.assertEqual(portfolio.market_value, 800)
+        self.assertEqual(portfolio.unrealized_pl, 300)
+        self.assertEqual(portfolio.total_value, 1300)
+
+        portfolio.apply_fill('AAPL', -5, 40.0, commission=1.0)
+        self.assertEqual(portfolio.realized_pl, 75)
+        self.assertEqual(portfolio.cash, 699)
+        self.assertEqual(portfolio.market_value, 600)
+        portfolio.apply_fill('AAPL', -15, 40.0)
+        self.assertNotIn('AAPL', portfolio.positions)
+        self.assertEqual((portfolio.market_value, portfolio.cost_basis), (0, 0))
+        self.assertEqual(portfolio.total_value, 1299)
+
+    def test_fill_through_zero_closes_then_opens(self):
+        portfolio = PortfolioState(1000)
+        portfolio.apply_fill('AAPL', 10, 20.0)
+        portfolio.apply_fill('AAPL', -15, 30.0)
+        self.assertEqual(portfolio.realized_pl, 100)
+        self.assertEqual(portfolio.positions['AAPL'], {'quantity': -5, 'avg_price': 30.0})
+        self.assertEqual(portfolio.cost_basis, -150)
+        self.assertEqual(portfolio.cash, 1000 - 200 + 450)
+
+    def test_reopened_position_is_marked_at_its_fill(self):
+        portfolio = PortfolioState(10000)
+        portfolio.apply_fill('AAPL', 10, 100.0)
+        portfolio.update_price('AAPL', 120.0)
+        portfolio.apply_fill('AAPL', -10, 120.0)
+        portfolio.apply_fill('AAPL', 5, 90.0)
+        self.assertEqual(portfolio.prices['AAPL'], 90.0)
+        self.assertEqual(portfolio.position_value('AAPL'), 450)
+        self.assertEqual(portfolio.unrealized_pl, 0)
+
+    def test_incremental_totals_match_recomputation(self):
+        rng = np.random.default_rng(0)
+        portfolio = PortfolioState(1e6, resync_every=10 ** 9)
+        symbols = [f"SYM{i}" for i in range(20)]
+        for step in range(5000):
+            symbol = symbols[rng.integers(20)]
+            if rng.random() < 0.2:
+                held = portfolio.positions.get(symbol, {}).get('quantity', 0)
+                portfolio.apply_fill(symbol, int(rng.integers(-held, 50)), float(rng.uniform(50, 150)))
+            else:
+                portfolio.update_price(symbol, float(rng.uniform(50, 150)))
+        expected = sum(p['quantity'] * portfolio.prices[s] for s, p in portfolio.positions.items())
+        self.assertAlmostEqual(portfolio.market_value, expected, places=6)
+        portfolio.resync()
+        self.assertAlmostEqual(portfolio.market_value, expected, places=9)
+
+    def test_price_tick_only_touches_its_symbol(self):
+        portfolio = PortfolioState(10000)
+        portfolio.apply_fill('AAPL', 10, 100.0)
+        portfolio.apply_fill('MSFT', 10, 200.0)
+        portfolio.update_price('MSFT', 210.0)
+        self.assertEqual(portfolio.position_value('AAPL'), 1000)
+        self.assertEqual(portfolio.position_value('MSFT'), 2100)
+        portfolio.update_price('TSLA', 50.0)  # no position: only remembered as a mark
+        self.assertEqual(portfolio.market_value, 3100)
+
+
+class TestBrokerValuation(unittest.TestCase):
+    def test_account_values_follow_prices(self):
+        broker = BrokerInterface(initial_balance=10000)
+        broker.update_current_price('AAPL', 100)
+        broker.place_order('AAPL', 10)
+        broker.update_current_price('AAPL', 110)
+        account = broker.get_account_balance()
+        self.assertEqual(account['cash_balance'], 9000)
+        self.assertEqual(account['portfolio_value'], 1100)
+        self.assertEqual(account['total_value'], 10100)
+        self.assertEqual(account['unrealized_pl'], 100)
+        position = broker.get_open_positions()[0]
+        self.assertEqual((position['current_price'], position['unrealized_pl_percent']), (110, 10))
+        broker.reset_paper_account(5000)
+        self.assertEqual(broker.get_account_balance()['total_value'], 5000)
+        self.assertEqual(broker.positions, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
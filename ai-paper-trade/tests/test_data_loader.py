@@ -1,5 +1,13 @@
+import os
+import shutil
+import tempfile
+import tracemalloc
 import unittest
-from src.data.data_loader import DataLoader
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import DataLoader, StreamingPreprocessor, iter_symbol_chunks, preprocess_frame
 
 class TestDataLoader(unittest.TestCase):
 
@@ -24,5 +32,84 @@ class TestDataLoader(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.data_loader.load_data('INVALID_SYMBOL')
 
+
+def make_bars(n, seed=0, tz=None):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    frame = pd.DataFrame({'Open': close * 0.99, 'High': close * 1.01, 'Low': close * 0.98, 'Close': close,
+                          'Volume': rng.integers(1000, 5000, n).astype(float)},
+                         index=pd.date_range('2024-01-01', periods=n, freq='min', tz=tz, name='Datetime'))
+    # Gaps, including a missing first close and runs spanning chunk boundaries
+    frame.iloc[0, 3] = np.nan
+    for row in rng.choice(np.arange(1, n), n // 10, replace=False):
+        frame.iloc[row, rng.integers(0, 5)] = np.nan
+    frame.iloc[48:53, 3] = np.nan
+    return frame
+
+
+class TestStreamingLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.bars = make_bars(500)
+        self.loader = DataLoader('TEST', '2024-01-01 00:10', '2024-01-01 07:00')
+        self.loader.data = self.bars
+        self.path = self.loader.save_data(os.path.join(self.tmp, 'TEST.csv'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def expected(self, start='2024-01-01 00:10', end='2024-01-01 07:00'):
+        bars = pd.read_csv(self.path, index_col=0, parse_dates=True)
+        return preprocess_frame(bars[(bars.index >= start) & (bars.index < end)])
+
+    def test_chunks_match_in_memory_path(self):
+        expected = self.expected()
+        for chunk_size in [5, 48, 1000]:
+            chunks = list(self.loader.iter_chunks(chunk_size=chunk_size, path=self.path))
+            self.assertTrue(all(len(chunk) <= chunk_size for chunk in chunks))
+            pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+    def test_preprocessor_carries_state(self):
+        expected = preprocess_frame(self.bars)
+        preprocessor = StreamingPreprocessor()
+        chunks = [preprocessor.process(self.bars.iloc[i:i + 13]) for i in range(0, len(self.bars), 13)]
+        pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+    def test_raw_chunks(self):
+        chunks = list(self.loader.iter_chunks(chunk_size=100, path=self.path, preprocess=False))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 410)
+        self.assertNotIn('Return', chunks[0].columns)
+
+    def test_symbol_chunks(self):
+        other = DataLoader('OTHER', None, None)
+        other.data = make_bars(300, seed=1, tz='UTC')
+        paths = {'TEST': self.path, 'OTHER': other.save_data(os.path.join(self.tmp, 'OTHER.csv'))}
+        pairs = list(iter_symbol_chunks(paths, chunk_size=64, start_date='2024-01-01 01:00'))
+        self.assertEqual([symbol for symbol, _ in pairs][0], 'TEST')
+        other_frame = pd.concat([chunk for symbol, chunk in pairs if symbol == 'OTHER'])
+        self.assertEqual(str(other_frame.index.tz), 'UTC')
+        reference = pd.read_csv(paths['OTHER'], index_col=0)
+        reference.index = pd.to_datetime(reference.index, utc=True)
+        pd.testing.assert_frame_equal(other_frame, preprocess_frame(reference[reference.index >= '2024-01-01 01:00Z']))
+
+    def test_peak_memory_follows_chunk_size(self):
+        path = os.path.join(self.tmp, 'LONG.csv')
+        long = DataLoader('LONG', None, None)
+        long.data = make_bars(40000, seed=2)
+        long.save_data(path)
+        del long
+
+        def peak(chunk_size):
+            tracemalloc.start()
+            rows = sum(len(chunk) for chunk in DataLoader('LONG', None, None).iter_chunks(chunk_size, path))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return rows, peak
+
+        rows, small = peak(1000)
+        self.assertGreater(rows, 35000)
+        self.assertLess(small, 40000 * 6 * 8)  # less than the history's numeric data alone
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
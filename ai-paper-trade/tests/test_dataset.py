@@ -0,0 +1,121 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import preprocess_frame
+from src.data.dataset import DatasetBuilder, MemmapDataset
+
+
+def make_frame(dates, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    frame = pd.DataFrame({'Open': close * 0.99, 'High': close * 1.01, 'Low': close * 0.98, 'Close': close,
+                          'Volume': rng.integers(1000, 5000, len(dates)).astype(float)}, index=dates)
+    return frame
+
+
+class TestPreprocessFrame(unittest.TestCase):
+    def test_forward_fills_and_adds_returns_without_mutating(self):
+        dates = pd.date_range('2024-01-01', periods=5, freq='D')
+        frame = make_frame(dates, 0)
+        frame.iloc[2, frame.columns.get_loc('Close')] = np.nan
+        processed = preprocess_frame(frame)
+
+        self.assertNotIn('Return', frame.columns)
+        self.assertTrue(np.isnan(frame['Close'].iloc[2]))
+        self.assertEqual(len(processed), 4)
+        self.assertEqual(processed['Close'].iloc[1], frame['Close'].iloc[1])
+        self.assertEqual(processed['Return'].iloc[1], 0.0)
+        np.testing.assert_allclose(processed['Return'].iloc[0], frame['Close'].iloc[1] / frame['Close'].iloc[0] - 1)
+
+    def test_flattens_single_ticker_columns(self):
+        frame = make_frame(pd.date_range('2024-01-01', periods=3, freq='D'), 1)
+        frame.columns = pd.MultiIndex.from_product([frame.columns, ['AAPL']])
+        self.assertIn('Return', preprocess_frame(frame).columns)
+
+
+class TestMemmapDataset(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'daily')
+        dates = pd.date_range('2024-01-01', periods=20, freq='B', tz='America/New_York')
+        self.frames = {
+            'AAA': make_frame(dates, 0),
+            'BBB': make_frame(dates[5:], 1),  # listed later
+            'CCC': make_frame(dates.delete([3, 4]), 2),  # missing bars
+            'EMPTY': pd.DataFrame(),
+        }
+        self.dataset = DatasetBuilder().build(self.frames, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_manifest_and_layout(self):
+        dataset = MemmapDataset(self.path)
+        self.assertEqual(dataset.symbols, ['AAA', 'BBB', 'CCC'])
+        self.assertEqual(dataset.features, ['Open', 'High', 'Low', 'Close', 'Volume', 'Return'])
+        self.assertEqual(dataset.shape, (20, 3, 6))
+        self.assertIsInstance(dataset.data, np.memmap)
+        self.assertEqual(str(dataset.dates.tz), 'America/New_York')
+        self.assertFalse(any(name.endswith('.tmp') or '.tmp-' in name for name in os.listdir(self.tmp)))
+
+    def test_frames_round_trip(self):
+        for symbol in ['AAA', 'BBB', 'CCC']:
+            expected = preprocess_frame(self.frames[symbol])
+            frame = self.dataset.frame(symbol)
+            pd.testing.assert_index_equal(frame.index, expected.index.as_unit('ns'))
+            np.testing.assert_allclose(frame.to_numpy(), expected[self.dataset.features].to_numpy(), rtol=1e-6)
+
+    def test_mask_marks_missing_bars(self):
+        mask = np.asarray(self.dataset.mask)
+        # The first bar of every symbol has no return and is dropped by preprocessing
+        self.assertEqual(mask[:, 0].sum(), 19)
+        self.assertFalse(mask[:6, 1].any())
+        self.assertTrue(mask[6:, 1].all())
+        self.assertEqual(mask[:, 2].sum(), 17)
+        self.assertTrue(np.isnan(self.dataset.feature('Close')[~mask]).all())
+
+    def test_date_slices_are_views(self):
+        close = self.dataset.feature('Close', start='2024-01-08', end='2024-01-12')
+        self.assertEqual(close.shape, (5, 3))
+        self.assertTrue(np.shares_memory(close, self.dataset.data))
+        window = self.dataset.window('2024-01-08', '2024-01-12', symbols=['CCC'])
+        np.testing.assert_array_equal(window[:, 0, 3], close[:, 2])
+
+    def test_pickles_by_path(self):
+        payload = pickle.dumps(self.dataset)
+        self.assertLess(len(payload), 500)
+        restored = pickle.loads(payload)
+        np.testing.assert_array_equal(restored.feature('Close'), self.dataset.feature('Close'))
+
+    def test_rebuild_replaces_dataset(self):
+        dataset = DatasetBuilder(features=['Close'], dtype=np.float64).build({'AAA': self.frames['AAA']}, self.path)
+        self.assertEqual(dataset.shape, (20, 1, 1))
+        self.assertEqual(dataset.data.dtype, np.float64)
+
+    def test_refuses_to_replace_other_directories(self):
+        other = os.path.join(self.tmp, 'notes')
+        os.makedirs(other)
+        with open(os.path.join(other, 'keep.txt'), 'w') as f:
+            f.write('keep')
+        with self.assertRaises(FileExistsError):
+            DatasetBuilder(features=['Close']).build({'AAA': self.frames['AAA']}, other)
+        self.assertEqual(os.listdir(other), ['keep.txt'])
+
+    def test_path_with_trailing_separator(self):
+        dataset = DatasetBuilder(features=['Close']).build({'AAA': self.frames['AAA']}, self.path + os.sep)
+        self.assertEqual(dataset.shape, (20, 1, 1))
+        self.assertEqual(sorted(os.listdir(self.tmp)), ['daily'])
+
+    def test_no_data_raises(self):
+        with self.assertRaises(ValueError):
+            DatasetBuilder().build({'EMPTY': pd.DataFrame()}, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+
+from src.trading.broker_interface import BrokerInterface
+from src.trading.exchange import SimulatedExchange
+from src.trading.order_book import BUY, SELL, Order, OrderBook
+
+
+def bar(open_, high, low, close, volume=None):
+    return {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+
+
+class TestOrderBook(unittest.TestCase):
+    def test_best_prices_and_lazy_cancel(self):
+        book = OrderBook('AAPL')
+        for order_id, (side, price) in enumerate([(BUY, 99), (BUY, 100), (SELL, 102), (SELL, 101)], start=1):
+            book.add(Order(order_id, 'AAPL', side, 10, 'limit', price))
+        self.assertEqual((book.best_bid, book.best_ask), (100, 101))
+        book.cancel(2)
+        book.cancel(4)
+        self.assertEqual((book.best_bid, book.best_ask), (99, 102))
+        self.assertEqual(book.depth(BUY), [(99, 10)])
+        self.assertIsNone(book.cancel(2))
+
+    def test_price_time_priority(self):
+        book = OrderBook('AAPL')
+        book.add(Order(1, 'AAPL', BUY, 5, 'limit', 100))
+        book.add(Order(2, 'AAPL', BUY, 5, 'limit', 101))
+        book.add(Order(3, 'AAPL', BUY, 5, 'limit', 101))
+        fills = book.match(BUY, reference=102, through=100.5, capacity=7)
+        self.assertEqual([(order.order_id, quantity, price) for order, quantity, price in fills],
+                         [(2, 5, 101), (3, 2, 101)])
+        self.assertEqual(book.depth(BUY), [(101, 3), (100, 5)])
+
+
+class TestSimulatedExchange(unittest.TestCase):
+    def setUp(self):
+        self.exchange = SimulatedExchange()
+
+    def test_market_order_fills_at_next_open_with_slippage(self):
+        exchange = SimulatedExchange(slippage_bps=10)
+        exchange.submit('AAPL', 10)
+        fills = exchange.process_bar('AAPL', bar(100, 101, 99, 100.5))
+        self.assertEqual(len(fills), 1)
+        self.assertAlmostEqual(fills[0]['price'], 100.1)
+        self.assertEqual(fills[0]['quantity'], 10)
+
+    def test_limit_order_rests_until_reached(self):
+        order = self.exchange.submit('AAPL', -5, 'limit', limit_price=105)
+        self.assertEqual(self.exchange.process_bar('AAPL', bar(100, 104, 99, 103)), [])
+        self.assertEqual(len(self.exchange.open_orders()), 1)
+        fills = self.exchange.process_bar('AAPL', bar(103, 106, 102, 104))
+        self.assertEqual((fills[0]['quantity'], fills[0]['price']), (-5, 105))
+        self.assertEqual(order.status, 'filled')
+        self.assertEqual(self.exchange.open_orders(), [])
+
+    def test_limit_order_gapping_through_fills_at_open(self):
+        self.exchange.submit('AAPL', 5, 'limit', limit_price=100)
+        fills = self.exchange.process_bar('AAPL', bar(97, 98, 96, 97))
+        self.assertEqual(fills[0]['price'], 97)
+
+    def test_stop_orders_trigger(self):
+        self.exchange.submit('AAPL', -5, 'stop', stop_price=95)
+        self.exchange.submit('AAPL', 5, 'stop_limit', limit_price=106, stop_price=105)
+        self.assertEqual(self.exchange.process_bar('AAPL', bar(100, 104, 96, 100)), [])
+        fills = self.exchange.process_bar('AAPL', bar(93, 94, 92, 93))
+        self.assertEqual((fills[0]['quantity'], fills[0]['price']), (-5, 93))
+        fills = self.exchange.process_bar('AAPL', bar(100, 105.5, 99, 105))
+        self.assertEqual((fills[0]['quantity'], fills[0]['price']), (5, 105))
+
+    def test_partial_fills_follow_volume_participation(self):
+        exchange = SimulatedExchange(participation=0.1)
+        order = exchange.submit('AAPL', 250)
+        fills = exchange.process_bar('AAPL', bar(100, 101, 99, 100, volume=1000))
+        self.assertEqual((fills[0]['quantity'], fills[0]['remaining']), (100, 150))
+        self.assertEqual(order.status, 'partially_filled')
+        exchange.process_tick('AAPL', 100.5, size=1000)
+        fills = exchange.process_tick('AAPL', 100.7, size=1000)
+        self.assertEqual((fills[0]['quantity'], fills[0]['remaining'], fills[0]['status']), (50, 0, 'filled'))
+
+    def test_cancel(self):
+        order = self.exchange.submit('AAPL', 5, 'limit', limit_price=100)
+        self.assertTrue(self.exchange.cancel(order.order_id))
+        self.assertFalse(self.exchange.cancel(order.order_id))
+        self.assertEqual(self.exchange.process_bar('AAPL', bar(99, 99, 98, 99)), [])
+
+    def test_invalid_orders(self):
+        with self.assertRaises(ValueError):
+            self.exchange.submit('AAPL', 5, 'limit')
+        with self.assertRaises(ValueError):
+            self.exchange.submit('AAPL', 5, 'iceberg')
+
+
+class TestBrokerWithExchange(unittest.TestCase):
+    def test_orders_settle_on_fills(self):
+        broker = BrokerInterface(initial_balance=10000, exchange=SimulatedExchange(participation=0.5))
+        broker.update_current_price('AAPL', 100)
+        response = broker.place_order('AAPL', 20, 'limit', price=99)
+        self.assertEqual(response['status'], 'accepted')
+        self.assertEqual(broker.balance, 10000)
+
+        broker.process_bar('AAPL', bar(100, 100, 98, 99, volume=20))
+        self.assertEqual(broker.positions['AAPL']['quantity'], 10)
+        broker.process_bar('AAPL', bar(99, 99.5, 98.5, 99, volume=100))
+        self.assertEqual(broker.positions['AAPL'], {'quantity': 20, 'avg_price': 99})
+        self.assertEqual(broker.balance, 10000 - 20 * 99)
+        self.assertEqual(len(broker.get_transaction_history()), 2)
+
+        broker.place_order('AAPL', -20, 'stop', stop_price=95)
+        self.assertEqual(len(broker.get_open_orders()), 1)
+        broker.process_bar('AAPL', bar(96, 97, 94, 95, volume=1000))
+        self.assertNotIn('AAPL', broker.positions)
+        self.assertEqual(broker.balance, 10000 - 20 * 99 + 20 * 95)
+
+    def test_orders_are_validated_before_resting(self):
+        broker = BrokerInterface(initial_balance=1000, exchange=SimulatedExchange())
+        self.assertEqual(broker.place_order('AAPL', 20, 'limit', price=100)['status'], 'error')
+        self.assertEqual(broker.place_order('AAPL', -1, 'limit', price=100)['status'], 'error')
+        order_id = broker.place_order('AAPL', 5, 'limit', price=100)['order_id']
+        self.assertEqual(broker.cancel_order(order_id)['status'], 'success')
+        self.assertEqual(broker.get_open_orders(), [])
+
+    def test_open_orders_reserve_cash_and_shares(self):
+        broker = BrokerInterface(initial_balance=1000, exchange=SimulatedExchange())
+        self.assertEqual(broker.place_order('AAPL', 8, 'limit', price=100)['status'], 'accepted')
+        self.assertEqual(broker.place_order('AAPL', 8, 'limit', price=100)['status'], 'error')
+        self.assertEqual(broker.available_cash(), 200)
+        broker.process_bar('AAPL', bar(100, 100, 99, 100))
+        self.assertEqual((broker.balance, broker.reserved_cash), (200, 0))
+
+        broker.place_order('AAPL', -8, 'limit', price=110)
+        self.assertEqual(broker.place_order('AAPL', -8, 'limit', price=110)['status'], 'error')
+        order_id = broker.get_open_orders()[0]['order_id']
+        broker.cancel_order(order_id)
+        self.assertEqual(broker.available_shares('AAPL'), 8)
+        self.assertEqual(broker.place_order('AAPL', -8, 'limit', price=110)['status'], 'accepted')
+
+    def test_uncovered_fill_is_clipped(self):
+        broker = BrokerInterface(initial_balance=1000, exchange=SimulatedExchange())
+        broker.update_current_price('AAPL', 100)
+        broker.place_order('AAPL', 10)
+        broker.process_bar('AAPL', bar(125, 126, 124, 125))
+        self.assertEqual(broker.positions['AAPL']['quantity'], 8)
+        self.assertEqual(broker.balance, 0)
+        self.assertEqual((broker.get_open_orders(), broker.reserved_cash), ([], 0))
+
+    def test_instant_fills_without_exchange(self):
+        broker = BrokerInterface(initial_balance=1000)
+        broker.update_current_price('AAPL', 10)
+        self.assertEqual(broker.place_order('AAPL', 10)['status'], 'success')
+        broker.place_order('AAPL', -4)
+        self.assertEqual(broker.balance, 1000 - 100 + 40)
+        self.assertEqual(broker.positions['AAPL']['quantity'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data.indicators import IndicatorEngine, compute_indicators, decay_scan
+from src.data.streaming_indicators import StreamingEMA, StreamingIndicatorSet, StreamingSMA
+from src.data.yfinance_api import YFinanceAPI
+
+INDICATORS = {
+    'sma': {'period': 20},
+    'ema': {'period': 10},
+    'rsi': {'period': 14},
+    'macd': {'fast': 12, 'slow': 26, 'signal': 9},
+    'bollinger': {'period': 20, 'std_dev': 2},
+}
+
+
+def reference_columns(api, close):
+    """Indicator columns from the per-indicator pandas path."""
+    frame = pd.DataFrame({'Close': close})
+    columns = {}
+    for name, params in INDICATORS.items():
+        values = api.calculate_technical_indicator(frame, name, **params)
+        if isinstance(values, pd.DataFrame):
+            for line in values.columns:
+                columns[f"{name}_{line}"] = values[line].to_numpy()
+        else:
+            columns[name] = values.to_numpy()
+    return columns
+
+
+class TestIndicatorEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.api = YFinanceAPI(use_cache=False)
+        rng = np.random.default_rng(7)
+        self.close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (1500, 5)), axis=0))
+
+    def assert_matches(self, expected, actual):
+        np.testing.assert_array_equal(np.isnan(expected), np.isnan(actual))
+        mask = ~np.isnan(expected)
+        np.testing.assert_allclose(actual[mask], expected[mask], rtol=1e-9, atol=1e-9)
+
+    def test_single_series_matches_pandas(self):
+        columns = IndicatorEngine(self.close[:, 0]).compute(INDICATORS)
+        for name, expected in reference_columns(self.api, self.close[:, 0]).items():
+            self.assertEqual(columns[name].shape, expected.shape)
+            self.assert_matches(expected, columns[name])
+
+    def test_panel_matches_pandas_per_symbol(self):
+        close = self.close.copy()
+        close[:100, 1] = np.nan  # late listing
+        close[700:705, 2] = np.nan  # gap inside the history
+        columns = IndicatorEngine(close).compute(INDICATORS)
+        for symbol in range(close.shape[1]):
+            for name, expected in reference_columns(self.api, close[:, symbol]).items():
+                self.assert_matches(expected, columns[name][:, symbol])
+
+    def test_shared_intermediates_are_computed_once(self):
+        engine = IndicatorEngine(self.close)
+        engine.compute({'sma': {'period': 20}, 'bollinger': {'period': 20}})
+        self.assertEqual(len([k for k in engine._cache if k[0] == 'rolling']), 1)
+
+    def test_short_series(self):
+        columns = IndicatorEngine(self.close[:5, 0]).compute(INDICATORS)
+        self.assertTrue(np.isnan(columns['sma']).all())
+        self.assert_matches(reference_columns(self.api, self.close[:5, 0])['ema'], columns['ema'])
+
+    def test_decay_scan_matches_recursion(self):
+        u = np.random.default_rng(1).normal(size=(1000, 3))
+        expected = np.empty_like(u)
+        expected[0] = u[0]
+        for t in range(1, len(u)):
+            expected[t] = 0.9 * expected[t - 1] + u[t]
+        np.testing.assert_allclose(decay_scan(u, 0.9), expected, rtol=1e-10, atol=1e-12)
+
+    def test_compute_indicators_frame(self):
+        frame = pd.DataFrame({'Close': self.close[:, 0]}, index=pd.bdate_range('2015-01-01', periods=1500))
+        result = compute_indicators(frame, {'macd': {}, 'rsi': {}})
+        self.assertEqual(list(result.columns), ['Close', 'macd_macd', 'macd_signal', 'macd_histogram', 'rsi'])
+        self.assertNotIn('rsi', frame.columns)
+
+    def test_unsupported_indicator_is_skipped(self):
+        columns = IndicatorEngine(self.close[:, 0]).compute({'vwap': {}, 'sma': {}})
+        self.assertEqual(list(columns), ['sma'])
+
+    def test_unknown_parameters_are_ignored(self):
+        indicators = {'sma': {'period': 20, 'column': 'Close'}, 'rsi': {'window': 5}}
+        with self.assertLogs('src.data.indicators', level='WARNING'):
+            columns = IndicatorEngine(self.close[:, 0]).compute(indicators)
+        expected = IndicatorEngine(self.close[:, 0]).compute({'sma': {'period': 20}, 'rsi': {}})
+        self.assertEqual(list(columns), ['sma', 'rsi'])
+        for name, values in expected.items():
+            np.testing.assert_array_equal(columns[name], values)
+
+    def test_historical_data_keeps_indicators_with_unknown_parameters(self):
+        frame = pd.DataFrame({'Close': self.close[:, 0]}, index=pd.bdate_range('2015-01-01', periods=1500))
+        with mock.patch.object(self.api, 'fetch_data', return_value=frame):
+            result = self.api.get_historical_data_with_indicators(
+                'AAPL', '2015-01-01', '2020-01-01', {'sma': {'period': 20, 'extra': 1}, 'ema': {}})
+        self.assertEqual(list(result.columns), ['Close', 'sma', 'ema'])
+
+    def test_empty_series_gives_empty_columns(self):
+        frame = pd.DataFrame({'Close': []}, index=pd.DatetimeIndex([]), dtype=float)
+        with self.assertNoLogs('src.data.indicators', level='ERROR'):
+            result = compute_indicators(frame, INDICATORS)
+        self.assertTrue(result.empty)
+        self.assertEqual(len(result.columns), 1 + 9)
+        columns = IndicatorEngine(np.empty((0, 4))).compute(INDICATORS)
+        self.assertTrue(all(values.shape == (0, 4) for values in columns.values()))
+
+    def test_failing_indicator_keeps_the_others(self):
+        frame = pd.DataFrame({'Close': self.close[:, 0]}, index=pd.bdate_range('2015-01-01', periods=1500))
+        with mock.patch.object(self.api, 'fetch_data', return_value=frame):
+            with self.assertLogs('src.data.indicators', level='ERROR'):
+                result = self.api.get_historical_data_with_indicators(
+                    'AAPL', '2015-01-01', '2020-01-01', {'sma': {'period': 'twenty'}, 'ema': {'period': 10}})
+        self.assertEqual(list(result.columns), ['Close', 'ema'])
+        np.testing.assert_array_equal(result['ema'].to_numpy(),
+                                      IndicatorEngine(self.close[:, 0]).ema(10))
+
+
+class TestStreamingIndicators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (600, 4)), axis=0))
+        self.close[:30, 3] = np.nan  # late listing
+
+    def test_streaming_matches_batch_bar_by_bar(self):
+        batch = IndicatorEngine(self.close).compute(INDICATORS)
+        streaming = StreamingIndicatorSet(INDICATORS, n_symbols=self.close.shape[1])
+        for t, bar in enumerate(self.close):
+            latest = streaming.update(bar)
+            for name, values in batch.items():
+                np.testing.assert_allclose(latest[name], values[t], rtol=1e-9, atol=1e-9, err_msg=f"{name} at {t}")
+
+    def test_scalar_mode(self):
+        sma, ema = StreamingSMA(period=3), StreamingEMA(period=3)
+        for price in [1.0, 2.0, 3.0]:
+            sma_value, ema_value = sma.update(price), ema.update(price)
+        self.assertIsInstance(sma_value, float)
+        self.assertAlmostEqual(sma_value, 2.0)
+        self.assertAlmostEqual(ema_value, 0.5 * 3.0 + 0.5 * (0.5 * 2.0 + 0.5 * 1.0))
+
+    def test_warm_up_then_continue(self):
+        streaming = StreamingIndicatorSet({'rsi': {}, 'bollinger': {}}, n_symbols=4)
+        streaming.warm_up(self.close[:-1])
+        latest = streaming.update(self.close[-1])
+        batch = IndicatorEngine(self.close).compute({'rsi': {}, 'bollinger': {}})
+        np.testing.assert_allclose(latest['rsi'], batch['rsi'][-1], rtol=1e-9)
+        np.testing.assert_allclose(latest['bollinger_upper'], batch['bollinger_upper'][-1], rtol=1e-9)
+
+    def test_unsupported_indicator(self):
+        with self.assertRaises(ValueError):
+            StreamingIndicatorSet({'vwap': {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
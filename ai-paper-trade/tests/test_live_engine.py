@@ -0,0 +1,129 @@
+import asyncio
+import time
+import unittest
+
+import numpy as np
+
+from src.data.quote_service import QuoteService, StaticQuoteSource
+from src.models.neural_network import NeuralNetwork
+from src.models.trading_agent import TradingAgent
+from src.trading.broker_interface import BrokerInterface
+from src.trading.live_engine import LiveTradingEngine, ReplayQuoteFeed
+
+
+class MomentumNetwork:
+    """Predicts the sum of the window's returns scaled up, so rising symbols buy and falling ones sell."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, x):
+        self.batch_sizes.append(len(x))
+        return (np.asarray(x).sum(axis=1) * 100)[:, None]
+
+
+class SlowFeed(ReplayQuoteFeed):
+    """Emits every tick back to back, without yielding between them."""
+
+    async def stream(self):
+        for sequence, prices in enumerate(self.prices):
+            yield {'sequence': sequence, 'timestamp': 0.0, 'prices': prices}
+
+
+class SlowBroker(BrokerInterface):
+    """Takes a while to mark every price, like a broker behind a slow network."""
+
+    def update_current_price(self, symbol, price):
+        time.sleep(0.005)
+        super().update_current_price(symbol, price)
+
+
+def make_broker(balance=100000):
+    return BrokerInterface(initial_balance=balance, quote_service=QuoteService(StaticQuoteSource(), ttl=60))
+
+
+class TestLiveTradingEngine(unittest.TestCase):
+    def setUp(self):
+        steps = 30
+        up = 100 * 1.01 ** np.arange(steps)
+        down = 100 * 0.99 ** np.arange(steps)
+        flat = np.full(steps, 100.0)
+        self.prices = np.column_stack([up, down, flat])
+        self.symbols = ['UP', 'DOWN', 'FLAT']
+
+    def test_batched_inference_and_orders(self):
+        network = MomentumNetwork()
+        broker = make_broker()
+        engine = LiveTradingEngine(TradingAgent(network), broker, self.symbols, window=5, trade_size=2, interval=0)
+        # Paced so that the broker keeps up and every tick is routed
+        report = engine.run_replay(ReplayQuoteFeed(self.prices, self.symbols, interval=0.01))
+
+        self.assertEqual(report['ticks_processed'], 30)
+        self.assertEqual(report['ticks_dropped'], 0)
+        self.assertEqual(report['routes_coalesced'], 0)
+        # One inference call per tick after warm-up, each scoring the whole universe
+        self.assertEqual(network.batch_sizes, [3] * (30 - 5))
+        self.assertEqual(broker.positions['UP']['quantity'], 2 * 25)
+        self.assertNotIn('DOWN', broker.positions)
+        self.assertNotIn('FLAT', broker.positions)
+        self.assertEqual(report['orders_submitted'], 25)
+        self.assertEqual(broker.current_prices['UP'], self.prices[-1, 0])
+
+    def test_sells_only_held_shares(self):
+        broker = make_broker()
+        broker.update_current_price('DOWN', 100.0)
+        broker.place_order('DOWN', 3)
+        engine = LiveTradingEngine(TradingAgent(MomentumNetwork()), broker, self.symbols, window=5, trade_size=2)
+        report = engine.run_replay(ReplayQuoteFeed(self.prices, self.symbols, interval=0.01))
+        self.assertNotIn('DOWN', broker.positions)
+        self.assertEqual(report['orders_rejected'], 0)
+
+    def test_backpressure_drops_oldest_ticks(self):
+        engine = LiveTradingEngine(TradingAgent(MomentumNetwork()), make_broker(), self.symbols, window=5,
+                                   queue_size=2)
+        report = engine.run_replay(SlowFeed(self.prices, self.symbols, interval=0))
+        self.assertEqual(report['ticks_received'], 30)
+        self.assertEqual(report['ticks_processed'] + report['ticks_dropped'], 30)
+        self.assertGreater(report['ticks_dropped'], 0)
+        self.assertEqual(report['max_queue_depth'], 2)
+
+    def test_slow_broker_coalesces_routing(self):
+        broker = SlowBroker(initial_balance=100000, quote_service=QuoteService(StaticQuoteSource(), ttl=60))
+        engine = LiveTradingEngine(TradingAgent(MomentumNetwork()), broker, self.symbols, window=5, trade_size=2,
+                                   queue_size=30)
+        report = engine.run_replay(SlowFeed(self.prices, self.symbols, interval=0))
+        self.assertEqual(report['ticks_processed'], 30)
+        self.assertGreater(report['routes_coalesced'], 0)
+        self.assertLess(report['orders_submitted'], 25)
+        self.assertEqual(broker.positions['UP']['quantity'], 2 * report['orders_submitted'])
+        # The latest tick is always routed
+        self.assertEqual(broker.current_prices['UP'], self.prices[-1, 0])
+
+    def test_runs_repeatedly_with_bounded_latencies(self):
+        engine = LiveTradingEngine(TradingAgent(MomentumNetwork()), make_broker(), self.symbols, window=5,
+                                   latency_window=10)
+        engine.run_replay(ReplayQuoteFeed(self.prices, self.symbols, interval=0))
+        report = engine.run_replay(ReplayQuoteFeed(self.prices, self.symbols, interval=0))
+        self.assertEqual(report['ticks_processed'], 60)
+        self.assertEqual(len(engine.latencies), 10)
+
+    def test_observation_window_is_ordered(self):
+        engine = LiveTradingEngine(TradingAgent(NeuralNetwork(3, 4, 1, seed=0)), make_broker(), ['A'], window=3)
+        for price in [100.0, 110.0, 121.0, 121.0, np.nan, 133.1]:
+            observations = engine.observe(np.array([price]))
+        np.testing.assert_allclose(observations[0], [0.0, 0.0, np.log(1.1)])
+
+    def test_feed_paces_ticks(self):
+        feed = ReplayQuoteFeed(self.prices[:4], self.symbols, interval=0.05)
+
+        async def collect():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            return [loop.time() - start async for _ in feed.stream()]
+
+        offsets = asyncio.run(collect())
+        self.assertGreaterEqual(offsets[-1], 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.main import main
+from src.simulation.paper_trader import PaperTrader
+from src.trading.strategy import TradingStrategy
+from src.utils.analytics import backtest_report
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def run_cli(*argv):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        main(list(argv))
+    return output.getvalue()
+
+
+class TestCommandLine(unittest.TestCase):
+    def test_synthetic_backtest_report(self):
+        report = json.loads(run_cli('backtest', '--seed', '3', '--steps', '300', '--lookback', '10', '--json'))
+        self.assertIn('sharpe', report)
+        self.assertIn('hit_rate', report)
+        self.assertGreater(report['trade_count'], 0)
+        self.assertEqual(report, json.loads(run_cli('backtest', '--seed', '3', '--steps', '300', '--lookback', '10',
+                                                    '--json')))
+
+    def test_csv_backtest_matches_library(self):
+        prices = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, 500)))
+        frame = pd.DataFrame({'Close': prices}, index=pd.date_range('2020-01-01', periods=500, freq='D'))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bars.csv')
+            frame.to_csv(path)
+            report = json.loads(run_cli('backtest', '--csv', path, '--start', '2020-03-01', '--buy-margin', '0.01',
+                                        '--initial-balance', '5000', '--json'))
+        prices = prices[60:]
+        signals = TradingStrategy(buy_margin=0.01).generate_signals(prices)
+        result = PaperTrader(None, 5000).backtest(prices, signals, record_history=False)
+        expected = backtest_report(result, prices, 5000)
+        self.assertEqual(report.keys(), expected.keys())
+        for name, value in expected.items():
+            self.assertAlmostEqual(report[name], value, places=9, msg=name)
+
+    def test_startup_skips_heavy_imports(self):
+        script = ("import sys, main; main.main(['backtest', '--steps', '100']); import data.yfinance_api; "
+                  "print(','.join(m for m in ('yfinance', 'matplotlib', 'tensorflow') if m in sys.modules))")
+        env = dict(os.environ, PYTHONPATH=SRC)
+        completed = subprocess.run([sys.executable, '-c', script], env=env, capture_output=True, text=True,
+                                   check=True)
+        self.assertEqual(completed.stdout.splitlines()[-1], '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
+import numpy as np
 from src.models.neural_network import NeuralNetwork
-from src.models.trading_agent import TradingAgent
+from src.models.trading_agent import Action, TradingAgent
 
 class TestNeuralNetwork(unittest.TestCase):
     def setUp(self):
@@ -17,6 +18,43 @@ class TestNeuralNetwork(unittest.TestCase):
         loss = self.model.train(input_data, target)
         self.assertIsInstance(loss, float)
 
+class TestMiniBatchTraining(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = rng.normal(size=(512, 6))
+        self.y = np.tanh(self.x[:, :2] @ np.array([[0.5, -0.2], [0.3, 0.8]]))
+
+    def test_loss_decreases_and_is_tracked(self):
+        model = NeuralNetwork(6, 16, 2, seed=1)
+        model.train(self.x, self.y, learning_rate=0.5, epochs=30, batch_size=32)
+        self.assertEqual(len(model.loss_history), 30)
+        self.assertLess(model.loss_history[-1], model.loss_history[0] / 2)
+
+    def test_full_batch_step_matches_backpropagation(self):
+        reference = NeuralNetwork(6, 8, 2, seed=2)
+        model = NeuralNetwork(6, 8, 2, seed=2)
+        output = reference.forward(self.x)
+        reference.backpropagation(self.x, self.y, output, 0.1)
+        model.train(self.x, self.y, learning_rate=0.1, epochs=1, batch_size=len(self.x), shuffle=False)
+        np.testing.assert_allclose(model.weights_input_hidden, reference.weights_input_hidden, rtol=1e-12)
+        np.testing.assert_allclose(model.weights_hidden_output, reference.weights_hidden_output, rtol=1e-12)
+
+    def test_weights_are_updated_in_place(self):
+        model = NeuralNetwork(6, 8, 2, seed=3)
+        weights = model.weights_input_hidden
+        model.train(self.x, self.y, learning_rate=0.1, epochs=2, batch_size=50)
+        self.assertIs(model.weights_input_hidden, weights)
+
+    def test_float32_training_and_predict(self):
+        model = NeuralNetwork(6, 8, 2, dtype=np.float32, seed=4)
+        model.train(self.x, self.y, learning_rate=0.1, epochs=2, batch_size=64)
+        predictions = model.predict(self.x)
+        self.assertEqual(model.weights_input_hidden.dtype, np.float32)
+        self.assertEqual(predictions.dtype, np.float32)
+        self.assertEqual(predictions.shape, (512, 2))
+        np.testing.assert_allclose(model.predict(self.x[0]), predictions[0], rtol=1e-6)
+
+
 class TestTradingAgent(unittest.TestCase):
     def setUp(self):
         self.agent = TradingAgent(model=NeuralNetwork(input_size=10, hidden_size=5, output_size=3))
@@ -26,5 +64,42 @@ class TestTradingAgent(unittest.TestCase):
         decision = self.agent.make_decision(market_data)
         self.assertIn(decision, ['buy', 'sell', 'hold'])
 
+
+class FixedNetwork:
+    def __init__(self, outputs):
+        self.outputs = np.asarray(outputs, dtype=float)
+        self.calls = 0
+
+    def predict(self, x):
+        self.calls += 1
+        return self.outputs[:len(np.atleast_2d(x))].reshape(len(np.atleast_2d(x)), -1)
+
+
+class TestBatchedDecisions(unittest.TestCase):
+    def test_decide_actions_one_forward_pass(self):
+        network = FixedNetwork([0.9, -0.9, 0.1, 0.5, -0.5, 2.0])
+        agent = TradingAgent(network)
+        actions = agent.decide_actions(np.zeros((6, 4)))
+        self.assertEqual(actions.dtype, np.int8)
+        np.testing.assert_array_equal(actions, [Action.BUY, Action.SELL, Action.HOLD, Action.HOLD, Action.HOLD,
+                                                Action.BUY])
+        self.assertEqual(network.calls, 1)
+
+    def test_configurable_thresholds(self):
+        network = FixedNetwork([0.3, -0.3, 0.05])
+        agent = TradingAgent(network, buy_threshold=0.2, sell_threshold=-0.2)
+        np.testing.assert_array_equal(agent.decide_actions(np.zeros((3, 4))), [1, -1, 0])
+        np.testing.assert_array_equal(agent.decide_actions(np.zeros((3, 4)), buy_threshold=0.0), [1, -1, 1])
+
+    def test_decide_action_matches_batch(self):
+        network = NeuralNetwork(input_size=4, hidden_size=8, output_size=1, seed=3)
+        network.set_weights({name: w * 100 for name, w in network.get_weights().items()})
+        agent = TradingAgent(network)
+        observations = np.random.default_rng(0).normal(size=(50, 4))
+        batched = agent.decide_actions(observations)
+        names = [agent.decide_action(observation) for observation in observations]
+        self.assertEqual(names, [Action(code).name.lower() for code in batched])
+        self.assertEqual(set(names), {'buy', 'sell', 'hold'})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
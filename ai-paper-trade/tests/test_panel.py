@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data.dataset import DatasetBuilder
+from src.data.indicators import IndicatorEngine
+from src.data.panel import Panel, PanelLoader, _fill_rows, _fill_vectorized, fill_missing
+from src.simulation.vectorized_simulator import VectorizedMarketSimulator
+
+
+def bars(dates, start):
+    close = start + np.arange(len(dates), dtype=float)
+    return pd.DataFrame({'Open': close - 0.5, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': np.full(len(dates), 100.0)}, index=dates)
+
+
+class FakeAPI:
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def fetch_multiple_symbols(self, symbols, start_date=None, end_date=None, interval='1d'):
+        self.calls.append((tuple(symbols), start_date, end_date, interval))
+        return {symbol: self.frames.get(symbol, pd.DataFrame()) for symbol in symbols}
+
+
+class TestPanel(unittest.TestCase):
+    def setUp(self):
+        self.days = pd.bdate_range('2024-01-01', periods=10)
+        self.frames = {
+            'AAA': bars(self.days, 10),
+            'BBB': bars(self.days[3:], 50),  # listed on day 3
+            'CCC': bars(self.days.delete([5, 6]), 90),  # two missing sessions
+        }
+
+    def test_alignment_and_mask(self):
+        panel = Panel.from_frames(self.frames, fill='none')
+        self.assertEqual(panel.shape, (10, 3, 5))
+        self.assertTrue(panel.values.flags['C_CONTIGUOUS'])
+        np.testing.assert_array_equal(panel.mask.sum(axis=0), [10, 7, 8])
+        self.assertTrue(np.isnan(panel.close[:3, 1]).all())
+        self.assertTrue(np.isnan(panel.close[5:7, 2]).all())
+        self.assertEqual(panel.loc('2024-01-04', 'BBB', 'Close'), 50.0)
+        pd.testing.assert_frame_equal(panel.to_frame('CCC', dropna=True), self.frames['CCC'].astype(float),
+                                      check_index_type=False, check_freq=False)
+
+    def test_ffill_policy(self):
+        panel = Panel.from_frames(self.frames, fill='ffill')
+        np.testing.assert_array_equal(panel.close[5:7, 2], [94.0, 94.0])
+        np.testing.assert_array_equal(panel.field('Volume')[5:7, 2], [100.0, 100.0])
+        self.assertTrue(np.isnan(panel.close[:3, 1]).all())  # nothing before the first bar
+        self.assertFalse(panel.mask[5:7, 2].any())
+
+    def test_flat_policy_and_limit(self):
+        panel = Panel.from_frames(self.frames, fill='flat')
+        np.testing.assert_array_equal(panel.values[5, 2], [94.0, 94.0, 94.0, 94.0, 0.0])
+        limited = Panel.from_frames(self.frames, fill='flat', fill_limit=1)
+        np.testing.assert_array_equal(limited.values[5, 2], [94.0, 94.0, 94.0, 94.0, 0.0])
+        self.assertTrue(np.isnan(limited.values[6, 2]).all())
+
+    def test_calendars(self):
+        self.assertEqual(len(Panel.from_frames(self.frames, calendar='intersection').dates), 5)
+        sessions = self.days[::2]
+        panel = Panel.from_frames(self.frames, calendar=sessions, fill='none')
+        self.assertEqual(len(panel.dates), 5)
+        np.testing.assert_array_equal(panel.close[:, 0], [10, 12, 14, 16, 18])
+
+    def test_time_zones(self):
+        frames = {'NY': bars(self.days.tz_localize('America/New_York'), 1),
+                  'LDN': bars(self.days.tz_localize('Europe/London'), 2)}
+        panel = Panel.from_frames(frames)
+        self.assertEqual(str(panel.dates.tz), 'UTC')
+        self.assertEqual(len(panel.dates), 20)
+        self.assertEqual(panel.row('2024-01-01 05:00'), 1)
+
+    def test_slice_and_downstream_use(self):
+        panel = Panel.from_frames(self.frames, fill='ffill')
+        window = panel.slice('2024-01-04', '2024-01-12')
+        self.assertEqual(window.shape, (7, 3, 5))
+        self.assertTrue(np.shares_memory(window.values, panel.values))
+        self.assertEqual(window.row('2024-01-04'), 0)
+        IndicatorEngine(window.close).sma(3)
+        simulator = VectorizedMarketSimulator(window.close, window=3)
+        self.assertEqual(simulator.n_symbols, 3)
+
+    def test_row_and_vectorized_fills_agree(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(200, 30, 5))
+        values[rng.random(values.shape) < 0.3] = np.nan
+        for limit in [None, 0, 2]:
+            by_row, vectorized = values.copy(), values.copy()
+            _fill_rows(by_row, limit)
+            _fill_vectorized(vectorized, limit)
+            np.testing.assert_array_equal(by_row, vectorized)
+
+    def test_fill_missing_rejects_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            fill_missing(np.zeros((2, 1, 1)), np.ones((2, 1), dtype=bool), policy='bfill')
+
+    def test_loader(self):
+        api = FakeAPI(self.frames)
+        panel = PanelLoader(api, fill='none').load(['AAA', 'BBB', 'ZZZ'], '2024-01-01', '2024-01-31')
+        self.assertEqual(panel.symbols, ['AAA', 'BBB'])
+        self.assertEqual(api.calls, [(('AAA', 'BBB', 'ZZZ'), '2024-01-01', '2024-01-31', '1d')])
+
+
+class TestDatasetPanel(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        days = pd.bdate_range('2024-01-01', periods=10)
+        self.frames = {'AAA': bars(days, 10), 'CCC': bars(days.delete([5, 6]), 90)}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_dataset_matches_panel(self):
+        fields = ['Open', 'High', 'Low', 'Close', 'Volume']
+        dataset = DatasetBuilder(features=fields, dtype=np.float64, fill='flat').build(
+            self.frames, os.path.join(self.tmp, 'flat'), preprocess=False)
+        expected = Panel.from_frames(self.frames, fields, fill='flat')
+        panel = dataset.panel()
+        np.testing.assert_array_equal(panel.values, expected.values)
+        np.testing.assert_array_equal(panel.mask, expected.mask)
+        self.assertEqual(dataset.manifest['fill'], 'flat')
+        self.assertIsInstance(panel.values, np.memmap)
+
+
+if __name__ == '__main__':
+    unittest.main()
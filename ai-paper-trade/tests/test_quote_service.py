@@ -0,0 +1,172 @@
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data.quote_service import QuoteService, StaticQuoteSource, YFinanceQuoteSource
+from src.trading.broker_interface import BrokerInterface
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingSource:
+    def fetch(self, symbols):
+        raise RuntimeError("feed down")
+
+
+class TestQuoteService(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.source = StaticQuoteSource({'AAPL': 150.0, 'MSFT': 300.0, 'TSLA': 200.0})
+        self.service = QuoteService(self.source, ttl=10, batch_size=2, clock=self.clock)
+
+    def test_quotes_are_cached_until_their_ttl(self):
+        self.assertEqual(self.service.get_price('AAPL'), 150.0)
+        self.source.set_price('AAPL', 151.0)
+        self.clock.now += 5
+        quote = self.service.get_quote('AAPL')
+        self.assertEqual((quote['price'], quote['age'], quote['stale']), (150.0, 5, False))
+        self.clock.now += 6
+        self.assertEqual(self.service.get_price('AAPL'), 151.0)
+        self.assertEqual(self.source.calls, 2)
+        self.assertEqual((self.service.metrics['hits'], self.service.metrics['misses']), (1, 2))
+
+    def test_per_symbol_ttl(self):
+        self.service.set_ttl('TSLA', 1)
+        self.service.get_quotes(['AAPL', 'TSLA'])
+        self.clock.now += 2
+        self.service.get_quotes(['AAPL', 'TSLA'])
+        self.assertEqual(self.source.requested, [['AAPL', 'TSLA'], ['TSLA']])
+
+    def test_misses_are_refreshed_in_batches(self):
+        quotes = self.service.get_quotes(['AAPL', 'MSFT', 'TSLA', 'AAPL'])
+        self.assertEqual(sorted(quotes), ['AAPL', 'MSFT', 'TSLA'])
+        self.assertEqual(self.source.requested, [['AAPL', 'MSFT'], ['TSLA']])
+        self.assertEqual(self.service.metrics['symbols_fetched'], 3)
+
+    def test_failed_refresh_serves_stale_price(self):
+        self.service.get_price('AAPL')
+        self.service.source = FailingSource()
+        self.clock.now += 30
+        quote = self.service.get_quote('AAPL')
+        self.assertEqual((quote['price'], quote['stale'], quote['error']), (150.0, True, 'feed down'))
+        self.assertEqual(self.service.metrics['stale_served'], 1)
+
+    def test_unknown_symbol(self):
+        quote = self.service.get_quote('NOPE')
+        self.assertIsNone(quote['price'])
+        self.assertEqual(quote['error'], 'no quote returned')
+        self.assertEqual(self.service.metrics['errors'], 1)
+
+    def test_concurrent_callers_share_one_fetch(self):
+        source = StaticQuoteSource({'AAPL': 150.0}, delay=0.2)
+        service = QuoteService(source, ttl=10)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.get_price('AAPL'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [150.0] * 8)
+        self.assertEqual(source.calls, 1)
+        self.assertEqual(service.metrics['coalesced'], 7)
+
+    def test_malformed_source_results_are_errors(self):
+        class BadSource:
+            def __init__(self, result):
+                self.result = result
+
+            def fetch(self, symbols):
+                return self.result
+
+        quote = QuoteService(BadSource(['AAPL']), ttl=10).get_quote('AAPL')
+        self.assertIsNone(quote['price'])
+        self.assertIn('expected a dict', quote['error'])
+        quotes = QuoteService(BadSource({'AAPL': 'n/a', 'MSFT': '301.5'}), ttl=10).get_quotes(['AAPL', 'MSFT'])
+        self.assertEqual(quotes['AAPL']['error'], "invalid quote 'n/a'")
+        self.assertEqual(quotes['MSFT']['price'], 301.5)
+
+    def test_aborted_fetch_does_not_block_later_callers(self):
+        calls = []
+
+        def clock():
+            calls.append(None)
+            if len(calls) == 2:
+                raise RuntimeError("clock failed")
+            return 1000.0
+
+        service = QuoteService(self.source, ttl=10, clock=clock)
+        with self.assertRaises(RuntimeError):
+            service.get_quotes(['AAPL', 'MSFT'])
+        results = []
+        thread = threading.Thread(target=lambda: results.append(service.get_price('AAPL')))
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [150.0])
+
+    def test_pushed_prices(self):
+        self.service.update('XYZ', 12.5)
+        self.assertEqual(self.service.get_price('XYZ'), 12.5)
+        self.assertEqual(self.source.calls, 0)
+        self.service.invalidate('XYZ')
+        self.assertIsNone(self.service.get_price('XYZ'))
+
+
+class TestYFinanceQuoteSource(unittest.TestCase):
+    def test_last_valid_close_per_symbol(self):
+        calls = []
+
+        def downloader(symbols, **kwargs):
+            calls.append(symbols)
+            index = pd.date_range('2024-01-01', periods=3, name='Date')
+            frames = {
+                'AAPL': pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=index),
+                'MSFT': pd.DataFrame({'Close': [4.0, 5.0, np.nan]}, index=index),
+                'GONE': pd.DataFrame({'Close': [np.nan] * 3}, index=index),
+            }
+            return pd.concat({s: frames[s] for s in symbols}, axis=1)
+
+        prices = YFinanceQuoteSource(downloader).fetch(['AAPL', 'MSFT', 'GONE'])
+        self.assertEqual(prices, {'AAPL': 3.0, 'MSFT': 5.0})
+        self.assertEqual(len(calls), 1)
+
+
+class TestBrokerQuotes(unittest.TestCase):
+    def test_broker_prices_from_quote_service(self):
+        service = QuoteService(StaticQuoteSource({'AAPL': 50.0}), ttl=10)
+        broker = BrokerInterface(initial_balance=1000, quote_service=service)
+        self.assertEqual(broker.place_order('AAPL', 2)['status'], 'success')
+        self.assertEqual(broker.balance, 900)
+
+    def test_missing_price_is_an_error_not_a_placeholder(self):
+        broker = BrokerInterface(initial_balance=1000, quote_service=QuoteService(StaticQuoteSource(), ttl=10))
+        response = broker.place_order('NOPE', 1)
+        self.assertEqual(response['status'], 'error')
+        self.assertEqual(broker.balance, 1000)
+
+    def test_stale_quote_is_not_traded_at(self):
+        clock = FakeClock()
+        service = QuoteService(StaticQuoteSource({'AAPL': 50.0}), ttl=10, clock=clock)
+        broker = BrokerInterface(initial_balance=1000, quote_service=service)
+        self.assertEqual(broker.place_order('AAPL', 2)['status'], 'success')
+
+        service.source = FailingSource()
+        clock.now += 30
+        with self.assertLogs('src.trading.broker_interface', level='WARNING'):
+            response = broker.place_order('AAPL', 2)
+        self.assertEqual(response['status'], 'error')
+        self.assertIn('Stale quote', response['message'])
+        self.assertEqual(broker.positions['AAPL']['quantity'], 2)
+        self.assertEqual(broker.balance, 900)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
+import numpy as np
 from src.simulation.market_simulator import MarketSimulator
 from src.simulation.paper_trader import PaperTrader
+from src.simulation.synthetic import BootstrapModel, SyntheticMarket
+from src.simulation.vectorized_simulator import VectorizedMarketSimulator, BUY, SELL, HOLD
 
 class TestMarketSimulator(unittest.TestCase):
     def setUp(self):
@@ -24,5 +27,170 @@ class TestPaperTrader(unittest.TestCase):
         self.paper_trader.execute_trade('buy', 10)
         self.assertEqual(len(self.paper_trader.trade_history), 1)
 
+class TestPaperTraderBacktest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 5000)))
+        self.actions = rng.choice(['buy', 'sell', 'sell', 'hold'], size=5000)
+
+    def run_loop(self, trader):
+        equity = []
+        for action, price in zip(self.actions, self.prices):
+            trader.execute_trade(action, price)
+            equity.append(trader.get_balance())
+        return equity
+
+    def test_matches_per_step_loop_exactly(self):
+        looped, vectorized = PaperTrader(None), PaperTrader(None)
+        equity = self.run_loop(looped)
+        result = vectorized.backtest(self.prices, self.actions)
+
+        self.assertEqual(vectorized.balance, looped.balance)
+        self.assertEqual(vectorized.position, looped.position)
+        self.assertEqual(vectorized.trade_history, looped.trade_history)
+        self.assertEqual(result['equity'].tolist(), equity)
+        self.assertEqual(len(result['trade_index']), len(looped.trade_history))
+
+    def test_never_sells_without_position(self):
+        result = PaperTrader(None).backtest([10, 11, 12, 13, 14], [-1, -1, 1, -1, -1])
+        self.assertEqual(result['position'].tolist(), [0, 0, 1, 0, 0])
+        self.assertEqual(result['trade_side'].tolist(), [1, -1])
+        self.assertEqual(result['cash'][-1], 10000 - 12 + 13)
+
+    def test_continues_from_current_state(self):
+        looped, vectorized = PaperTrader(None), PaperTrader(None)
+        for trader in (looped, vectorized):
+            trader.execute_trade('buy', 50.0)
+            trader.execute_trade('buy', 51.0)
+        self.run_loop(looped)
+        vectorized.backtest(self.prices, self.actions)
+        self.assertEqual(vectorized.balance, looped.balance)
+        self.assertEqual(vectorized.trade_history, looped.trade_history)
+
+
+class TestVectorizedMarketSimulator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (4, 50, 2)), axis=1))
+        self.actions = rng.choice([SELL, HOLD, BUY], size=(60, 4, 2))
+
+    def test_matches_per_env_loop(self):
+        simulator = VectorizedMarketSimulator(self.prices, window=5, auto_reset=False)
+        for step in range(self.prices.shape[1] - 5):
+            _, rewards, dones = simulator.step(self.actions[step])
+        final_values = simulator.portfolio_values()
+
+        for env in range(4):
+            cash, positions = 10000.0, np.zeros(2)
+            for step in range(self.prices.shape[1] - 5):
+                price = self.prices[env, 4 + step]
+                for symbol in range(2):
+                    if self.actions[step, env, symbol] == BUY:
+                        positions[symbol] += 1
+                        cash -= price[symbol]
+                    elif self.actions[step, env, symbol] == SELL and positions[symbol] > 0:
+                        positions[symbol] -= 1
+                        cash += price[symbol]
+            expected = cash + positions @ self.prices[env, -1]
+            self.assertAlmostEqual(final_values[env], expected, places=8)
+        self.assertTrue(dones.all())
+
+    def test_rewards_sum_to_pnl(self):
+        simulator = VectorizedMarketSimulator(self.prices, window=5, auto_reset=False)
+        total = np.zeros(4)
+        for step in range(self.prices.shape[1] - 5):
+            _, rewards, _ = simulator.step(self.actions[step])
+            total += rewards
+        np.testing.assert_allclose(total, simulator.portfolio_values() - 10000.0)
+
+    def test_observation_shape_and_values(self):
+        simulator = VectorizedMarketSimulator(self.prices, window=5)
+        observations = simulator.observe()
+        self.assertEqual(observations.shape, (4, 2, 5))
+        expected = np.log(self.prices[0, 1:5, 1] / self.prices[0, 0:4, 1])
+        np.testing.assert_allclose(observations[0, 1, 1:], expected)
+
+    def test_shared_prices_and_auto_reset(self):
+        simulator = VectorizedMarketSimulator(self.prices[0], n_envs=8, window=5, random_start=True, seed=0)
+        for _ in range(100):
+            observations, rewards, dones = simulator.step(np.full((8, 2), BUY))
+        self.assertEqual(observations.shape, (8, 2, 5))
+        self.assertTrue((simulator.current_index < 49).all())
+
+
+class TestSyntheticMarket(unittest.TestCase):
+    def log_returns(self, prices, s0=100.0):
+        return np.diff(np.log(np.concatenate([np.full(prices[:, :1].shape, s0), prices], axis=1)), axis=1)
+
+    def test_seeded_and_shaped(self):
+        first = SyntheticMarket('gbm', n_symbols=3, seed=7).generate(5, 20)
+        second = SyntheticMarket('gbm', n_symbols=3, seed=7).generate(5, 20)
+        self.assertEqual(first.shape, (5, 20, 3))
+        np.testing.assert_array_equal(first, second)
+        self.assertFalse(np.array_equal(first, SyntheticMarket('gbm', n_symbols=3, seed=8).generate(5, 20)))
+        self.assertEqual(SyntheticMarket(seed=1, dtype=np.float32).generate(2, 3).dtype, np.float32)
+
+    def test_streaming_over_time_matches_generate(self):
+        history = np.random.default_rng(0).normal(0, 0.01, (300, 2))
+        models = [('gbm', {}), ('jump_diffusion', {'jump_intensity': 20}), ('garch', {}),
+                  (BootstrapModel(history, block_size=7), {})]
+        for model, params in models:
+            market = SyntheticMarket(model, n_symbols=2, correlation=0.5, seed=3, **params)
+            whole = market.generate(4, 50)
+            chunks = list(market.stream(4, 50, step_chunk=13))
+            self.assertEqual([steps.stop for _, steps, _ in chunks], [13, 26, 39, 50])
+            np.testing.assert_allclose(np.concatenate([chunk for _, _, chunk in chunks], axis=1), whole, rtol=1e-12)
+
+    def test_path_blocks(self):
+        market = SyntheticMarket(seed=3)
+        blocks = list(market.stream(10, 5, path_chunk=4))
+        self.assertEqual([chunk.shape[0] for _, _, chunk in blocks], [4, 4, 2])
+        np.testing.assert_array_equal(market.generate(10, 5, path_chunk=4)[8:], blocks[2][2])
+
+    def test_gbm_moments_and_correlation(self):
+        prices = SyntheticMarket('gbm', n_symbols=2, correlation=[[1, 0.6], [0.6, 1]], seed=0,
+                                 mu=0.1, sigma=0.3).generate(2000, 252)
+        returns = self.log_returns(prices).reshape(-1, 2)
+        dt = 1 / 252
+        self.assertAlmostEqual(returns[:, 0].mean(), (0.1 - 0.045) * dt, delta=2e-4)
+        self.assertAlmostEqual(returns[:, 0].std(), 0.3 * np.sqrt(dt), delta=2e-4)
+        self.assertAlmostEqual(np.corrcoef(returns.T)[0, 1], 0.6, delta=0.01)
+
+    def test_jumps_fatten_tails(self):
+        prices = SyntheticMarket('jump_diffusion', seed=0, jump_intensity=10, jump_std=0.05).generate(500, 252)
+        returns = self.log_returns(prices).ravel()
+        kurtosis = np.mean((returns - returns.mean()) ** 4) / returns.var() ** 2
+        self.assertGreater(kurtosis, 4)
+
+    def test_garch_clusters_volatility(self):
+        prices = SyntheticMarket('garch', seed=0, alpha=0.15, beta=0.8).generate(200, 1000)
+        squared = self.log_returns(prices) ** 2
+        lagged = np.mean([np.corrcoef(path[1:], path[:-1])[0, 1] for path in squared[:, :, 0]])
+        self.assertGreater(lagged, 0.05)
+        self.assertAlmostEqual(np.sqrt(squared.mean() * 252), 0.2, delta=0.02)
+        with self.assertRaises(ValueError):
+            SyntheticMarket('garch', alpha=0.5, beta=0.5)
+
+    def test_bootstrap_resamples_history_in_blocks(self):
+        history = np.linspace(-0.01, 0.01, 100)
+        prices = SyntheticMarket(BootstrapModel(history, block_size=5), seed=0).generate(3, 40)
+        returns = self.log_returns(prices)[:, :, 0]
+        rows = np.abs(returns[..., None] - history).argmin(axis=-1)
+        np.testing.assert_allclose(returns, history[rows], atol=1e-12)
+        for path in rows:
+            steps = np.diff(path.reshape(-1, 5), axis=1) % 100
+            self.assertTrue((steps == 1).all())
+
+    def test_market_simulator_synthetic_data(self):
+        simulator = MarketSimulator(seed=0)
+        self.assertEqual(len(simulator.historical_data), 252)
+        self.assertEqual(simulator.reset(), simulator.historical_data[0])
+        scenarios = simulator.simulate_market_conditions(n_paths=8, n_steps=60, model='garch', n_symbols=2,
+                                                         correlation=0.3)
+        self.assertEqual(scenarios.shape, (8, 60, 2))
+        environments = VectorizedMarketSimulator(scenarios, window=5)
+        self.assertEqual(environments.n_envs, 8)
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.trading.parameter_sweep import ParameterSweep
+from src.trading.rolling_extrema import RollingExtrema, rolling_max, rolling_min
+from src.trading.strategy import TradingStrategy
+
+
+class TestTradingStrategy(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 400)))
+
+    def test_generate_signals_matches_execute_strategy(self):
+        strategy = TradingStrategy(buy_margin=0.01, sell_margin=0.02)
+        signals = strategy.generate_signals(self.prices)
+        codes = {'Buy': 1, 'Sell': -1, 'Hold': 0}
+        expected = [0] + [codes[strategy.execute_strategy(self.prices[t], list(self.prices[:t]))]
+                          for t in range(1, len(self.prices))]
+        self.assertEqual(signals.tolist(), expected)
+
+    def test_default_thresholds_are_historical_extremes(self):
+        strategy = TradingStrategy()
+        self.assertEqual(strategy.execute_strategy(5, [6, 7, 8]), "Buy")
+        self.assertEqual(strategy.execute_strategy(9, [6, 7, 8]), "Sell")
+        self.assertEqual(strategy.execute_strategy(7, [6, 7, 8]), "Hold")
+
+    def test_lookback_signals_match_execute_strategy(self):
+        strategy = TradingStrategy(buy_margin=0.005, sell_margin=0.005, lookback=15)
+        signals = strategy.generate_signals(self.prices)
+        codes = {'Buy': 1, 'Sell': -1, 'Hold': 0}
+        expected = [0] + [codes[strategy.execute_strategy(self.prices[t], list(self.prices[:t]))]
+                          for t in range(1, len(self.prices))]
+        self.assertEqual(signals.tolist(), expected)
+
+    def test_streaming_matches_batch(self):
+        for lookback in (None, 1, 7, 1000):
+            strategy = TradingStrategy(buy_margin=0.01, lookback=lookback)
+            codes = {'Buy': 1, 'Sell': -1, 'Hold': 0}
+            streamed = [codes[strategy.on_bar(price)] for price in self.prices]
+            self.assertEqual(streamed, strategy.generate_signals(self.prices).tolist())
+
+    def test_reset_clears_streaming_state(self):
+        strategy = TradingStrategy(lookback=3)
+        strategy.on_bar(10.0)
+        strategy.reset()
+        self.assertEqual(strategy.on_bar(5.0), "Hold")
+
+
+class TestRollingExtrema(unittest.TestCase):
+    def test_rolling_matches_naive(self):
+        values = np.random.default_rng(9).normal(size=257)
+        for window in (1, 2, 5, 64, 256, 257, 1000, None):
+            size = len(values) if window is None else window
+            expected_min = [values[max(0, t - size + 1):t + 1].min() for t in range(len(values))]
+            expected_max = [values[max(0, t - size + 1):t + 1].max() for t in range(len(values))]
+            np.testing.assert_array_equal(rolling_min(values, window), expected_min)
+            np.testing.assert_array_equal(rolling_max(values, window), expected_max)
+
+    def test_rolling_along_last_axis(self):
+        values = np.random.default_rng(10).normal(size=(3, 4, 50))
+        for window in (1, 7, 50, None):
+            rows = [[rolling_max(series, window) for series in block] for block in values]
+            np.testing.assert_array_equal(rolling_max(values, window), rows)
+
+    def test_deque_matches_naive(self):
+        values = np.random.default_rng(10).integers(0, 20, size=300)
+        extrema = RollingExtrema(window=9)
+        for t, value in enumerate(values):
+            extrema.push(value)
+            self.assertEqual(extrema.min, values[max(0, t - 8):t + 1].min())
+            self.assertEqual(extrema.max, values[max(0, t - 8):t + 1].max())
+        self.assertEqual(len(extrema), 9)
+
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 2000)))
+        self.grid = {'buy_margin': [0.0, 0.01, 0.02], 'sell_margin': [0.0, 0.01, 0.02, 0.05]}
+
+    def test_parallel_matches_in_process(self):
+        serial = ParameterSweep(self.prices, self.grid, n_workers=1).run()
+        parallel = ParameterSweep(self.prices, self.grid, n_workers=2, chunk_size=2).run()
+        self.assertEqual(len(serial), 12)
+        self.assertEqual(list(serial.columns),
+                         ['buy_margin', 'sell_margin', 'total_return', 'max_drawdown', 'sharpe', 'trade_count'])
+        self.assertTrue(serial.equals(parallel))
+
+    def test_sweep_resumes_after_interruption(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sweep.jsonl')
+            full = ParameterSweep(self.prices, self.grid, n_workers=1, results_path=path).run()
+
+            with open(path) as handle:
+                lines = handle.readlines()
+            with open(path, 'w') as handle:
+                handle.writelines(lines[:5])
+                handle.write(lines[5][:10])  # torn write
+
+            resumed = ParameterSweep(self.prices, self.grid, n_workers=1, results_path=path).run()
+            with open(path) as handle:
+                records = [json.loads(line) for line in handle if line.strip().endswith('}')]
+
+            self.assertTrue(full.equals(resumed))
+            self.assertEqual(len(records), 12)
+
+    def test_results_of_other_prices_are_not_reused(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sweep.jsonl')
+            ParameterSweep(self.prices, self.grid, n_workers=1, results_path=path).run()
+
+            other = self.prices[::-1].copy()
+            resumed = ParameterSweep(other, self.grid, n_workers=1, results_path=path).run()
+            fresh = ParameterSweep(other, self.grid, n_workers=1).run()
+            self.assertTrue(resumed.equals(fresh))
+
+            truncated = ParameterSweep(self.prices[:1000], self.grid, n_workers=1, results_path=path).run()
+            self.assertTrue(truncated.equals(ParameterSweep(self.prices[:1000], self.grid, n_workers=1).run()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,292 @@
+import unittest
+
+import numpy as np
+
+from src.models.neural_network import NeuralNetwork
+from src.training.parallel_rollout import ParallelRollout
+from src.training.reinforcement_learning import ReinforcementLearning
+from src.training.replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+from src.training.reward_functions import RewardFunctions
+
+
+class CountingEnv:
+    """Deterministic environment: the state is the step counter, episodes last `length` steps."""
+
+    def __init__(self, length=50):
+        self.length = length
+        self.t = 0
+
+    def reset(self):
+        self.t = 0
+        return np.array([0.0])
+
+    def step(self, action):
+        self.t += 1
+        return np.array([float(self.t)]), 1.0, self.t >= self.length
+
+
+class NoisyEnv(CountingEnv):
+    """Rewards drawn from the global NumPy RNG, so episodes depend on the worker seed."""
+
+    def step(self, action):
+        next_state, _, done = super().step(action)
+        return next_state, float(np.random.random()), done
+
+
+class NetworkAgent:
+    """Acts with the sign of its network's output; learn() nudges the weights."""
+
+    def __init__(self, seed=0):
+        self.neural_network = NeuralNetwork(1, 2, 1, seed=seed)
+
+    def act(self, state):
+        return float(self.neural_network.predict(np.zeros(1))[0])
+
+    def learn(self, states, actions, rewards, next_states, dones, weights=None):
+        self.neural_network.weights_hidden_output += 1.0
+
+
+class RecordingAgent:
+    def __init__(self):
+        self.calls = []
+
+    def act(self, state):
+        return 1
+
+    def learn(self, states, actions, rewards, next_states, dones, weights=None):
+        self.calls.append((np.asarray(states), np.asarray(actions), dones, weights))
+        return np.ones(len(states))
+
+
+class WeightedAgent(RecordingAgent):
+    """Moves a scalar estimate towards the rewards, each error scaled by its importance-sampling weight."""
+
+    def __init__(self):
+        super().__init__()
+        self.value = 0.0
+
+    def learn(self, states, actions, rewards, next_states, dones, weights=None):
+        super().learn(states, actions, rewards, next_states, dones, weights)
+        errors = np.asarray(rewards) - self.value
+        scale = np.ones(len(errors)) if weights is None else np.asarray(weights)
+        self.value += 0.5 * np.mean(scale * errors)
+        return np.abs(errors)
+
+
+class TestReplayBuffer(unittest.TestCase):
+    def test_ring_overwrites_oldest(self):
+        buffer = ReplayBuffer(4, state_shape=2)
+        for i in range(6):
+            buffer.add([i, i], i % 2, float(i), [i + 1, i + 1], i == 5)
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(sorted(buffer.rewards.tolist()), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(buffer.position, 2)
+
+    def test_add_batch_larger_than_capacity_keeps_newest(self):
+        buffer = ReplayBuffer(3, seed=0)
+        states = np.arange(5, dtype=float)[:, None]
+        buffer.add_batch(states, np.zeros(5), np.arange(5), states + 1, np.zeros(5, dtype=bool))
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(sorted(buffer.rewards.tolist()), [2.0, 3.0, 4.0])
+        buffer.add([9.0], 0, 9.0, [10.0], True)
+        self.assertEqual(sorted(buffer.rewards.tolist()), [3.0, 4.0, 9.0])
+
+    def test_memory_is_fixed_at_allocation(self):
+        buffer = ReplayBuffer(1000, state_shape=(8,))
+        nbytes = buffer.nbytes
+        self.assertEqual(nbytes, 1000 * (2 * 8 * 4 + 1 + 4 + 1))
+        for i in range(2500):
+            buffer.add(np.full(8, i), 1, 0.5, np.full(8, i + 1), False)
+        self.assertEqual(buffer.nbytes, nbytes)
+
+    def test_uniform_sample_shapes(self):
+        buffer = ReplayBuffer(10, state_shape=3, seed=1)
+        for i in range(7):
+            buffer.add(np.full(3, i), 1, i, np.full(3, i + 1), False)
+        batch = buffer.sample(32)
+        self.assertEqual(batch['states'].shape, (32, 3))
+        self.assertTrue(np.all(batch['indices'] < 7))
+        np.testing.assert_array_equal(batch['states'][:, 0], batch['rewards'])
+
+
+class TestSumTree(unittest.TestCase):
+    def test_totals_and_find(self):
+        tree = SumTree(5)
+        tree.update(np.arange(5), [1.0, 2.0, 3.0, 4.0, 0.0])
+        self.assertAlmostEqual(tree.total, 10.0)
+        np.testing.assert_array_equal(tree.find([0.0, 0.99, 1.0, 2.5, 3.0, 5.99, 6.0, 9.99]),
+                                      [0, 0, 1, 1, 2, 2, 3, 3])
+        tree.update([3, 3], [0.5, 1.0])
+        self.assertAlmostEqual(tree.total, 7.0)
+
+
+class TestPrioritizedReplayBuffer(unittest.TestCase):
+    def test_sampling_follows_priorities(self):
+        buffer = PrioritizedReplayBuffer(4, state_shape=1, alpha=1.0, epsilon=0.0, seed=0)
+        for i in range(4):
+            buffer.add([i], 0, 0.0, [i], False)
+        buffer.update_priorities(np.arange(4), [1.0, 1.0, 2.0, 4.0])
+        counts = np.bincount(buffer.sample(80000)['indices'], minlength=4) / 80000
+        np.testing.assert_allclose(counts, [0.125, 0.125, 0.25, 0.5], atol=0.01)
+
+    def test_weights_correct_for_bias(self):
+        buffer = PrioritizedReplayBuffer(4, state_shape=1, alpha=1.0, beta=1.0, epsilon=0.0, seed=0)
+        for i in range(4):
+            buffer.add([i], 0, 0.0, [i], False)
+        buffer.update_priorities(np.arange(4), [1.0, 1.0, 2.0, 4.0])
+        batch = buffer.sample(64)
+        expected = {0: 1.0, 1: 1.0, 2: 0.5, 3: 0.25}
+        for index, weight in zip(batch['indices'], batch['weights']):
+            self.assertAlmostEqual(weight, expected[index], places=6)
+
+    def test_new_transitions_get_max_priority(self):
+        buffer = PrioritizedReplayBuffer(8, state_shape=1, alpha=1.0, epsilon=0.0)
+        buffer.add([0], 0, 0.0, [0], False)
+        buffer.update_priorities([0], [5.0])
+        index = buffer.add([1], 0, 0.0, [1], False)
+        self.assertEqual(buffer.tree.leaves([index])[0], 5.0)
+
+
+class TestReinforcementLearningReplay(unittest.TestCase):
+    def test_without_buffer_learns_every_transition(self):
+        agent = RecordingAgent()
+        ReinforcementLearning(agent, CountingEnv(10), None).train(1)
+        self.assertEqual(len(agent.calls), 10)
+        # One transition at a time, as a batch of one
+        self.assertEqual(agent.calls[0][0].shape, (1, 1))
+        self.assertEqual(agent.calls[0][2].shape, (1,))
+        self.assertIsNone(agent.calls[0][3])
+
+    def test_batched_updates_from_buffer(self):
+        agent = RecordingAgent()
+        buffer = PrioritizedReplayBuffer(100, seed=0)
+        rl = ReinforcementLearning(agent, CountingEnv(50), None, replay_buffer=buffer,
+                                   batch_size=8, warmup=16, update_every=2)
+        rl.train(1)
+        self.assertEqual(len(buffer), 50)
+        # Updates on every second step once 16 transitions are stored
+        self.assertEqual(len(agent.calls), 18)
+        states, actions, dones, weights = agent.calls[-1]
+        self.assertEqual(states.shape, (8, 1))
+        self.assertEqual(dones.shape, (8,))
+        self.assertEqual(weights.shape, (8,))
+        self.assertEqual(rl.total_reward, 50.0)
+
+    def test_importance_weights_reach_the_update(self):
+        def value_after_update(beta):
+            buffer = PrioritizedReplayBuffer(4, state_shape=1, alpha=1.0, beta=beta, epsilon=0.0, seed=0)
+            for i in range(4):
+                buffer.add([i], 0, float(i), [i], False)
+            buffer.update_priorities(np.arange(4), [1.0, 1.0, 2.0, 4.0])
+            agent = WeightedAgent()
+            rl = ReinforcementLearning(agent, CountingEnv(), None, replay_buffer=buffer, batch_size=64)
+            batch = rl.learn_from_replay()
+            np.testing.assert_array_equal(agent.calls[-1][3], batch['weights'])
+            return agent.value
+
+        # Full correction (beta=1) down-weights the over-sampled high rewards
+        self.assertLess(value_after_update(1.0), value_after_update(0.0))
+
+    def test_uniform_buffer_passes_no_weights(self):
+        agent = RecordingAgent()
+        buffer = ReplayBuffer(10, seed=0)
+        rl = ReinforcementLearning(agent, CountingEnv(20), None, replay_buffer=buffer, batch_size=4)
+        rl.train(1)
+        self.assertTrue(agent.calls)
+        self.assertTrue(all(call[3] is None for call in agent.calls))
+
+
+class TestParallelRollout(unittest.TestCase):
+    def test_episodes_are_seeded_per_worker(self):
+        def run():
+            with ParallelRollout(NoisyEnv(20), RecordingAgent(), n_workers=2, seed=7) as rollout:
+                return rollout.evaluate(6)
+
+        first, second = run(), run()
+        np.testing.assert_array_equal(first, second)
+        # Round-robin episodes: episodes 0 and 1 start two differently seeded workers
+        self.assertNotEqual(first[0], first[1])
+
+    def test_episode_trajectories(self):
+        with ParallelRollout(CountingEnv(5), RecordingAgent(), n_workers=2) as rollout:
+            episodes = sorted(rollout.episodes(3), key=lambda episode: episode['episode'])
+        self.assertEqual([episode['worker'] for episode in episodes], [0, 1, 0])
+        np.testing.assert_array_equal(episodes[0]['next_states'].ravel(), [1, 2, 3, 4, 5])
+        self.assertTrue(episodes[0]['dones'][-1])
+
+    def test_broadcast_updates_worker_policy(self):
+        agent = NetworkAgent()
+        with ParallelRollout(CountingEnv(3), agent, n_workers=2) as rollout:
+            before = list(rollout.episodes(2))
+            agent.neural_network.weights_hidden_output[:] = 10.0
+            rollout.broadcast()
+            after = list(rollout.episodes(2))
+        self.assertTrue(all(abs(episode['actions'][0]) < 1 for episode in before))
+        self.assertTrue(all(episode['actions'][0] > 9 for episode in after))
+
+    def test_parallel_train_and_evaluate(self):
+        agent = NetworkAgent()
+        rl = ReinforcementLearning(agent, CountingEnv(4), None)
+        totals = rl.train(6, n_workers=2, seed=0)
+        self.assertEqual(totals, [4.0] * 6)
+        self.assertGreater(agent.neural_network.weights_hidden_output[0, 0], 20)
+        self.assertEqual(rl.evaluate(4, n_workers=2), 4.0)
+
+    def test_worker_errors_are_raised(self):
+        with ParallelRollout(CountingEnv(3), object(), n_workers=1) as rollout:
+            with self.assertRaises(RuntimeError):
+                list(rollout.episodes(1))
+
+
+class TestRewardFunctions(unittest.TestCase):
+    def setUp(self):
+        self.rewards = RewardFunctions()
+        rng = np.random.default_rng(0)
+        self.equity = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, (6, 300)), axis=1))
+
+    def test_batch_trades_match_scalar(self):
+        rng = np.random.default_rng(1)
+        profits = rng.normal(0, 10, 100)
+        holding = rng.integers(0, 20, 100)
+        durations = rng.choice([0, 0.5, 1, 3], 100)
+        batch = self.rewards.evaluate_trades(profits, holding, durations)
+        expected = [self.rewards.evaluate_trade(p, h, d) for p, h, d in zip(profits, holding, durations)]
+        np.testing.assert_allclose(batch, expected)
+        self.assertEqual(self.rewards.evaluate_trade(5, 2, 0), 5 + 0.2 - 1)
+        np.testing.assert_array_equal(self.rewards.penalty_for_short_trades(np.array([0, 2])), [-1, 0])
+
+    def test_rolling_sharpe_matches_windows(self):
+        returns = self.rewards.step_returns(self.equity)
+        sharpe = self.rewards.rolling_sharpe(returns, window=20, periods_per_year=252)
+        self.assertEqual(sharpe.shape, returns.shape)
+        self.assertEqual(sharpe[0, 0], 0.0)
+        for env, step in [(0, 1), (2, 10), (5, 19), (3, 150), (1, 298)]:
+            window = returns[env, max(0, step - 19):step + 1]
+            expected = window.mean() / window.std(ddof=1) * np.sqrt(252)
+            self.assertAlmostEqual(sharpe[env, step], expected, places=8)
+
+    def test_flat_windows_score_zero(self):
+        returns = np.concatenate([np.full(30, 0.001), np.random.default_rng(2).normal(0, 0.01, 30)])
+        sharpe = self.rewards.rolling_sharpe(returns, window=10)
+        np.testing.assert_array_equal(sharpe[:30], 0.0)
+        self.assertTrue((sharpe[40:] != 0).all())
+
+    def test_shaped_rewards(self):
+        traded = np.abs(np.random.default_rng(3).normal(0, 100, (6, 299)))
+        plain = self.rewards.shaped_rewards(self.equity)
+        np.testing.assert_allclose(plain[2], self.equity[2, 1:] / self.equity[2, :-1] - 1)
+
+        shaped = self.rewards.shaped_rewards(self.equity, traded_value=traded, cost_rate=0.001, drawdown_weight=0.5)
+        peak = np.maximum.accumulate(self.equity, axis=1)
+        drawdown = 1 - self.equity / peak
+        np.testing.assert_allclose(shaped, plain - 0.5 * drawdown[:, 1:] - 0.001 * traded / self.equity[:, :-1])
+
+        sharpe = self.rewards.shaped_rewards(self.equity[0], sharpe_window=30)
+        self.assertEqual(sharpe.shape, (299,))
+
+    def test_drawdowns(self):
+        np.testing.assert_allclose(self.rewards.drawdowns([100, 120, 90, 130]), [0, 0, 0.25, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.utils.visualization import (ChartRenderer, downsample, lttb_indices, minmax_indices,
+                                     render_batch, render_model_predictions, render_trading_performance)
+
+
+def naive_lttb(y, n_out):
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept, last = [0], 0
+    for bucket in range(n_out - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < n_out - 1:
+            next_x = np.mean(np.arange(edges[bucket + 1], edges[bucket + 2]))
+            next_y = np.mean(y[edges[bucket + 1]:edges[bucket + 2]])
+        else:
+            next_x, next_y = n - 1, y[-1]
+        areas = [abs((last - next_x) * (y[i] - y[last]) - (last - i) * (next_y - y[last])) for i in range(low, high)]
+        last = low + int(np.argmax(areas))
+        kept.append(last)
+    return kept + [n - 1]
+
+
+class TestDownsampling(unittest.TestCase):
+    def setUp(self):
+        self.values = np.cumsum(np.random.default_rng(0).normal(size=5003))
+
+    def test_lttb_matches_reference(self):
+        kept = lttb_indices(None, self.values, 200)
+        self.assertEqual(kept.tolist(), naive_lttb(self.values, 200))
+        self.assertEqual(lttb_indices(None, self.values[:50], 200).tolist(), list(range(50)))
+
+    def test_minmax_keeps_extremes(self):
+        kept = minmax_indices(self.values, 300)
+        self.assertLessEqual(len(kept), 300)
+        self.assertTrue((np.diff(kept) > 0).all())
+        self.assertEqual((kept[0], kept[-1]), (0, len(self.values) - 1))
+        self.assertIn(np.argmax(self.values), kept)
+        self.assertIn(np.argmin(self.values), kept)
+
+    def test_downsample_keeps_dates(self):
+        dates = pd.date_range('2024-01-01', periods=len(self.values), freq='min', tz='UTC')
+        for method in ('lttb', 'minmax'):
+            x, y = downsample(dates, self.values, 100, method)
+            self.assertIsInstance(x, pd.DatetimeIndex)
+            self.assertLessEqual(len(y), 100)
+            np.testing.assert_array_equal(y, self.values[dates.get_indexer(x)])
+        x, y = downsample(None, self.values, 0)
+        np.testing.assert_array_equal(x, np.arange(len(self.values)))
+        self.assertEqual(len(y), len(self.values))
+
+    def test_downsample_without_x_keeps_positions(self):
+        for method in ('lttb', 'minmax'):
+            x, y = downsample(None, self.values[:1000], 50, method)
+            self.assertEqual(x[-1], 999)
+            np.testing.assert_array_equal(y, self.values[x])
+
+
+class TestRendering(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dates = pd.date_range('2024-01-01', periods=20000, freq='min')
+        self.values = 10000 + np.cumsum(np.random.default_rng(1).normal(size=20000))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_render_to_files(self):
+        path = render_trading_performance(self.dates, self.values, os.path.join(self.tmp.name, 'perf', 'run.png'))
+        self.assertTrue(os.path.getsize(path) > 0)
+        path = render_model_predictions(self.dates, self.values, self.values + 5,
+                                        os.path.join(self.tmp.name, 'pred.svg'), method='minmax')
+        with open(path) as handle:
+            self.assertIn('<svg', handle.read())
+
+    def test_renderer_returns_futures(self):
+        with ChartRenderer(n_workers=2, max_points=500) as renderer:
+            futures = [renderer.submit('performance', os.path.join(self.tmp.name, f'run{i}.png'),
+                                       self.dates, self.values * (1 + i)) for i in range(3)]
+        self.assertEqual([os.path.basename(future.result()) for future in futures], ['run0.png', 'run1.png', 'run2.png'])
+
+    def test_render_batch(self):
+        jobs = [{'kind': 'performance', 'path': os.path.join(self.tmp.name, 'a.png'), 'dates': self.dates,
+                 'portfolio_values': self.values},
+                {'kind': 'predictions', 'path': os.path.join(self.tmp.name, 'b.png'), 'dates': None,
+                 'actual_prices': self.values, 'predicted_prices': self.values[::-1], 'title': 'Reversed'}]
+        paths = render_batch(jobs, n_workers=2)
+        self.assertEqual(paths, [job['path'] for job in jobs])
+        self.assertTrue(all(os.path.getsize(path) > 0 for path in paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,282 @@
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data.fetch_engine import ConcurrentFetcher
+from src.data.yfinance_api import YFinanceAPI
+
+
+class FakeDownloader:
+    """Local stand-in for yf.download that generates business-day bars."""
+
+    def __init__(self, freq='B', latency=0.0, failing=(), flaky=(), blank=()):
+        self.freq = freq
+        self.latency = latency
+        self.failing = set(failing)
+        self.flaky = set(flaky)
+        self.blank = set(blank)  # Answer empty, like a failed yf.download, until asked on their own
+        self.calls = []
+
+    def __call__(self, symbol, start=None, end=None, interval='1d', actions=True, **kwargs):
+        self.calls.append((symbol, str(start), str(end), interval))
+        time.sleep(self.latency)
+        if isinstance(symbol, list):
+            if self.failing.intersection(symbol) or self.flaky.intersection(symbol):
+                raise RuntimeError("batch failed")
+            frames = {s: self._bars(start, end, actions).iloc[:0] if s in self.blank else
+                      self._bars(start, end, actions) for s in symbol}
+            return pd.concat(frames, axis=1)
+        if symbol in self.failing:
+            raise RuntimeError(f"no such symbol {symbol}")
+        if symbol in self.flaky:
+            self.flaky.discard(symbol)
+            raise RuntimeError("transient error")
+        if symbol in self.blank:
+            self.blank.discard(symbol)
+            return pd.DataFrame()
+        return self._bars(start, end, actions)
+
+    def _bars(self, start, end, actions):
+        index = pd.date_range(start, end, freq=self.freq, inclusive='left', name='Date')
+        close = 100 + np.arange(len(index), dtype=float)
+        data = pd.DataFrame({
+            'Open': close - 0.5,
+            'High': close + 1.0,
+            'Low': close - 1.0,
+            'Close': close,
+            'Volume': np.full(len(index), 1000, dtype=np.int64),
+        }, index=index)
+        if actions:
+            data['Dividends'] = 0.0
+            data['Stock Splits'] = 0.0
+        return data
+
+
+class TestOHLCVCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.downloader = FakeDownloader()
+        self.api = YFinanceAPI(cache_dir=self.tmp.name, downloader=self.downloader)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_warm_cache_skips_download(self):
+        cold = self.api.fetch_data('AAPL', '2015-01-01', '2020-01-01')
+        self.assertEqual(len(self.downloader.calls), 1)
+
+        started = time.perf_counter()
+        warm = self.api.fetch_data('AAPL', '2015-01-01', '2020-01-01')
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(self.downloader.calls), 1)
+        pd.testing.assert_frame_equal(cold, warm)
+        self.assertLess(elapsed, 0.5)
+
+    def test_subrange_is_served_from_disk(self):
+        self.api.fetch_data('AAPL', '2015-01-01', '2020-01-01')
+        data = self.api.fetch_data('AAPL', '2016-03-01', '2016-04-01')
+        self.assertEqual(len(self.downloader.calls), 1)
+        self.assertEqual(data.index[0], pd.Timestamp('2016-03-01'))
+        self.assertLess(data.index[-1], pd.Timestamp('2016-04-01'))
+
+    def test_overlapping_range_fetches_only_missing_tail(self):
+        self.api.fetch_data('AAPL', '2015-01-01', '2016-01-01')
+        data = self.api.fetch_data('AAPL', '2015-06-01', '2016-06-01')
+        self.assertEqual(self.downloader.calls[-1][1:3], ('2016-01-01', '2016-06-01'))
+        self.assertEqual(len(data), len(pd.bdate_range('2015-06-01', '2016-05-31')))
+
+    def test_overlapping_range_fetches_only_missing_head(self):
+        self.api.fetch_data('AAPL', '2016-01-01', '2017-01-01')
+        self.api.fetch_data('AAPL', '2015-01-01', '2016-06-01')
+        self.assertEqual(self.downloader.calls[-1][1:3], ('2015-01-01', '2016-01-01'))
+
+    def test_gap_between_cached_ranges_is_fetched(self):
+        self.api.fetch_data('AAPL', '2020-01-01', '2021-01-01')
+        self.api.fetch_data('AAPL', '2023-01-01', '2024-01-01')
+        data = self.api.fetch_data('AAPL', '2022-01-01', '2022-07-01')
+        self.assertEqual(self.downloader.calls[-1][1:3], ('2022-01-01', '2022-07-01'))
+        self.assertEqual(len(data), len(pd.bdate_range('2022-01-01', '2022-06-30')))
+
+        data = self.api.fetch_data('AAPL', '2020-06-01', '2023-06-01')
+        self.assertEqual([call[1:3] for call in self.downloader.calls[-2:]],
+                         [('2021-01-01', '2022-01-01'), ('2022-07-01', '2023-01-01')])
+        self.assertEqual(len(data), len(pd.bdate_range('2020-06-01', '2023-05-31')))
+        calls = len(self.downloader.calls)
+        self.api.fetch_data('AAPL', '2020-01-01', '2024-01-01')
+        self.assertEqual(len(self.downloader.calls), calls)
+
+    def test_failed_download_is_not_recorded(self):
+        failing = FakeDownloader(failing=['AAPL'])
+        data = YFinanceAPI(cache_dir=self.tmp.name, downloader=failing).fetch_data('AAPL', '2015-01-01', '2015-02-01')
+        self.assertTrue(data.empty)
+        data = self.api.fetch_data('AAPL', '2015-01-01', '2015-02-01')
+        self.assertEqual(len(self.downloader.calls), 1)
+        self.assertFalse(data.empty)
+
+    def test_range_without_bars_is_recorded(self):
+        # Saturday to Monday (exclusive): the download succeeds without any bars
+        self.assertTrue(self.api.fetch_data('AAPL', '2015-01-03', '2015-01-05').empty)
+        self.assertEqual(len(self.downloader.calls), 1)
+        self.assertTrue(self.api.fetch_data('AAPL', '2015-01-03', '2015-01-05').empty)
+        self.assertEqual(len(self.downloader.calls), 1)
+
+        # The weekend tail of a longer range is not fetched again either
+        self.api.fetch_data('AAPL', '2015-01-01', '2015-01-03')
+        data = self.api.fetch_data('AAPL', '2015-01-01', '2015-01-05')
+        self.assertEqual(len(self.downloader.calls), 2)
+        self.assertEqual(len(data), 2)
+
+    def test_cache_survives_new_instance(self):
+        self.api.fetch_data('AAPL', '2015-01-01', '2016-01-01')
+        other = YFinanceAPI(cache_dir=self.tmp.name, downloader=self.downloader)
+        other.fetch_data('AAPL', '2015-01-01', '2016-01-01')
+        self.assertEqual(len(self.downloader.calls), 1)
+
+    def test_actions_columns_dropped_on_request(self):
+        data = self.api.fetch_data('AAPL', '2015-01-01', '2015-02-01', actions=False)
+        self.assertNotIn('Dividends', data.columns)
+        self.assertIn('Close', data.columns)
+
+    def test_stale_intraday_entries_are_evicted(self):
+        downloader = FakeDownloader(freq='h')
+        api = YFinanceAPI(cache_timeout=0, cache_dir=self.tmp.name, downloader=downloader)
+        api.fetch_data('AAPL', '2015-01-05', '2015-01-06', interval='1h')
+        time.sleep(0.01)
+        api.fetch_data('AAPL', '2015-01-05', '2015-01-06', interval='1h')
+        self.assertEqual(len(downloader.calls), 2)
+
+
+class TestConcurrentFetch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.symbols = [f"SYM{i}" for i in range(10)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_symbols_are_fetched_in_grouped_batches(self):
+        downloader = FakeDownloader()
+        api = YFinanceAPI(cache_dir=self.tmp.name, downloader=downloader)
+        result = api.fetch_multiple_symbols(self.symbols, '2015-01-01', '2015-03-01', batch_size=4)
+
+        self.assertEqual(list(result), self.symbols)
+        self.assertEqual(len(downloader.calls), 3)
+        for symbol in self.symbols:
+            self.assertEqual(api.last_fetch_report[symbol]['status'], 'ok')
+            pd.testing.assert_frame_equal(result[symbol], api.fetch_data(symbol, '2015-01-01', '2015-03-01'))
+
+    def test_second_refresh_is_served_from_cache(self):
+        downloader = FakeDownloader()
+        api = YFinanceAPI(cache_dir=self.tmp.name, downloader=downloader)
+        api.fetch_multiple_symbols(self.symbols, '2015-01-01', '2015-03-01')
+        calls = len(downloader.calls)
+        api.fetch_multiple_symbols(self.symbols, '2015-01-01', '2015-03-01')
+
+        self.assertEqual(len(downloader.calls), calls)
+        self.assertTrue(all(r['status'] == 'cached' for r in api.last_fetch_report.values()))
+
+    def test_failing_symbol_is_isolated(self):
+        downloader = FakeDownloader(failing=['SYM3'])
+        api = YFinanceAPI(cache_dir=self.tmp.name, downloader=downloader)
+        fetcher = ConcurrentFetcher(api, batch_size=5, max_retries=2, backoff=0.0)
+        result, report = fetcher.fetch(self.symbols, '2015-01-01', '2015-03-01')
+
+        self.assertTrue(result['SYM3'].empty)
+        self.assertEqual(report['SYM3']['status'], 'error')
+        self.assertEqual(report['SYM3']['attempts'], 3)  # the grouped download and max_retries single calls
+        self.assertEqual(sum(call[0] == 'SYM3' for call in downloader.calls), 2)
+        for symbol in self.symbols:
+            if symbol != 'SYM3':
+                self.assertEqual(report[symbol]['status'], 'ok')
+                self.assertFalse(result[symbol].empty)
+
+    def test_cache_error_is_isolated(self):
+        api = YFinanceAPI(cache_dir=self.tmp.name, downloader=FakeDownloader())
+        update = api.cache.update
+
+        def failing_update(symbol, *args, **kwargs):
+            if symbol == 'SYM2':
+                raise OSError("disk full")
+            return update(symbol, *args, **kwargs)
+
+        with mock.patch.object(api.cache, 'update', side_effect=failing_update):
+            result, report = ConcurrentFetcher(api, batch_size=5).fetch(self.symbols, '2015-01-01', '2015-03-01')
+
+        self.assertTrue(result['SYM2'].empty)
+        self.assertEqual(report['SYM2']['status'], 'error')
+        self.assertIn("disk full", report['SYM2']['error'])
+        for symbol in self.symbols:
+            if symbol != 'SYM2':
+                self.assertEqual(report[symbol]['status'], 'ok')
+                self.assertFalse(result[symbol].empty)
+
+    def test_transient_failure_is_retried(self):
+        downloader = FakeDownloader(flaky=['SYM1'])
+        api = YFinanceAPI(use_cache=False, downloader=downloader)
+        fetcher = ConcurrentFetcher(api, batch_size=10, max_retries=2, backoff=0.0)
+        result, report = fetcher.fetch(self.symbols, '2015-01-01', '2015-03-01')
+
+        self.assertEqual(report['SYM1']['status'], 'ok')
+        self.assertEqual(report['SYM1']['attempts'], 3)
+        self.assertEqual(len(result['SYM1']), len(pd.bdate_range('2015-01-01', '2015-02-28')))
+
+    def test_empty_answer_is_retried(self):
+        downloader = FakeDownloader(blank=['SYM1'])
+        api = YFinanceAPI(cache_dir=self.tmp.name, downloader=downloader)
+        fetcher = ConcurrentFetcher(api, batch_size=10, max_retries=2, backoff=0.0)
+        result, report = fetcher.fetch(self.symbols, '2015-01-01', '2015-03-01')
+
+        self.assertEqual(report['SYM1']['status'], 'ok')
+        self.assertEqual(report['SYM1']['attempts'], 3)
+        self.assertEqual(len(result['SYM1']), len(pd.bdate_range('2015-01-01', '2015-02-28')))
+        self.assertEqual(report['SYM2']['attempts'], 1)
+
+    def test_weekend_refresh_is_not_fetched_per_symbol(self):
+        symbols = [f"SYM{i}" for i in range(50)]
+        downloader = FakeDownloader()
+        api = YFinanceAPI(cache_dir=self.tmp.name, downloader=downloader)
+        fetcher = ConcurrentFetcher(api, batch_size=20, backoff=0.0)
+        fetcher.fetch(symbols, '2015-01-01', '2015-02-28')
+        self.assertEqual(len(downloader.calls), 3)
+
+        # The tail from Saturday to Monday has no bars: one grouped call per batch, then nothing
+        result, report = fetcher.fetch(symbols, '2015-01-01', '2015-03-02')
+        self.assertEqual(len(downloader.calls), 6)
+        self.assertTrue(all(r['status'] == 'ok' and r['attempts'] == 1 for r in report.values()))
+        self.assertEqual(len(result['SYM0']), len(pd.bdate_range('2015-01-01', '2015-02-27')))
+
+        _, report = fetcher.fetch(symbols, '2015-01-01', '2015-03-02')
+        self.assertEqual(len(downloader.calls), 6)
+        self.assertTrue(all(r['status'] == 'cached' for r in report.values()))
+
+    def test_wall_clock_scales_with_concurrency(self):
+        downloader = FakeDownloader(latency=0.05)
+        api = YFinanceAPI(use_cache=False, downloader=downloader)
+        started = time.perf_counter()
+        api.fetch_multiple_symbols(self.symbols * 2 + [f"X{i}" for i in range(10)], '2015-01-01', '2015-02-01',
+                                   max_workers=10, batch_size=1)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(downloader.calls), 20)
+        self.assertLess(elapsed, 20 * 0.05 / 2)
+
+
+
+class TestTickerRequests(unittest.TestCase):
+
+    def test_ticker_methods_use_yfinance_ticker(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch('yfinance.Ticker') as ticker:
+            ticker.return_value.info = {'shortName': 'Apple Inc.'}
+            api = YFinanceAPI(cache_dir=tmp, downloader=FakeDownloader())
+            self.assertEqual(api.get_company_info('AAPL'), {'shortName': 'Apple Inc.'})
+        ticker.assert_called_once_with('AAPL')
+
+if __name__ == '__main__':
+    unittest.main()